@@ -0,0 +1,191 @@
+"""Requests/sec of the JSON API (api_server.py) against a synthetic league.
+
+    python api_loadtest.py --players 50000 --matches 20000 --clients 32 --seconds 10
+    python api_loadtest.py --db bench.db --reuse --no-conditional --output api.json
+
+Starts the server in its own process on --db, then runs --clients
+keep-alive connections for --seconds, each requesting a mix of the
+endpoints the screens use (URLS). Clients remember each URL's ETag and
+send it back, as a browser would, so unchanged answers come back as 304;
+--no-conditional measures full responses only. Reports requests/sec,
+latency percentiles and the count per status.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+import db
+import synthetic_league
+
+DEFAULT_DB = "api_loadtest.db"
+PORT = 8099
+
+# (weight, url); {team} and {jersey} are filled in per request
+URLS = (
+    (4, "/players?limit=50"),
+    (2, "/players?sort=Name&limit=50"),
+    (1, "/players?Age=20-25&limit=50"),
+    (3, "/players/{jersey}"),
+    (2, "/teams"),
+    (4, "/teams/{team}/squad"),
+    (3, "/matches?limit=100"),
+    (1, "/matches?sort=Date&desc=1&limit=100"),
+)
+
+
+# ---------------- SERVER ----------------
+def start_server(path, port):
+    server = subprocess.Popen([sys.executable, "api_server.py", "--db", os.path.abspath(path), "--port", str(port)],
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("api_server.py exited before it was ready")
+        try:
+            asyncio.run(_get_once(port, "/"))
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("api_server.py did not start listening")
+
+
+async def _get_once(port, url):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return await request(reader, writer, url)
+    finally:
+        writer.close()
+
+
+# ---------------- CLIENT ----------------
+async def request(reader, writer, url, etag=None):
+    """(status, etag) of one GET on an open keep-alive connection."""
+    head = f"GET {url} HTTP/1.1\r\nHost: localhost\r\n"
+    if etag:
+        head += f"If-None-Match: {etag}\r\n"
+    writer.write((head + "\r\n").encode("latin-1"))
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("etag")
+
+
+async def client(port, urls, until, conditional, latencies, statuses, seed):
+    rng = random.Random(seed)
+    etags = {}
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < until:
+            url = rng.choice(urls)()
+            started = time.perf_counter()
+            status, etag = await request(reader, writer, url, etags.get(url) if conditional else None)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[url] = etag
+    finally:
+        writer.close()
+
+
+async def run_clients(port, urls, clients, seconds, conditional):
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    until = started + seconds
+    await asyncio.gather(*(client(port, urls, until, conditional, latencies, statuses, seed)
+                           for seed in range(clients)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def url_makers(path):
+    teams = [row[0] for row in db.query("SELECT team_name FROM teams", path=path)]
+    top = db.query_one("SELECT MAX(jersey) FROM players", path=path)[0] or 1
+    rng = random.Random(0)
+    makers = []
+    for weight, url in URLS:
+        if "{team}" in url:
+            if not teams:
+                continue
+            maker = lambda u=url: u.format(team=quote(rng.choice(teams), safe=""))
+        elif "{jersey}" in url:
+            maker = lambda u=url: u.format(jersey=rng.randint(1, top))
+        else:
+            maker = lambda u=url: u
+        makers += [maker] * weight
+    return makers
+
+
+# ---------------- REPORT ----------------
+def report(latencies, statuses, elapsed):
+    latencies.sort()
+    at = lambda q: round(latencies[min(len(latencies) - 1, int(len(latencies) * q))], 3)
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 2),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "median_ms": round(statistics.median(latencies), 3) if latencies else None,
+        "p95_ms": at(0.95) if latencies else None,
+        "p99_ms": at(0.99) if latencies else None,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the read-only JSON API")
+    parser.add_argument("--db", default=DEFAULT_DB, help="synthetic database to create or reuse")
+    parser.add_argument("--reuse", action="store_true", help="load-test --db as it is")
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--no-conditional", action="store_true", help="never send If-None-Match")
+    parser.add_argument("--output", help="write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    if not args.reuse:
+        print(f"Generating {args.db} (seed {args.seed})")
+        synthetic_league.generate(args.db, args.teams, args.players, args.matches,
+                                  seed=args.seed, verbose=True)
+    urls = url_makers(args.db)
+    db.close_all()   # the server gets the file to itself
+
+    server = start_server(args.db, args.port)
+    try:
+        latencies, statuses, elapsed = asyncio.run(
+            run_clients(args.port, urls, args.clients, args.seconds, not args.no_conditional))
+    finally:
+        server.terminate()
+        server.wait()
+
+    results = report(latencies, statuses, elapsed)
+    print(f"{results['requests']} requests in {results['seconds']}s from {args.clients} clients: "
+          f"{results['requests_per_sec']} req/s")
+    print(f"  latency median {results['median_ms']} ms, p95 {results['p95_ms']} ms, "
+          f"p99 {results['p99_ms']} ms")
+    print(f"  statuses {results['statuses']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(dict(results, clients=args.clients, conditional=not args.no_conditional), f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0 if set(statuses) <= {200, 304} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Read-only JSON API over the club database, for analysts and stadium screens.
+
+    python api_server.py --db soccer.db --port 8080
+
+Runs without Tk, next to the app or on its own. Every query goes through a
+pooled read-only connection (see db.read_only), so the server can never
+change the database.
+
+    GET /players                  paged; ?sort=Name&desc=1&Age=20-25&limit=50
+    GET /players/<jersey>
+    GET /teams
+    GET /teams/<name>
+    GET /teams/<name>/squad       paged, sorts / filters as /players
+    GET /matches                  paged; ?season=2019 for an archived season
+    GET /matches/<id>             archived matches too
+    GET /seasons                  the archived seasons
+
+Paged endpoints return {"items": [...], "next": url or null}; follow next
+for the following page (keyset paging, see listing). Sort and filter
+parameters are the table headings of the pages. Every response carries an
+ETag (the change_log position it was read at); send it back in
+If-None-Match and an unchanged database answers 304 without running the
+query.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+import db
+import migrations
+import partitions
+from listing import View
+from repository import (MATCH_LISTING, MATCH_SELECT, PAGE_SIZE, PLAYER_LISTING, PLAYER_SELECT,
+                        SQUAD_LISTING, TEAM_SELECT, Match, Player, Team)
+from validation import ValidationError
+
+DEFAULT_PORT = 8080
+MAX_LIMIT = 1000
+MAX_HEADER_LINES = 100
+SQLITE_MIN_INT, SQLITE_MAX_INT = -2 ** 63, 2 ** 63 - 1
+# Query parameters that are not filters
+PAGING_PARAMS = {"after", "limit", "sort", "desc", "season"}
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------- RECORDS ----------------
+def player_json(player: Player):
+    return asdict(player)
+
+
+def team_json(team: Team):
+    return asdict(team)
+
+
+def match_json(match: Match):
+    return dict(asdict(match), result=match.result)
+
+
+def _row_id(text):
+    """A path id as an int, or None outside SQLite's integer range (no row has it)."""
+    value = int(text)
+    return value if SQLITE_MIN_INT <= value <= SQLITE_MAX_INT else None
+
+
+# ---------------- PAGING ----------------
+def _token(cursor):
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode().rstrip("=")
+
+
+def _cursor(listing, view, token):
+    if not token:
+        return None
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except ValueError:
+        cursor = None
+    if not listing.is_cursor(view, cursor):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid after cursor")
+    return tuple(cursor) if isinstance(cursor, list) else cursor
+
+
+def _view(listing, query):
+    sort = query.get("sort")
+    if sort is not None and not listing.sortable(sort):
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Cannot sort by {sort!r}; use one of "
+                                               f"{', '.join(listing.columns)}")
+    filters = {name: text for name, text in query.items()
+               if name not in PAGING_PARAMS and listing.sortable(name)}
+    return View(sort, query.get("desc", "") in ("1", "true", "yes"), filters)
+
+
+def _limit(query):
+    try:
+        limit = int(query.get("limit", PAGE_SIZE))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "limit must be a number")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _page(conn, listing, make, to_json, path, query, params=()):
+    view, limit = _view(listing, query), _limit(query)
+    try:
+        sql, args = listing.query(view, _cursor(listing, view, query.get("after")), limit + 1, params)
+    except ValidationError as e:
+        raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+    records = [make(*row) for row in conn.execute(sql, args).fetchall()]
+    next_url = None
+    if len(records) > limit:
+        records = records[:limit]
+        last = records[-1]
+        key = getattr(last, listing.key)
+        raw = None
+        if view.sort is not None:
+            raw = last.result if view.sort == "Result" else getattr(last, listing.columns[view.sort].sql)
+        next_url = path + "?" + urlencode(dict(query, after=_token(listing.cursor(view, key, raw))))
+    return {"items": [to_json(r) for r in records], "next": next_url}
+
+
+# ---------------- ENDPOINTS ----------------
+class Api:
+    """Routes GET requests to read-only queries; see the module docstring."""
+
+    def __init__(self, path=db.DB_NAME, workers=db.POOL_SIZE):
+        self.path = path
+        self.read_only = db.read_only(path)
+        # One worker per pooled connection, so a request never waits for a connection
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self.routes = [
+            (re.compile(r"/players"), self.players),
+            (re.compile(r"/players/(-?\d+)"), self.player),
+            (re.compile(r"/teams"), self.teams),
+            (re.compile(r"/teams/([^/]+)"), self.team),
+            (re.compile(r"/teams/([^/]+)/squad"), self.squad),
+            (re.compile(r"/matches"), self.matches),
+            (re.compile(r"/matches/(\d+)"), self.match),
+            (re.compile(r"/seasons"), self.seasons),
+        ]
+
+    def players(self, conn, path, query):
+        return _page(conn, PLAYER_LISTING, Player, player_json, path, query)
+
+    def player(self, conn, path, query, jersey):
+        key = _row_id(jersey)
+        row = None if key is None else conn.execute(f"{PLAYER_SELECT} WHERE jersey = ?", (key,)).fetchone()
+        if row is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No player with jersey {jersey}")
+        return player_json(Player(*row))
+
+    def teams(self, conn, path, query):
+        return {"items": [team_json(Team(*row))
+                          for row in conn.execute(f"{TEAM_SELECT} ORDER BY team_name")]}
+
+    def team(self, conn, path, query, name):
+        row = conn.execute(f"{TEAM_SELECT} WHERE team_name = ?", (name,)).fetchone()
+        if row is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No team named {name!r}")
+        return team_json(Team(*row))
+
+    def squad(self, conn, path, query, name):
+        self.team(conn, path, query, name)
+        return _page(conn, SQUAD_LISTING, Player, player_json, path, query, params=(name,))
+
+    def matches(self, conn, path, query):
+        season = query.get("season")
+        if season is None:
+            return _page(conn, MATCH_LISTING, Match, match_json, path, query)
+        self._archived(conn, season)
+        with db.connection(partitions.season_path(season, self.path)) as archive:
+            return _page(archive, MATCH_LISTING, Match, match_json, path, query)
+
+    def match(self, conn, path, query, match_id):
+        key = _row_id(match_id)
+        if key is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No match with id {match_id}")
+        row = conn.execute(f"{MATCH_SELECT} WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            season = conn.execute("SELECT season FROM archived_matches WHERE id = ?",
+                                  (key,)).fetchone()
+            if season is not None:
+                row = db.query_one(f"{MATCH_SELECT} WHERE id = ?", (key,),
+                                   path=partitions.season_path(season[0], self.path))
+        if row is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No match with id {match_id}")
+        return match_json(Match(*row))
+
+    def seasons(self, conn, path, query):
+        return {"items": [{"season": season, "matches": count} for season, count in
+                          conn.execute("SELECT season, matches FROM season_archives ORDER BY season")]}
+
+    def _archived(self, conn, season):
+        if conn.execute("SELECT 1 FROM season_archives WHERE season = ?", (season,)).fetchone() is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Season {season!r} is not archived; "
+                                                 "leave season out for the current matches")
+
+    # ---------------- REQUESTS ----------------
+    def _route(self, path):
+        for pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                return handler, [unquote(g) for g in match.groups()]
+        raise ApiError(HTTPStatus.NOT_FOUND, f"No endpoint {path}")
+
+    def read(self, target, if_none_match=None):
+        """(status, etag, payload) for one GET; runs on a worker thread.
+
+        The version and the data are read in one transaction, so the ETag
+        always matches the snapshot the body came from.
+        """
+        parts = urlsplit(target)
+        path = parts.path.rstrip("/") or "/"
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        with db.connection(self.read_only) as conn:
+            conn.execute("BEGIN")
+            try:
+                etag = '"%d"' % conn.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+                if path == "/":
+                    return HTTPStatus.OK, etag, {"endpoints": [p.pattern for p, _ in self.routes]}
+                handler, args = self._route(path)
+                if if_none_match and etag in (t.strip() for t in if_none_match.split(",")):
+                    return HTTPStatus.NOT_MODIFIED, etag, None
+                return HTTPStatus.OK, etag, handler(conn, parts.path, query, *args)
+            finally:
+                conn.rollback()
+
+    async def respond(self, method, target, headers):
+        """(status, extra headers, body bytes)."""
+        if method not in ("GET", "HEAD"):
+            return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Read-only API: GET only"), {"Allow": "GET, HEAD"}
+        loop = asyncio.get_running_loop()
+        try:
+            status, etag, payload = await loop.run_in_executor(
+                self.executor, self.read, target, headers.get("if-none-match"))
+        except ApiError as e:
+            return _error(e.status, str(e)), {}
+        except sqlite3.Error as e:
+            return _error(HTTPStatus.SERVICE_UNAVAILABLE, f"Database error: {e}"), {}
+        except Exception as e:   # a bug must still answer, and not end the connection
+            print(f"{method} {target} failed: {e!r}", file=sys.stderr)
+            return _error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error"), {}
+        body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode()
+        return (status, body), {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _error(status, message):
+    return status, json.dumps({"error": message}).encode()
+
+
+# ---------------- HTTP ----------------
+async def serve_connection(api, reader, writer):
+    # HTTP/1.1 with keep-alive; requests carry no body worth reading
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode("latin-1").split()
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if int(headers.get("content-length") or 0):
+                await reader.readexactly(int(headers["content-length"]))
+
+            (status, body), extra = await api.respond(method, target, headers)
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+            lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+                     "Content-Type: application/json; charset=utf-8",
+                     f"Content-Length: {len(body)}",
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            lines += [f"{name}: {value}" for name, value in extra.items()]
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass   # client went away or sent something that is not HTTP
+    finally:
+        writer.close()
+
+
+async def serve(path=db.DB_NAME, host="127.0.0.1", port=DEFAULT_PORT, ready=None):
+    api = Api(path)
+    server = await asyncio.start_server(lambda r, w: serve_connection(api, r, w), host, port)
+    if ready:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+
+def check_schema(path):
+    """The server cannot migrate a database it only reads; refuse an old one."""
+    version = db.query_one("PRAGMA user_version", path=db.read_only(path))[0]
+    if version < migrations.LATEST_VERSION:
+        raise SystemExit(f"{path} is at schema version {version}, expected "
+                         f"{migrations.LATEST_VERSION}: open it with the app or run migrations.py first")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the club database as read-only JSON")
+    parser.add_argument("--db", default=db.DB_NAME)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    check_schema(args.db)
+    print(f"Serving {args.db} on http://{args.host}:{args.port}/ (read-only)", flush=True)
+    try:
+        asyncio.run(serve(args.db, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Time the workloads the pages run against a synthetic league.
+
+    python benchmark.py --players 100000 --matches 50000 --output baseline.json
+    python benchmark.py --db bench.db --reuse --compare baseline.json
+
+Each workload is the repository call a page makes (plus the Treeview
+inserts when a display is available), timed REPEAT times after one warm-up
+run. Results are written as JSON; --compare reports every workload whose
+median got more than --threshold times slower than in the given baseline
+and exits non-zero if any did.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+import db
+import synthetic_league
+from listing import View
+from repository import (PAGE_SIZE, MatchRepository, PlayerRepository, PlayerStatRepository,
+                        UserRepository)
+
+REPEAT = 20
+# Sub-millisecond workloads jitter by more than --threshold between runs
+MIN_REGRESSION_MS = 0.5
+DEFAULT_DB = "benchmark.db"
+
+
+# ---------------- TIMING ----------------
+def measure(work, repeat=REPEAT):
+    result = work()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = work()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "min_ms": round(samples[0], 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "rows": len(result) if hasattr(result, "__len__") else None,
+    }
+
+
+# ---------------- WORKLOADS ----------------
+def data_workloads(path, team):
+    players = PlayerRepository(path)
+    matches = MatchRepository(path)
+    users = UserRepository(path)
+    stat_lines = PlayerStatRepository(path)
+
+    def refresh_table():
+        page = players.page(None, PAGE_SIZE)
+        totals = stat_lines.totals(p.jersey for p in page)
+        return [p.as_row()[:8] + tuple(totals.get(p.jersey, {}).values()) for p in page]
+
+    def load_matches():
+        return [list(m.as_row()) + [m.result] for m in matches.all()]
+
+    # Same calls as the pages, see player_page / team_page / match_page / login_page
+    return {
+        "refresh_table": refresh_table,
+        "refresh_table_next_page": lambda: players.page(PAGE_SIZE * 10, PAGE_SIZE),
+        "sort_players_by_goals": lambda: players.listing(View("Goals", descending=True), None, PAGE_SIZE),
+        "sort_players_by_age_next_page": lambda: players.listing(View("Age"), (25, 0), PAGE_SIZE),
+        "filter_players": lambda: players.listing(View("Name", filters={"Age": "20-25"}), None, PAGE_SIZE),
+        "search_player": lambda: players.search("mar", None, PAGE_SIZE, 0, ranked=True),
+        "search_player_live": lambda: players.search("mar", None, PAGE_SIZE, 0, ranked=False),
+        "search_player_jersey": lambda: players.search("", 42, PAGE_SIZE, 0),
+        "load_squad": lambda: players.squad(team),
+        "player_history": lambda: stat_lines.history(1),
+        "load_matches": load_matches,
+        "calculate_win_rate": lambda: [matches.totals()],
+        "handle_login": lambda: [users.authenticate("admin", "admin")],
+    }
+
+
+def start_virtual_display():
+    """Return an Xvfb process if there is no display and Xvfb is installed."""
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    display = ":99"
+    process = subprocess.Popen(["Xvfb", display, "-screen", "0", "1920x1080x24"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return process
+
+
+def treeview_workloads(path, team, root):
+    from tkinter import ttk
+
+    players = PlayerRepository(path)
+    matches = MatchRepository(path)
+    player_rows = [p.as_row()[:8] for p in players.page(None, PAGE_SIZE)]
+    squad_rows = [(p.jersey, p.name, p.position) for p in players.squad(team)]
+    match_rows = [list(m.as_row()) + [m.result] for m in matches.all()]
+
+    def fill(columns, rows):
+        tree = ttk.Treeview(root, columns=columns, show="headings")
+
+        def work():
+            tree.delete(*tree.get_children())
+            for i, row in enumerate(rows):
+                tree.insert("", "end", values=row, tags=("evenrow" if i % 2 == 0 else "oddrow",))
+            root.update_idletasks()
+            return rows
+        return work
+
+    return {
+        "treeview_player_page": fill(tuple(range(8)), player_rows),
+        "treeview_squad": fill(("Jersey", "Name", "Position"), squad_rows),
+        "treeview_matches": fill(tuple(range(9)), match_rows),
+    }
+
+
+def run(path, repeat=REPEAT, gui=True):
+    team = db.query_one("SELECT team_assigned FROM players WHERE team_assigned IS NOT NULL "
+                        "GROUP BY team_assigned ORDER BY COUNT(*) DESC LIMIT 1", path=path)
+    team = team[0] if team else ""
+    results = {name: measure(work, repeat) for name, work in data_workloads(path, team).items()}
+
+    skipped = None
+    if gui:
+        display = start_virtual_display()
+        try:
+            import tkinter as tk
+            root = tk.Tk()
+            root.withdraw()
+        except Exception as e:   # no display, or Tk not installed
+            skipped = f"Treeview workloads skipped: {e}"
+        else:
+            for name, work in treeview_workloads(path, team, root).items():
+                results[name] = measure(work, max(1, repeat // 4))
+            root.destroy()
+        finally:
+            if display:
+                display.terminate()
+    return results, skipped
+
+
+# ---------------- REPORTING ----------------
+def table_counts(path):
+    return {table: db.query_one(f"SELECT COUNT(*) FROM {table}", path=path)[0]
+            for table in ("teams", "players", "matches", "player_match_stats", "users")}
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before["median_ms"]:
+            continue
+        ratio = now["median_ms"] / before["median_ms"]
+        slower = ratio > threshold and now["median_ms"] - before["median_ms"] > MIN_REGRESSION_MS
+        flag = "  <-- slower" if slower else ""
+        print(f"  {name:26} {before['median_ms']:>10.3f} -> {now['median_ms']:>10.3f} ms  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard workloads")
+    parser.add_argument("--db", default=DEFAULT_DB, help="synthetic database to create or reuse")
+    parser.add_argument("--reuse", action="store_true", help="benchmark --db as it is")
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--no-gui", action="store_true", help="skip the Treeview workloads")
+    parser.add_argument("--output", help="write results as JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    if not args.reuse:
+        print(f"Generating {args.db} (seed {args.seed})")
+        synthetic_league.generate(args.db, args.teams, args.players, args.matches,
+                                  seed=args.seed, verbose=True)
+
+    results, skipped = run(args.db, args.repeat, gui=not args.no_gui)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": None if args.reuse else args.seed,
+        "counts": table_counts(args.db),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    print(f"{'workload':28} {'median':>10} {'p95':>10}   rows")
+    for name, r in results.items():
+        print(f"  {name:26} {r['median_ms']:>10.3f} {r['p95_ms']:>10.3f}   {r['rows']}")
+    if skipped:
+        print(skipped)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare}:")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} workload(s) slower than x{args.threshold}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
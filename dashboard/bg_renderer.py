@@ -0,0 +1,292 @@
+from collections import OrderedDict
+import hashlib
+import marshal
+import os
+import threading
+from query_executor import QueryExecutor
+
+# PIL is imported inside the functions that use it: importing it and decoding
+# the source image happen on the render thread, after the first frame is up.
+
+DEBOUNCE_MS = 120       # wait this long after the last resize before the final render
+PREVIEW_WIDTH = 320     # preview frames are upscaled from a thumbnail this wide
+CACHE_SIZE = 8          # rendered frames kept across all windows
+DISK_CACHE_FILES = 32   # rendered frames kept on disk across launches
+
+# Finished frames are also saved here, so the next launch (or the next
+# window at the same size) loads a PNG instead of resampling the master.
+CACHE_DIR = os.environ.get("SOCCER_ASSET_CACHE", "asset_cache")
+
+# Resampling runs here so the Tk main loop stays free while a window is dragged
+render_executor = QueryExecutor(max_workers=1)
+
+_masters = {}
+_thumbs = {}
+_frames = OrderedDict()
+_hashes = {}
+_lock = threading.Lock()
+
+
+# ---------------- SOURCE IMAGES ----------------
+def load_master(path):
+    """Decode path once per process; returns None if it cannot be opened."""
+    from PIL import Image
+
+    with _lock:
+        if path not in _masters:
+            try:
+                image = Image.open(path)
+                image.load()
+                _masters[path] = image
+            except Exception as e:
+                print(f"Error loading image: {e}")
+                _masters[path] = None
+        return _masters[path]
+
+
+def is_loaded(path):
+    with _lock:
+        return path in _masters
+
+
+def _thumbnail(path):
+    from PIL import Image
+
+    with _lock:
+        thumb = _thumbs.get(path)
+    if thumb is None:
+        master = load_master(path)
+        ratio = PREVIEW_WIDTH / master.width
+        thumb = master.resize((PREVIEW_WIDTH, max(1, int(master.height * ratio))), Image.BILINEAR)
+        with _lock:
+            _thumbs[path] = thumb
+    return thumb
+
+
+def source_hash(path):
+    """sha1 of the file's bytes, once per process; None if it cannot be read."""
+    with _lock:
+        if path in _hashes:
+            return _hashes[path]
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        digest = None
+    with _lock:
+        _hashes[path] = digest
+    return digest
+
+
+# ---------------- RENDERING ----------------
+def overlay_key(overlay):
+    # overlay is a function(draw, w, h) drawing onto a transparent RGBA layer
+    if overlay is None:
+        return None
+    return f"{overlay.__module__}.{overlay.__qualname__}"
+
+
+def overlay_recipe(overlay):
+    # Hash of the overlay's bytecode and constants: editing the drawing code
+    # gives a new recipe, so stale frames on disk are never shown
+    if overlay is None:
+        return "plain"
+    return hashlib.sha1(marshal.dumps(overlay.__code__)).hexdigest()[:12]
+
+
+# ---------------- DISK CACHE ----------------
+def disk_cache_path(path, size, overlay=None):
+    digest = source_hash(path)
+    if digest is None:
+        return None
+    w, h = size
+    return os.path.join(CACHE_DIR, f"{digest[:16]}_{w}x{h}_{overlay_recipe(overlay)}.png")
+
+
+def load_cached(path, size, overlay=None):
+    """Frame from the disk cache (also put in the memory cache), or None."""
+    from PIL import Image
+
+    file = disk_cache_path(path, size, overlay)
+    if file is None or not os.path.exists(file):
+        return None
+    try:
+        frame = Image.open(file)
+        frame.load()
+        os.utime(file)   # most recently used survives pruning
+    except Exception:
+        return None
+    _remember(path, size, overlay, frame)
+    return frame
+
+
+def _save_cached(path, size, overlay, frame):
+    file = disk_cache_path(path, size, overlay)
+    if file is None:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp = f"{file}.{threading.get_ident()}.tmp"
+        frame.save(temp, "PNG", compress_level=1)
+        os.replace(temp, file)   # other processes never see half a file
+        _prune_disk_cache()
+    except OSError as e:
+        print(f"Could not cache background: {e}")
+
+
+def _prune_disk_cache():
+    files = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR) if name.endswith(".png")]
+    if len(files) <= DISK_CACHE_FILES:
+        return
+    files.sort(key=os.path.getmtime)
+    for file in files[:len(files) - DISK_CACHE_FILES]:
+        try:
+            os.remove(file)
+        except OSError:
+            pass
+
+
+def _compose(base, size, overlay):
+    from PIL import Image, ImageDraw
+
+    if overlay is None:
+        return base
+    w, h = size
+    layer = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    overlay(ImageDraw.Draw(layer), w, h)
+    return Image.alpha_composite(base.convert("RGBA"), layer)
+
+
+def render_frame(path, size, overlay=None):
+    """Full-quality LANCZOS frame; safe to call from a worker thread."""
+    from PIL import Image
+
+    frame = cached_frame(path, size, overlay)
+    if frame is None:
+        frame = load_cached(path, size, overlay)
+    if frame is not None:
+        return frame
+    frame = _compose(load_master(path).resize(size, Image.LANCZOS), size, overlay)
+    _remember(path, size, overlay, frame)
+    _save_cached(path, size, overlay, frame)
+    return frame
+
+
+def _remember(path, size, overlay, frame):
+    with _lock:
+        _frames[(path, size, overlay_key(overlay))] = frame
+        while len(_frames) > CACHE_SIZE:
+            _frames.popitem(last=False)
+
+
+def cached_frame(path, size, overlay=None):
+    key = (path, size, overlay_key(overlay))
+    with _lock:
+        frame = _frames.get(key)
+        if frame is not None:
+            _frames.move_to_end(key)
+        return frame
+
+
+def preview_frame(path, size, overlay=None):
+    from PIL import Image
+
+    return _compose(_thumbnail(path).resize(size, Image.BILINEAR), size, overlay)
+
+
+# ---------------- PER-WINDOW RENDERER ----------------
+class BackgroundRenderer:
+    """Keeps a widget's background image in step with its size.
+
+    Call request(w, h) from the <Configure> handler. A cached frame is shown
+    straight away; otherwise a cheap preview is shown and the LANCZOS render
+    is started once the resize burst has been quiet for DEBOUNCE_MS.
+    show(photo) is called on the main thread whenever a new frame is ready.
+
+    The first renderer for an image checks the disk cache and otherwise
+    decodes the image on the render thread, so available is None until that
+    has finished (False if the image cannot be read).
+    """
+
+    def __init__(self, widget, path, show, overlay=None, min_size=10):
+        self.widget = widget
+        self.path = path
+        self.show = show
+        self.overlay = overlay
+        self.min_size = min_size
+        self.available = (load_master(path) is not None) if is_loaded(path) else None
+        self.photo = None       # keep a reference or Tk drops the image
+        self.size = None
+        self._preview_job = None
+        self._render_job = None
+        self._loading = False
+
+    def request(self, w, h):
+        if self.available is False or w < self.min_size or h < self.min_size:
+            return
+        if (w, h) == self.size:
+            return
+        self.size = (w, h)
+        self._cancel_jobs()
+
+        if self.available is None:
+            self._load()
+            return
+
+        frame = cached_frame(self.path, self.size, self.overlay)
+        if frame is not None:
+            self._display(frame)
+            return
+
+        # Many <Configure> events arrive per idle cycle while dragging;
+        # only the last size gets a preview.
+        self._preview_job = self.widget.after_idle(self._show_preview)
+        self._render_job = self.widget.after(DEBOUNCE_MS, self._start_render)
+
+    def _load(self):
+        if self._loading:
+            return
+        self._loading = True
+        path, size, overlay = self.path, self.size, self.overlay
+
+        def prepare():
+            # A frame saved by an earlier launch means no decode at all
+            if load_cached(path, size, overlay) is not None:
+                return True
+            return load_master(path) is not None and source_hash(path) is not None
+
+        def loaded(ok):
+            self._loading = False
+            self.available = ok
+            size, self.size = self.size, None
+            self.request(*size)
+
+        render_executor.submit(self.widget, self, prepare, loaded)
+
+    def _cancel_jobs(self):
+        for job in (self._preview_job, self._render_job):
+            if job is not None:
+                self.widget.after_cancel(job)
+        self._preview_job = self._render_job = None
+
+    def _show_preview(self):
+        self._preview_job = None
+        if not is_loaded(self.path):
+            return  # master not decoded yet (frames so far came from disk); wait for the render
+        self._display(preview_frame(self.path, self.size, self.overlay))
+
+    def _start_render(self):
+        self._render_job = None
+        path, size, overlay = self.path, self.size, self.overlay
+
+        def finished(frame):
+            if size == self.size:
+                self._display(frame)
+
+        render_executor.submit(self.widget, self, lambda: render_frame(path, size, overlay), finished)
+
+    def _display(self, frame):
+        from PIL import ImageTk
+
+        self.photo = ImageTk.PhotoImage(frame)
+        self.show(self.photo)
@@ -0,0 +1,243 @@
+"""Streaming bulk import / export for players, teams and matches.
+
+Usage (run from the dashboard folder, like the app):
+    python bulk_io.py import players players.csv
+    python bulk_io.py import matches season_2019.jsonl --rejects bad_rows.jsonl
+    python bulk_io.py export teams teams.csv
+    python bulk_io.py --db club.db import player_stats stats.csv
+
+Files are CSV (with a header row) or JSON Lines (.jsonl / .ndjson), one
+record per line, using the database column names as keys. Rows are checked
+with the same rules as the entry forms and written CHUNK_SIZE at a time,
+each chunk in a single executemany transaction.
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from itertools import islice
+
+import db
+import migrations
+import partitions
+import player_stats
+from validation import (MATCH_COLUMNS, PLAYER_COLUMNS, STAT_COLUMNS, TEAM_COLUMNS,
+                        ValidationError, match_row, player_row, stat_row, team_row)
+
+CHUNK_SIZE = 5000
+
+
+# ---------------- ENTITIES ----------------
+def _match_with_id(record):
+    # Exported matches carry their id; keeping it is what keeps an exported
+    # player_stats file pointing at the right matches. No id means a new one.
+    # Blank scores stay NULL: the match has not been played yet.
+    text = "" if record.get("id") is None else str(record["id"]).strip()
+    try:
+        match_id = int(text) if text else None
+    except ValueError:
+        raise ValidationError("Match id must be a number")
+    return (match_id,) + match_row(record, blank_score=None)
+
+
+# players keep their team assignment and matches their id on a round trip
+ENTITIES = {
+    "players": {
+        "validate": lambda r: player_row(r) + ((r.get("team_assigned") or None),),
+        "insert": f"""INSERT INTO players ({", ".join(PLAYER_COLUMNS)}, team_assigned)
+                      VALUES ({", ".join("?" * (len(PLAYER_COLUMNS) + 1))})""",
+        "export": f"SELECT {', '.join(PLAYER_COLUMNS)}, team_assigned FROM players ORDER BY jersey",
+        "duplicate": "Jersey number already exists!",
+    },
+    "teams": {
+        "validate": team_row,
+        # Saving a team that already exists updates it, as the form does
+        "insert": f"""INSERT OR REPLACE INTO teams ({", ".join(TEAM_COLUMNS)})
+                      VALUES ({", ".join("?" * len(TEAM_COLUMNS))})""",
+        "export": f"SELECT {', '.join(TEAM_COLUMNS)} FROM teams ORDER BY team_name",
+        "duplicate": "Team already exists",
+    },
+    "matches": {
+        "validate": _match_with_id,
+        # An id that is already there is updated, so importing a file twice is
+        # harmless; an archived one is rejected (see partitions)
+        "insert": f"""INSERT INTO matches (id, {", ".join(MATCH_COLUMNS)})
+                      VALUES ({", ".join("?" * (len(MATCH_COLUMNS) + 1))})
+                      ON CONFLICT (id) DO UPDATE SET
+                      {", ".join(f"{c} = excluded.{c}" for c in MATCH_COLUMNS)}""",
+        "export": f"SELECT id, {', '.join(MATCH_COLUMNS)} FROM matches ORDER BY id",
+        "duplicate": "Match already exists",
+    },
+    # One line per player per match; match_id refers to an existing matches.id
+    "player_stats": {
+        "validate": stat_row,
+        "insert": f"""INSERT INTO player_match_stats ({", ".join(STAT_COLUMNS)})
+                      VALUES ({", ".join("?" * len(STAT_COLUMNS))})""",
+        "export": f"SELECT {', '.join(STAT_COLUMNS)} FROM player_match_stats ORDER BY match_id, jersey",
+        "duplicate": "Stats for this player and match already exist",
+    },
+}
+
+
+# ---------------- FILE FORMATS ----------------
+def file_format(path):
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Unsupported file type: {path} (use .csv or .jsonl)")
+
+
+def read_records(path):
+    """Yield (line_no, record, error) one at a time; record is a dict."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format(path) == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record, None
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_no, line.rstrip("\n"), f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, record, "Each line must be a JSON object"
+                    continue
+                yield line_no, record, None
+
+
+def write_records(path, columns, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if file_format(path) == "csv":
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        else:
+            for row in rows:
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+
+
+# ---------------- IMPORT ----------------
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = []   # (line_no, reason, record)
+
+    def reject(self, line_no, reason, record):
+        self.rejected.append((line_no, reason, record))
+
+    def summary(self):
+        return f"{self.imported} imported, {len(self.rejected)} rejected"
+
+
+def import_records(entity, records, chunk_size=CHUNK_SIZE, report=None, path=db.DB_NAME):
+    """Validate and insert (line_no, record, error) tuples chunk by chunk."""
+    spec = ENTITIES[entity]
+    report = report or ImportReport()
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return report
+
+        good = []
+        for line_no, record, error in chunk:
+            if error is None:
+                try:
+                    good.append((line_no, record, spec["validate"](record)))
+                    continue
+                except ValidationError as e:
+                    error = str(e)
+            report.reject(line_no, error, record)
+        if not good:
+            continue
+
+        try:
+            with db.transaction(path) as conn:
+                conn.executemany(spec["insert"], [row for _, _, row in good])
+            report.imported += len(good)
+        except sqlite3.IntegrityError:
+            # Something in the chunk clashes with existing data: redo it one
+            # row at a time so only the clashing rows are rejected
+            with db.transaction(path) as conn:
+                for line_no, record, row in good:
+                    try:
+                        conn.execute(spec["insert"], row)
+                        report.imported += 1
+                    except sqlite3.IntegrityError as e:
+                        report.reject(line_no, _clash_reason(spec, e), record)
+
+
+def _clash_reason(spec, error):
+    # Reference checks (see player_stats) and archived match ids (see
+    # partitions) carry their own message
+    message = str(error)
+    if message in player_stats.REFERENCE_ERRORS + (partitions.ARCHIVED_ERROR,):
+        return message
+    return spec["duplicate"]
+
+
+def import_file(entity, path, chunk_size=CHUNK_SIZE, db_path=db.DB_NAME):
+    return import_records(entity, read_records(path), chunk_size, path=db_path)
+
+
+# ---------------- EXPORT ----------------
+def export_file(entity, path, chunk_size=CHUNK_SIZE, db_path=db.DB_NAME):
+    """Stream a whole table to path; returns the number of rows written."""
+    count = 0
+    with db.connection(db_path) as conn:
+        cursor = conn.execute(ENTITIES[entity]["export"])
+        columns = [d[0] for d in cursor.description]
+
+        def rows():
+            nonlocal count
+            while True:
+                batch = cursor.fetchmany(chunk_size)
+                if not batch:
+                    return
+                count += len(batch)
+                yield from batch
+
+        write_records(path, columns, rows())
+    return count
+
+
+# ---------------- COMMAND LINE ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export for the soccer database")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("entity", choices=sorted(ENTITIES))
+    parser.add_argument("path", help=".csv or .jsonl file")
+    parser.add_argument("--db", default=db.DB_NAME)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--rejects", help="write rejected rows here as JSON Lines")
+    args = parser.parse_args(argv)
+
+    migrations.migrate(args.db)
+    if args.action == "export":
+        count = export_file(args.entity, args.path, args.chunk_size, args.db)
+        print(f"{count} {args.entity} exported to {args.path}")
+        return 0
+
+    report = import_file(args.entity, args.path, args.chunk_size, args.db)
+    print(f"{args.entity}: {report.summary()}")
+    for line_no, reason, _ in report.rejected[:20]:
+        print(f"  line {line_no}: {reason}")
+    if len(report.rejected) > 20:
+        print(f"  ... and {len(report.rejected) - 20} more")
+    if args.rejects and report.rejected:
+        with open(args.rejects, "w", encoding="utf-8") as f:
+            for line_no, reason, record in report.rejected:
+                f.write(json.dumps({"line": line_no, "reason": reason, "record": record},
+                                   ensure_ascii=False) + "\n")
+    return 1 if report.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
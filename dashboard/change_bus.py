@@ -0,0 +1,72 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, List, Optional
+
+import db
+
+# In-process notifications of writes, so every open window can patch just
+# the rows another window changed. The repositories publish after each
+# commit, one call per transaction; change_log (triggers) still covers
+# other processes and pages that were hidden.
+#
+# Keys are players.jersey, teams.team_name, matches.id and
+# (match_id, jersey) for player_match_stats.
+
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+
+
+@dataclass(frozen=True)
+class Change:
+    entity: str      # table name
+    key: Hashable
+    op: str          # INSERT, UPDATE or DELETE
+
+
+class ChangeBus:
+    """Subscribers are called synchronously, on the publishing thread, with
+    the list of changes one write made (only those for their entities)."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[List[Change]], None], entities=None,
+                  path=db.DB_NAME) -> Callable[[], None]:
+        """Returns the function that unsubscribes again."""
+        with self._lock:
+            token = self._next_id
+            self._next_id += 1
+            self._subscribers[token] = (callback, set(entities) if entities else None, path)
+        return lambda: self._unsubscribe(token)
+
+    def _unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, changes: Iterable[Change], path=db.DB_NAME) -> None:
+        changes = list(changes)
+        if not changes:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, entities, wanted_path in subscribers:
+            if wanted_path != path:
+                continue
+            mine = changes if entities is None else [c for c in changes if c.entity in entities]
+            if mine:
+                try:
+                    callback(mine)
+                except Exception as e:   # one broken window must not fail the write
+                    print(f"Change subscriber failed: {e}")
+
+
+bus = ChangeBus()
+
+
+def publish(entity: str, op: str, keys: Iterable[Hashable], path=db.DB_NAME) -> None:
+    bus.publish((Change(entity, key, op) for key in keys), path)
+
+
+def subscribe(callback, entities: Optional[Iterable[str]] = None, path=db.DB_NAME):
+    return bus.subscribe(callback, entities, path)
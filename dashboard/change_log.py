@@ -0,0 +1,78 @@
+import db
+
+# Every insert, update and delete on players, teams and matches appends the
+# affected key here (via triggers, so bulk imports and other processes are
+# covered too). A window that was hidden asks for the keys changed since the
+# seq it last saw and refreshes just those rows.
+
+KEEP = 20000    # log rows kept; a reader further behind than this reloads everything
+
+TRACKED = {"players": "jersey", "teams": "team_name", "matches": "id"}
+
+LOG_SQL = """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_key TEXT NOT NULL
+    )
+"""
+
+
+def _triggers():
+    for table, key in TRACKED.items():
+        log = "INSERT INTO change_log (table_name, row_key) VALUES ('{t}', {row}.{k});"
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_log_ai AFTER INSERT ON {table} BEGIN
+            {log.format(t=table, row="new", k=key)}
+        END
+        """
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_log_ad AFTER DELETE ON {table} BEGIN
+            {log.format(t=table, row="old", k=key)}
+        END
+        """
+        # A changed key shows up as both the old and the new key
+        yield f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_log_au AFTER UPDATE ON {table} BEGIN
+            {log.format(t=table, row="new", k=key)}
+            INSERT INTO change_log (table_name, row_key)
+            SELECT '{table}', old.{key} WHERE old.{key} IS NOT new.{key};
+        END
+        """
+
+
+def create_change_log(conn):
+    conn.execute(LOG_SQL)
+    for trigger in _triggers():
+        conn.execute(trigger)
+
+
+# ---------------- READING ----------------
+def latest(path=db.DB_NAME):
+    return db.query_one("SELECT COALESCE(MAX(seq), 0) FROM change_log", path=path)[0]
+
+
+def changes_since(seq, path=db.DB_NAME):
+    """(new_seq, changes) where changes maps table -> set of changed keys.
+
+    changes is None when the log no longer reaches back to seq (trimmed),
+    meaning the caller should reload everything.
+    """
+    with db.connection(path) as conn:
+        oldest, newest = conn.execute(
+            "SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM change_log").fetchone()
+        if newest <= seq:
+            return seq, {}
+        if oldest > seq + 1:
+            return newest, None
+        changes = {table: set() for table in TRACKED}
+        for table, key in conn.execute(
+                "SELECT DISTINCT table_name, row_key FROM change_log WHERE seq > ? AND seq <= ?",
+                (seq, newest)):
+            changes[table].add(key)
+    return newest, changes
+
+
+def trim(keep=KEEP, path=db.DB_NAME):
+    db.execute("DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?",
+               (keep,), path=path)
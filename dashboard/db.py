@@ -0,0 +1,219 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import quote
+
+import profiler
+
+DB_NAME = "soccer.db"
+POOL_SIZE = 4
+ACQUIRE_TIMEOUT = 30   # seconds to wait for a free pooled connection
+
+# Applied to every pooled connection once, when it is opened.
+# WAL lets readers and the single writer work without blocking each other,
+# NORMAL sync is safe under WAL and avoids an fsync on every commit.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",      # ~16 MB page cache per connection
+    "PRAGMA mmap_size=134217728",    # 128 MB memory-mapped reads
+    "PRAGMA busy_timeout=5000",
+)
+# Skipped on read-only connections: the journal mode is the writer's to set
+WRITER_PRAGMAS = ("PRAGMA journal_mode=WAL",)
+
+# path -> setup(conn), run on each new pooled connection after the pragmas
+_on_open = {}
+
+
+def read_only(path):
+    """URI that opens path read-only; usable as the path for every helper here."""
+    return f"file:{quote(os.path.abspath(path))}?mode=ro"
+
+
+def on_open(path, setup):
+    """Run setup(conn) on every connection the pool for path opens (e.g. ATTACH)."""
+    _on_open[path] = setup
+
+
+# ---------------- CONNECTION POOL ----------------
+class PoolTimeout(sqlite3.OperationalError):
+    """No connection came free in time, usually a thread borrowing twice."""
+
+
+class ConnectionPool:
+    """Small pool of long-lived connections to one database file."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = []          # used last in, first out
+        self._all = []
+        self._closes = 0         # bumped by close(), so waiters can tell
+        self._cond = threading.Condition()
+
+    def _open(self):
+        uri = self.path.startswith("file:")
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, uri=uri)
+        read_only = uri and "mode=ro" in self.path
+        for pragma in PRAGMAS:
+            if not (read_only and pragma in WRITER_PRAGMAS):
+                conn.execute(pragma)
+        setup = _on_open.get(self.path)
+        if setup is not None:
+            setup(conn)
+        return conn
+
+    def acquire(self, timeout=ACQUIRE_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            closes = self._closes
+            while True:
+                if self._closes != closes:
+                    raise sqlite3.OperationalError(f"Connection pool for {self.path} was closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._all) < self.size:
+                    conn = self._open()
+                    self._all.append(conn)
+                    return conn
+                # Pool exhausted: wait for another caller to hand one back
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(
+                        f"No free connection to {self.path} after {timeout}s; all {self.size} "
+                        f"are borrowed (is one thread borrowing twice, e.g. query() inside stream()?)")
+                self._cond.wait(remaining)
+
+    def release(self, conn):
+        with self._cond:
+            if not any(c is conn for c in self._all):
+                return   # the pool was closed while it was borrowed
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all.clear()
+            self._idle.clear()
+            self._closes += 1
+            self._cond.notify_all()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=DB_NAME):
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path)
+        return pool
+
+
+def close_all():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_all)
+
+
+# ---------------- HELPERS USED BY THE PAGES ----------------
+@contextmanager
+def _borrow(path):
+    pool = get_pool(path)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+@contextmanager
+def connection(path=DB_NAME):
+    """Borrow a pooled connection for the duration of the block."""
+    with _borrow(path) as conn:
+        # Only wrapped while profiling, so the normal path is untouched
+        yield profiler.ProfiledConnection(conn) if profiler.enabled else conn
+
+
+@contextmanager
+def transaction(path=DB_NAME):
+    """Borrow a connection and commit on success, roll back on error."""
+    with connection(path) as conn:
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+def query(sql, params=(), path=DB_NAME):
+    # Timed here rather than by the wrapper so the fetch and row count are included
+    started = time.perf_counter()
+    with _borrow(path) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    if profiler.enabled:
+        profiler.record_sql(sql, started, len(rows))
+    return rows
+
+
+def query_one(sql, params=(), path=DB_NAME):
+    started = time.perf_counter()
+    with _borrow(path) as conn:
+        row = conn.execute(sql, params).fetchone()
+    if profiler.enabled:
+        profiler.record_sql(sql, started, int(row is not None))
+    return row
+
+
+def stream(sql, params=(), first_chunk=None, chunk_size=500, path=DB_NAME):
+    """Yield the result fetchmany-sized lists at a time.
+
+    Holds one pooled connection until the generator is exhausted or closed.
+    The first list can be smaller, so a first screenful arrives quickly.
+    """
+    started = time.perf_counter()
+    count = 0
+    with _borrow(path) as conn:
+        cursor = conn.execute(sql, params)
+        size = first_chunk or chunk_size
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                break
+            count += len(rows)
+            yield rows
+            size = chunk_size
+    if profiler.enabled:
+        profiler.record_sql(sql, started, count)
+
+
+def execute(sql, params=(), path=DB_NAME):
+    """Run a single write in its own transaction.
+
+    Returns the cursor so callers can read rowcount / lastrowid.
+    """
+    with transaction(path) as conn:
+        return conn.execute(sql, params)
+
+
+def executemany(sql, seq_of_params, path=DB_NAME):
+    with transaction(path) as conn:
+        return conn.executemany(sql, seq_of_params)
@@ -1,6 +1,12 @@
+import startup  # first, so its clock starts as early as possible
 import tkinter as tk
-from PIL import Image, ImageTk, ImageDraw, ImageFilter
-from login_page import open_login_page
+from bg_renderer import BackgroundRenderer
+import change_log
+import migrations
+from startup import lazy, mark
+
+open_login_page = lazy("login_page", "open_login_page")
+mark("imports")
 
 # Colour Palette
 WHITE        = "#FFFFFF"
@@ -11,6 +17,11 @@ BTN_HOVER    = "#2980B9"
 OVERLAY_TOP  = (10, 10, 30, 210)
 OVERLAY_BOT  = (0, 0, 0, 160)
 
+# Bring the database schema up to date once, before any page touches it
+migrations.migrate()
+change_log.trim()
+mark("schema migrated")
+
 # Main Window
 root = tk.Tk()
 root.title("Soccer Management System")
@@ -19,13 +30,26 @@ root.state("zoomed")
 canvas = tk.Canvas(root, highlightthickness=0)
 canvas.pack(fill="both", expand=True)
 
-bg_photo       = None
-original_image = None
-try:
-    original_image = Image.open("football.png")
-except Exception as e:
-    print(f"Error loading image: {e}")
-    canvas.config(bg="#0d1b2a")
+# Background overlay, drawn over the resized photo
+def draw_overlay(draw, w, h):
+    # Top dark band (navbar area)
+    draw.rectangle([(0, 0), (w, 75)], fill=(13, 27, 42, 220))
+
+    # Centre vignette to make text pop
+    draw.rectangle([(w//2 - 520, h//2 - 160), (w//2 + 520, h//2 + 140)],
+                    fill=(0, 0, 0, 90))
+
+    # Bottom footer strip
+    draw.rectangle([(0, h - 45), (w, h)], fill=(13, 27, 42, 210))
+
+def show_background(photo):
+    canvas.delete("bg")
+    canvas.create_image(0, 0, anchor="nw", image=photo, tags="bg")
+    canvas.tag_lower("bg")
+
+# The plain colour shows until the background has been rendered
+canvas.config(bg="#0d1b2a")
+background = BackgroundRenderer(canvas, "football.png", show_background, overlay=draw_overlay)
 
 # Static Canvas Elements
 # Top navbar bar (drawn as a rectangle tag)
@@ -79,34 +103,12 @@ btn_login.bind("<Leave>", lambda e: btn_login.config(bg=BTN_BG))
 
 # Resize / Redraw
 def resize_content(event):
-    global bg_photo
     w, h = event.width, event.height
     if w < 10 or h < 10:
         return
 
-    # Background
-    if original_image:
-        resized = original_image.resize((w, h), Image.LANCZOS).convert("RGBA")
-
-        # Top dark band (navbar area)
-        overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        draw    = ImageDraw.Draw(overlay)
-        draw.rectangle([(0, 0), (w, 75)], fill=(13, 27, 42, 220))
-
-        # Centre vignette to make text pop
-        draw.rectangle([(w//2 - 520, h//2 - 160), (w//2 + 520, h//2 + 140)],
-                        fill=(0, 0, 0, 90))
-
-        # Bottom footer strip
-        draw.rectangle([(0, h - 45), (w, h)], fill=(13, 27, 42, 210))
-
-        combined = Image.alpha_composite(resized, overlay)
-        bg_photo = ImageTk.PhotoImage(combined)
-        canvas.delete("bg")
-        canvas.create_image(0, 0, anchor="nw", image=bg_photo, tags="bg")
-        canvas.tag_lower("bg")
-    else:
-        canvas.config(bg="#0d1b2a")
+    # Background (debounced and cached, see bg_renderer)
+    background.request(w, h)
 
     # Reposition all elements
     cx = w // 2
@@ -143,4 +145,17 @@ def resize_content(event):
     canvas.tag_raise("footer")
 
 canvas.bind("<Configure>", resize_content)
+mark("window built")
+
+# Load the rest of the app while the user is looking at the welcome screen
+def first_frame_shown():
+    mark("first frame")
+    startup.prewarm(root, ["PIL.ImageTk", "login_page", "soccer",
+                           "player_page", "team_page", "match_page"], done=finish_startup)
+
+def finish_startup():
+    mark("prewarm finished")
+    startup.report()
+
+startup.after_first_frame(root, first_frame_shown)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,166 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import List, Optional, Tuple
+
+import change_bus
+import db
+from validation import ValidationError
+
+# League calendars for the teams in the teams table. Fixtures are stored as
+# matches with home_team / away_team set and no scores yet (see
+# migrations.fixture_columns); opponent repeats the away team so the match
+# page shows them as before. They count towards the league table (see
+# standings), not the club's win rate (see season_stats.COUNTED).
+
+
+@dataclass
+class Fixture:
+    round: int
+    home: str
+    away: str
+    match_date: str = ""
+    venue: str = ""
+
+
+# ---------------- ROUND ROBIN ----------------
+def round_robin(teams, double=False) -> List[List[Tuple[str, str]]]:
+    """Rounds of (home, away) pairs, by the circle method.
+
+    Every team meets every other once, or twice with double (the second
+    half repeats the first with home and away swapped). Nobody plays twice
+    in a round; with an odd number of teams one team sits each round out.
+    Home and away alternate round by round as far as the method allows.
+    """
+    teams = list(teams)
+    if len(teams) < 2:
+        raise ValidationError("A league needs at least two teams")
+    if len(teams) % 2:
+        teams.append(None)   # the bye
+    n = len(teams)
+    fixed, rotating = teams[0], teams[1:]
+    rounds = []
+    for r in range(n - 1):
+        lineup = [fixed] + rotating
+        pairs = []
+        for i in range(n // 2):
+            a, b = lineup[i], lineup[n - 1 - i]
+            # The fixed team swaps every round, the rest go by table position;
+            # that gives the minimum n - 2 home/away breaks (runs of two)
+            home_first = r % 2 == 0 if i == 0 else i % 2 == 1
+            if a is not None and b is not None:
+                pairs.append((a, b) if home_first else (b, a))
+        rounds.append(pairs)
+        rotating = rotating[-1:] + rotating[:-1]
+    if double:
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+    return rounds
+
+
+def home_ground(team):
+    return f"{team} Ground"
+
+
+def match_days(start, end, weekdays):
+    days, day = [], start
+    while day <= end:
+        if day.weekday() in weekdays:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+# ---------------- PLACEMENT ----------------
+def _busy(conn, start, end):
+    # Every (date, venue) and (date, team) already taken in the window: one
+    # range scan of idx_matches_date_venue
+    slots, teams = set(), set()
+    for match_date, venue, home, away in conn.execute("""
+        SELECT match_date, venue, home_team, away_team FROM matches
+        WHERE match_date >= ? AND match_date < ?
+    """, (start.isoformat(), (end + timedelta(days=1)).isoformat())):
+        day = match_date[:10]
+        slots.add((day, venue))
+        teams.update((day, team) for team in (home, away) if team)
+    return slots, teams
+
+
+def place(rounds, days, venues, busy_slots=(), busy_teams=()) -> List[Fixture]:
+    """Give every fixture a date and venue.
+
+    Rounds are spread evenly over days; a fixture goes on the first day of
+    its round's stretch where neither team already plays and a venue is
+    free (venues, or the home team's own ground if none are given). Raises
+    ValidationError if any fixture cannot be placed.
+    """
+    if len(days) < len(rounds):
+        raise ValidationError(f"{len(rounds)} rounds need at least {len(rounds)} match days; "
+                              f"the window has {len(days)}")
+    slots, teams = set(busy_slots), set(busy_teams)
+    fixtures, unplaced = [], []
+    starts = [r * len(days) // len(rounds) for r in range(len(rounds))] + [len(days)]
+    for r, pairs in enumerate(rounds):
+        for home, away in pairs:
+            fixture = Fixture(r + 1, home, away)
+            for day in days[starts[r]:starts[r + 1]]:
+                day = day.isoformat()
+                if (day, home) in teams or (day, away) in teams:
+                    continue
+                venue = next((v for v in (venues or [home_ground(home)]) if (day, v) not in slots), None)
+                if venue is not None:
+                    fixture.match_date, fixture.venue = day, venue
+                    slots.add((day, venue))
+                    teams.update(((day, home), (day, away)))
+                    break
+            (fixtures if fixture.match_date else unplaced).append(fixture)
+    if unplaced:
+        first = unplaced[0]
+        raise ValidationError(f"{len(unplaced)} fixtures clash with existing matches or run out of "
+                              f"venues (first: round {first.round}, {first.home} v {first.away}). "
+                              "Widen the window, allow more weekdays or add venues.")
+    return fixtures
+
+
+# ---------------- SCHEDULING ----------------
+def plan(teams, start, end, weekdays=range(7), venues=None, double=False,
+         path=db.DB_NAME) -> List[Fixture]:
+    """The calendar schedule() would insert, without inserting it."""
+    with db.connection(path) as conn:
+        return place(round_robin(teams, double), match_days(start, end, set(weekdays)),
+                     venues, *_busy(conn, start, end))
+
+
+def schedule(teams, start, end, weekdays=range(7), venues=None, double=False,
+             path=db.DB_NAME) -> List[Fixture]:
+    """Plan the calendar and insert every fixture in one transaction.
+
+    The clash check runs inside the write transaction, so a match added
+    meanwhile by another window or process cannot slip in between.
+    """
+    rounds = round_robin(teams, double)
+    days = match_days(start, end, set(weekdays))
+    with db.connection(path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            fixtures = place(rounds, days, venues, *_busy(conn, start, end))
+            # The write lock is held, so the new ids are the ones above this
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM matches").fetchone()[0]
+            conn.executemany("""
+                INSERT INTO matches (opponent, match_date, venue, team_score, opponent_score,
+                                     home_team, away_team)
+                VALUES (?, ?, ?, NULL, NULL, ?, ?)
+            """, [(f.away, f.match_date, f.venue, f.home, f.away) for f in fixtures])
+            ids = [row[0] for row in conn.execute("SELECT id FROM matches WHERE id > ?", (last_id,))]
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    change_bus.publish("matches", change_bus.INSERT, ids, path)
+    return fixtures
+
+
+def summary(fixtures: List[Fixture]) -> Optional[str]:
+    if not fixtures:
+        return None
+    rounds = max(f.round for f in fixtures)
+    return (f"{len(fixtures)} fixtures in {rounds} rounds, "
+            f"{min(f.match_date for f in fixtures)} to {max(f.match_date for f in fixtures)}")
@@ -0,0 +1,94 @@
+import sqlite3
+import tkinter as tk
+from tkinter import messagebox
+import fixtures
+from repository import teams
+from validation import WEEKDAYS, ValidationError, fixture_window
+
+
+# League calendar for the selected teams (see fixtures). Preview only plans
+# it; Schedule plans it again inside the write transaction and inserts it,
+# and the open match page picks the new matches up from change_bus.
+def open_fixture_scheduler(parent):
+    window = tk.Toplevel(parent)
+    window.title("Generate Fixtures")
+    window.geometry("560x560")
+    window.transient(parent)
+
+    # ---------------- Window ----------------
+    form = tk.Frame(window)
+    form.pack(fill="x", padx=15, pady=10)
+
+    tk.Label(form, text="Start (YYYY-MM-DD):").grid(row=0, column=0, padx=5, pady=5, sticky="e")
+    start_entry = tk.Entry(form)
+    start_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+
+    tk.Label(form, text="End (YYYY-MM-DD):").grid(row=1, column=0, padx=5, pady=5, sticky="e")
+    end_entry = tk.Entry(form)
+    end_entry.grid(row=1, column=1, padx=5, pady=5, sticky="w")
+
+    tk.Label(form, text="Match days:").grid(row=2, column=0, padx=5, pady=5, sticky="e")
+    days_frame = tk.Frame(form)
+    days_frame.grid(row=2, column=1, sticky="w")
+    day_vars = []
+    for i, day in enumerate(WEEKDAYS):
+        var = tk.BooleanVar(value=i >= 5)   # weekends by default
+        tk.Checkbutton(days_frame, text=day, variable=var).pack(side="left")
+        day_vars.append(var)
+
+    tk.Label(form, text="Venues (comma-separated):").grid(row=3, column=0, padx=5, pady=5, sticky="e")
+    venues_entry = tk.Entry(form, width=40)
+    venues_entry.grid(row=3, column=1, padx=5, pady=5, sticky="w")
+    tk.Label(form, text="Leave blank for each home team's own ground", fg="#7f8c8d",
+             font=("Arial", 9)).grid(row=4, column=1, sticky="w")
+
+    double_var = tk.BooleanVar(value=True)
+    tk.Checkbutton(form, text="Home and away (double round robin)",
+                   variable=double_var).grid(row=5, column=1, pady=5, sticky="w")
+
+    # ---------------- Teams ----------------
+    tk.Label(window, text="Teams (all selected by default):").pack(anchor="w", padx=15)
+    team_list = tk.Listbox(window, selectmode="multiple", exportselection=False, height=10)
+    for name in teams.names():
+        team_list.insert(tk.END, name)
+    team_list.select_set(0, tk.END)
+    team_list.pack(fill="both", expand=True, padx=15, pady=5)
+
+    summary_label = tk.Label(window, text="", font=("Arial", 10, "bold"), wraplength=520)
+    summary_label.pack(pady=5)
+
+    # ---------------- Actions ----------------
+    def read_form():
+        start, end, weekdays, venues = fixture_window({
+            "start": start_entry.get(), "end": end_entry.get(),
+            "weekdays": [i for i, var in enumerate(day_vars) if var.get()],
+            "venues": venues_entry.get()})
+        selected = [team_list.get(i) for i in team_list.curselection()]
+        return dict(teams=selected, start=start, end=end, weekdays=weekdays,
+                    venues=venues, double=double_var.get())
+
+    def preview():
+        try:
+            planned = fixtures.plan(**read_form())
+        except (ValidationError, sqlite3.Error) as e:
+            summary_label.config(text=str(e), fg="#c0392b")
+            return
+        summary_label.config(text=fixtures.summary(planned) or "No fixtures", fg="#2c3e50")
+
+    def schedule():
+        try:
+            scheduled = fixtures.schedule(**read_form())
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e), parent=window)
+            return
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not schedule: {e}", parent=window)
+            return
+        messagebox.showinfo("Success", f"Scheduled {fixtures.summary(scheduled)}", parent=window)
+        window.destroy()
+
+    buttons = tk.Frame(window)
+    buttons.pack(fill="x", padx=15, pady=10)
+    tk.Button(buttons, text="Preview", bg="#2980b9", fg="white", command=preview).pack(side="left")
+    tk.Button(buttons, text="Schedule", bg="#27ae60", fg="white",
+              command=schedule).pack(side="left", padx=10)
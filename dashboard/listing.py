@@ -0,0 +1,155 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from validation import ValidationError
+
+# Sorting and filtering for the list views, done in SQL. NULLs are folded
+# to '' / 0 so (sort value, key) always compares, and the indexes added in
+# migrations.sort_indexes are on exactly these expressions.
+
+TEXT_END = "\U0010ffff"   # sorts after any character: prefix range upper bound
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+@dataclass(frozen=True)
+class Column:
+    name: str                  # heading text
+    sql: str                   # column or expression in the listing's table
+    numeric: bool = False
+
+    @property
+    def expr(self):
+        if self.numeric:
+            return f"COALESCE({self.sql}, 0)"
+        return f"COALESCE({self.sql}, '') COLLATE NOCASE"
+
+    def value(self, raw):
+        """Python equivalent of expr, for keyset cursors."""
+        if self.numeric:
+            return raw or 0
+        return "" if raw is None else str(raw)
+
+    def sort_key(self, raw):
+        """Orders like expr in SQL (NOCASE folds ASCII letters only), for merging."""
+        value = self.value(raw)
+        return value if self.numeric else value.translate(ASCII_LOWER)
+
+
+@dataclass
+class View:
+    """What the user picked: sort column (heading name), direction and filters."""
+    sort: Optional[str] = None
+    descending: bool = False
+    filters: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def is_default(self):
+        return self.sort is None and not any(v.strip() for v in self.filters.values())
+
+
+NUMERIC_OPS = (">=", "<=", "!=", ">", "<", "=")
+
+
+def _number(text):
+    # SQLite integers are 64-bit; a bigger one cannot even be bound
+    value = int(text)
+    if not -2 ** 63 <= value < 2 ** 63:
+        raise ValueError(text)
+    return value
+
+
+def filter_sql(column, text):
+    """WHERE fragment and params for one filter box.
+
+    Text columns match a case-insensitive prefix ("=abc" for an exact match).
+    Numeric columns take 7, >7, <=30, !=0 or a range 18-25.
+    """
+    text = text.strip()
+    if not column.numeric:
+        if text.startswith("="):
+            return f"{column.expr} = ?", [text[1:].strip()]
+        # A range on the indexed expression, so the index is used (LIKE would not be)
+        return f"{column.expr} >= ? AND {column.expr} < ?", [text, text + TEXT_END]
+    try:
+        for op in NUMERIC_OPS:
+            if text.startswith(op):
+                return f"{column.expr} {op} ?", [_number(text[len(op):])]
+        low, dash, high = text.partition("-")
+        if dash and low.strip():
+            return f"{column.expr} BETWEEN ? AND ?", [_number(low), _number(high)]
+        return f"{column.expr} = ?", [_number(text)]
+    except ValueError:
+        raise ValidationError(f"{column.name} filter must be a number, e.g. 7, >7, <=30 or 18-25")
+
+
+# ---------------- LISTING ----------------
+class Listing:
+    """Builds sorted, filtered, keyset-paged SELECTs over one table."""
+
+    def __init__(self, select, key, columns, where=None):
+        self.select = select              # "SELECT ... FROM table"
+        self.key = key                    # unique, non-null tie breaker (the rowid)
+        self.columns = {c.name: c for c in columns}
+        self.where = where                # fixed condition, e.g. "team_assigned = ?"
+
+    def sortable(self, name):
+        return name in self.columns
+
+    def query(self, view, after=None, limit=None, params=()):
+        """(sql, params) for the rows after the keyset cursor `after`.
+
+        after is what cursor() returned for the last row shown, or None.
+        """
+        clauses, args = ([self.where], list(params)) if self.where else ([], [])
+        for name, text in view.filters.items():
+            if text.strip() and name in self.columns:
+                sql, values = filter_sql(self.columns[name], text)
+                clauses.append(sql)
+                args += values
+
+        column = self.columns.get(view.sort)
+        direction = "DESC" if view.descending else "ASC"
+        compare = "<" if view.descending else ">"
+        if column is None or column.sql == self.key:
+            order = f"{self.key} {direction}"
+            if after is not None:
+                clauses.append(f"{self.key} {compare} ?")
+                args.append(after)
+        else:
+            order = f"{column.expr} {direction}, {self.key} {direction}"
+            if after is not None:
+                # The plain bound is what lets SQLite seek in the index; the
+                # row-value part alone would be checked row by row from the start
+                clauses.append(f"{column.expr} {compare}= ? AND ({column.expr}, {self.key}) {compare} (?, ?)")
+                args += [after[0], after[0], after[1]]
+
+        sql = self.select
+        if clauses:
+            sql += " WHERE " + " AND ".join(f"({c})" for c in clauses)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return sql, args
+
+    def cursor(self, view, key, raw_sort_value=None):
+        """Keyset cursor for a row, given its key and raw value in the sort column."""
+        column = self.columns.get(view.sort)
+        if column is None or column.sql == self.key:
+            return key
+        return (column.value(raw_sort_value), key)
+
+    def is_cursor(self, view, after):
+        """Whether after has the shape cursor() gives for view; for cursors
+        that come back from outside, e.g. the API's after= parameter."""
+        column = self.columns.get(view.sort)
+        if column is None or column.sql == self.key:
+            return _is_int(after)
+        if not isinstance(after, (tuple, list)) or len(after) != 2:
+            return False
+        value, key = after
+        return (_is_int(value) if column.numeric else isinstance(value, str)) and _is_int(key)
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and -2 ** 63 <= value < 2 ** 63
@@ -1,22 +1,8 @@
 import tkinter as tk
-from PIL import Image, ImageTk, ImageDraw
-from soccer import open_dashboard
+from bg_renderer import BackgroundRenderer
 import sqlite3
-
-# DATABASE
-def create_user_table():
-    conn = sqlite3.connect("soccer.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE,
-            password TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
-
+from repository import users
+from query_executor import run_in_background
 
 #  THEME COLORS
 WHITE = "#FFFFFF"
@@ -24,6 +10,12 @@ TEXT_DIM = "#E0E0E0"
 BTN_COLOR = "#2C3E50"
 ACCENT_COLOR = "#3498DB"  # Blue for "Create Account"
 
+# Semi-transparent box behind the login form
+def draw_login_overlay(draw, w, h):
+    box_w, box_h = 450, 550
+    shape = [(w//2 - box_w//2, h//2 - box_h//2), (w//2 + box_w//2, h//2 + box_h//2)]
+    draw.rounded_rectangle(shape, radius=20, fill=(0, 0, 0, 140))
+
 #LOGIN PAGE 
 def open_login_page(root):
     # Only withdraw root if it's currently visible (first launch, not after logout)
@@ -40,30 +32,37 @@ def open_login_page(root):
     canvas = tk.Canvas(login_window, highlightthickness=0)
     canvas.pack(fill="both", expand=True)
 
-    bg_photo = None
-    original_image = None
+    def show_background(photo):
+        canvas.delete("bg")
+        canvas.create_image(0, 0, anchor="nw", image=photo, tags="bg")
+        canvas.tag_lower("bg")
 
-    try:
-        original_image = Image.open("football.png")
-    except:
-        canvas.config(bg="#1a1a1a")
+    # The plain colour shows until the background has been rendered
+    canvas.config(bg="#1a1a1a")
+    background = BackgroundRenderer(canvas, "football.png", show_background,
+                                    overlay=draw_login_overlay, min_size=1)
 
     # ----------------- LOGIC FUNCTIONS -----------------
     def handle_login():
         username = e1.get()
         password = e2.get()
 
-        conn = sqlite3.connect("soccer.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE username=? AND password=?", (username, password))
-        user = cursor.fetchone()
-        conn.close()
+        def check_user():
+            return users.authenticate(username, password)
+
+        def finish_login(user):
+            if user:
+                from soccer import open_dashboard
+                login_window.destroy()
+                open_dashboard(root)
+            else:
+                canvas.itemconfig(status_text, text="Invalid credentials", fill="#FF6B6B")
 
-        if user:
-            login_window.destroy()
-            open_dashboard(root)
-        else:
-            canvas.itemconfig(status_text, text="Invalid credentials", fill="#FF6B6B")
+        def login_failed(error):
+            canvas.itemconfig(status_text, text=f"Login failed: {error}", fill="#FF6B6B")
+
+        canvas.itemconfig(status_text, text="Signing in...", fill=WHITE)
+        run_in_background(login_window, login_window, check_user, finish_login, login_failed)
 
     def open_signup():
         signup_window = tk.Toplevel(login_window)
@@ -147,19 +146,14 @@ def open_login_page(root):
                 msg_label.config(fg="#FF6B6B")
                 return
 
-            conn = sqlite3.connect("soccer.db")
-            cursor = conn.cursor()
             try:
-                cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", (uname, pwd))
-                conn.commit()
+                users.create(uname, pwd)
                 msg_var.set("✅ Account created! You can now log in.")
                 msg_label.config(fg="#48BB78")
                 signup_window.after(1500, signup_window.destroy)
             except sqlite3.IntegrityError:
                 msg_var.set("⚠ Username already taken. Try another.")
                 msg_label.config(fg="#FF6B6B")
-            finally:
-                conn.close()
 
         # Register Button
         reg_btn = tk.Button(card, text="CREATE ACCOUNT", bg="#3498DB", fg="white",
@@ -178,26 +172,10 @@ def open_login_page(root):
 
     # UI RESIZE & POSITIONING
     def resize_content(event):
-        nonlocal bg_photo
         w, h = event.width, event.height
 
-        # Background
-        if original_image:
-            resized = original_image.resize((w, h))
-            overlay = Image.new('RGBA', (w, h), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-            
-            # Semi-transparent box
-            box_w, box_h = 450, 550
-            shape = [(w//2 - box_w//2, h//2 - box_h//2), (w//2 + box_w//2, h//2 + box_h//2)]
-            draw.rounded_rectangle(shape, radius=20, fill=(0, 0, 0, 140))
-            
-            combined = Image.alpha_composite(resized.convert('RGBA'), overlay)
-            bg_photo = ImageTk.PhotoImage(combined)
-            
-            canvas.delete("bg")
-            canvas.create_image(0, 0, anchor="nw", image=bg_photo, tags="bg")
-            canvas.tag_lower("bg")
+        # Background (debounced and cached, see bg_renderer)
+        background.request(w, h)
 
         update_form_positions(w, h)
 
@@ -233,7 +211,4 @@ def open_login_page(root):
         btn_create = tk.Button(login_window, text="CREATE NEW ACCOUNT", bg="#1e272e", fg=ACCENT_COLOR, font=("Arial", 10, "bold"), width=25, relief="flat", command=open_signup)
         canvas.create_window(cx, cy + 230, window=btn_create, tags="form")
 
-    canvas.bind("<Configure>", resize_content)
-
-    # Make sure table exists
-    create_user_table()
\ No newline at end of file
+    canvas.bind("<Configure>", resize_content)
\ No newline at end of file
@@ -1,40 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import sqlite3
+from page_manager import Page
+from query_executor import run_in_background
+from table_stream import TableStream
+from repository import MATCH_LISTING, Match, matches
+from sort_filter import SortFilterBar
+from validation import ValidationError, match_row
+from profiler import ui_timed
 
-def open_match_management(root):
-    # Prevent duplicate windows
-    for widget in root.winfo_children():
-        if isinstance(widget, tk.Toplevel) and widget.title() == "Match Management":
-            widget.lift()
-            return
+# Season box: the hot database, one archived season, or everything merged (see partitions)
+CURRENT, ALL_SEASONS = "Current", "All seasons"
+# More changed matches than this while hidden and the table is reloaded instead
+RELOAD_OVER = 500
 
+def open_match_management(root):
+    # One window per dashboard: page_manager re-shows it instead of opening another
     match_window = tk.Toplevel(root)
     match_window.title("Match Management")
     match_window.state("zoomed")  # Fullscreen
 
-    conn = sqlite3.connect("soccer.db")
-    cursor = conn.cursor()
-
     # ---------------- Back Button ----------------
     def go_back():
-        match_window.destroy()
+        page.hide()
+
+    match_window.protocol("WM_DELETE_WINDOW", go_back)
 
     back_btn = tk.Button(match_window, text="⬅ Back to Dashboard", command=go_back, bg="#95a5a6", fg="white")
     back_btn.pack(side="top", anchor="nw", padx=10, pady=10)
 
-    # ---------------- Database Table ----------------
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS matches (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        opponent TEXT,
-        match_date TEXT,
-        venue TEXT,
-        team_score INTEGER DEFAULT 0,
-        opponent_score INTEGER DEFAULT 0
-    )""")
-    conn.commit()
-
     # ---------------- Schedule Frame ----------------
     schedule_frame = tk.LabelFrame(match_window, text="Schedule / Update Matches", padx=10, pady=10)
     schedule_frame.pack(fill="x", padx=20, pady=10)
@@ -72,66 +65,161 @@ def open_match_management(root):
                            command=lambda: remove_match())
     remove_btn.grid(row=1, column=5, padx=10)
 
+    stats_btn = tk.Button(schedule_frame, text="Player Stats", bg="#8e44ad", fg="white",
+                          command=lambda: open_player_stats())
+    stats_btn.grid(row=1, column=6, padx=10)
+
+    fixtures_btn = tk.Button(schedule_frame, text="Generate Fixtures", bg="#16a085", fg="white",
+                             command=lambda: open_fixtures())
+    fixtures_btn.grid(row=0, column=7, padx=10)
+
+    standings_btn = tk.Button(schedule_frame, text="League Table", bg="#d35400", fg="white",
+                              command=lambda: open_standings())
+    standings_btn.grid(row=1, column=7, padx=10)
+
     # ---------------- Win Rate Label ----------------
     win_rate_label = tk.Label(match_window, text="Season Win Rate: 0%", font=("Arial", 14, "bold"))
     win_rate_label.pack(pady=5)
 
+    season_frame = tk.Frame(match_window)
+    season_frame.pack()
+    tk.Label(season_frame, text="Season:").pack(side="left")
+    season_box = ttk.Combobox(season_frame, state="readonly", width=14)
+    season_box.set(CURRENT)
+    season_box.pack(side="left", padx=5)
+    season_box.bind("<<ComboboxSelected>>", lambda e: load_matches())
+
+    load_status = tk.Label(match_window, text="", font=("Arial", 10), fg="#7f8c8d")
+    load_status.pack()
+
     # ---------------- Table ----------------
-    columns = ("ID", "Opponent", "Date", "Venue", "Team Score", "Opponent Score", "Result")
+    columns = ("ID", "Opponent", "Date", "Venue", "Team Score", "Opponent Score", "Home", "Away", "Result")
     match_table = ttk.Treeview(match_window, columns=columns, show="headings")
     for col in columns:
         match_table.heading(col, text=col)
         match_table.column(col, anchor="center", width=120)
+    match_filters = SortFilterBar(match_window, match_table, MATCH_LISTING, lambda view: load_matches(),
+                                  bg=match_window.cget("bg"))
+    match_filters.frame.pack(fill="x", padx=20)
     match_table.pack(fill="both", expand=True, padx=20, pady=10)
+    stream = TableStream(match_table, lambda text: load_status.config(text=text))
 
     # ---------------- Core Functions ----------------
-    def get_match_result(t1, t2):
-        t1 = t1 or 0
-        t2 = t2 or 0
-        if t1 > t2: return "WIN"
-        if t1 < t2: return "LOSS"
-        return "DRAW"
-
-    def calculate_win_rate():
-        cursor.execute("SELECT team_score, opponent_score FROM matches")
-        rows = cursor.fetchall()
-        total = len(rows)
-        if total == 0:
+    def calculate_win_rate(stats):
+        # stats is the single-row read of the trigger-maintained summary (see
+        # season_stats), done in the background with the rows it goes with
+        if stats["played"] == 0:
             return "0%"
-        
-        wins = 0
-        for t_score, o_score in rows:
-            t_score = t_score or 0   # convert None to 0
-            o_score = o_score or 0
-            if t_score > o_score:
-                wins += 1
-        return f"{wins / total * 100:.2f}%"
+        return (f"{stats['win_rate']:.2f}%   (W {stats['wins']} · D {stats['draws']} · "
+                f"L {stats['losses']} · GF {stats['goals_for']} · GA {stats['goals_against']})")
+
+    def display_values(match):
+        return list(match.as_row()) + [match.result]
+
+    def refresh_seasons():
+        # Newest archived season first
+        season_box["values"] = [CURRENT] + matches.seasons()[::-1] + [ALL_SEASONS]
+        if season_box.get() not in season_box["values"]:
+            season_box.set(CURRENT)
+
+    def archived_selected():
+        return season_box.get() not in (CURRENT, ALL_SEASONS)
 
+    # ---------------- Incremental Table Updates ----------------
+    # Treeview item ids are the matches.id values, so a single row can be
+    # inserted, patched or removed without touching the rest of the table.
+    # shown keeps the Match each item was rendered from, keyed by matches.id.
+    shown = {}
+    # Changed ids whose rows are still being read; a newer batch supersedes a
+    # read still running (see query_executor), so it reads these too
+    pending = set()
+
+    def apply_match_changes(match_ids):
+        if archived_selected():
+            return  # archived seasons never change
+        pending.update(match_ids)
+        match_ids, everything = set(pending), season_box.get() == ALL_SEASONS
+        run_in_background(match_table, apply_match_changes,
+                          lambda: (matches.get_many(match_ids, archived=everything), matches.totals()),
+                          lambda result: show_match_changes(match_ids, *result))
+
+    @ui_timed
+    def show_match_changes(match_ids, changed, stats):
+        pending.difference_update(match_ids)
+        if archived_selected():
+            return  # switched to an archived season while reading
+        current = {m.id: m for m in changed}
+        for match_id in sorted(match_ids):
+            iid, new = str(match_id), current.get(match_id)
+            old = shown.pop(match_id, None)
+            if new is None:
+                if old is not None:
+                    match_table.delete(iid)
+            else:
+                shown[match_id] = new
+                if old is not None:
+                    match_table.item(iid, values=display_values(new))
+                else:
+                    match_table.insert("", tk.END, iid=iid, values=display_values(new))
+        win_rate_label.config(text=f"Season Win Rate: {calculate_win_rate(stats)}")
+
+    @ui_timed
     def load_matches():
-        for row in match_table.get_children():
-            match_table.delete(row)
-        cursor.execute("SELECT * FROM matches")
-        rows = cursor.fetchall()
-        for row in rows:
-            res = get_match_result(row[4], row[5])
-            display_data = list(row) + [res]
-            match_table.insert("", tk.END, values=display_data)
-        win_rate_label.config(text=f"Season Win Rate: {calculate_win_rate()}")
+        # Rows stream in a chunk at a time (see table_stream), the first
+        # screenful straight away; reloading cancels a load still running
+        match_table.delete(*match_table.get_children())
+        shown.clear()
+
+        def add_match(match):
+            if match.id in shown:
+                return  # already put there by show_match_changes while loading
+            shown[match.id] = match
+            match_table.insert("", tk.END, iid=str(match.id), values=display_values(match))
+
+        # Heading sorts and filter boxes go into the query (see listing)
+        view = match_filters.view
+        season = season_box.get()
+        if season == CURRENT:
+            produce = lambda first, size: matches.stream(first, size, view)
+        elif season == ALL_SEASONS:
+            produce = lambda first, size: matches.stream_all(first, size, view)
+        else:
+            produce = lambda first, size: matches.in_season(season).stream(first, size, view)
+
+        # The summary counts archived matches too, so the win rate is always
+        # one row; the row count (fixtures included) is for the progress text
+        def count():
+            if season == CURRENT:
+                return matches.totals(), matches.count()
+            if season == ALL_SEASONS:
+                return matches.totals(), matches.count() + matches.archived_count()
+            return matches.totals(season), matches.in_season(season).count()
+
+        def show_totals(result):
+            stats, rows = result
+            win_rate_label.config(text=f"Season Win Rate: {calculate_win_rate(stats)}")
+            stream.start(produce, add_match, total=rows if view.is_default else None)
+
+        run_in_background(match_table, match_table, count, show_totals,
+                          lambda e: messagebox.showerror("Error", f"Could not load matches: {e}"))
 
     def schedule_match():
-        opponent = opponent_entry.get()
-        date = date_entry.get()
-        venue = venue_entry.get()
-        if not opponent or not date:
-            messagebox.showerror("Error", "Opponent and Date required")
+        try:
+            row = match_row({"opponent": opponent_entry.get(),
+                             "match_date": date_entry.get(),
+                             "venue": venue_entry.get()})
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e))
             return
-        cursor.execute("INSERT INTO matches (opponent, match_date, venue, team_score, opponent_score) VALUES (?, ?, ?, 0, 0)",
-                       (opponent, date, venue))
-        conn.commit()
+        clashes = matches.clashes(row[1], row[2]) if row[2] else []
+        if clashes and not messagebox.askyesno(
+                "Clash", f"{clashes[0].venue} already hosts the match against {clashes[0].opponent} "
+                         f"on {row[1]}. Schedule anyway?"):
+            return
+        matches.schedule(Match(None, *row))  # shown through apply_changes
         opponent_entry.delete(0, tk.END)
         date_entry.delete(0, tk.END)
         venue_entry.delete(0, tk.END)
-        load_matches()
         messagebox.showinfo("Success", "Match Scheduled")
 
     def update_scores():
@@ -145,13 +233,12 @@ def open_match_management(root):
         except ValueError:
             messagebox.showerror("Error", "Scores must be integers")
             return
-        match_id = match_table.item(selected[0])["values"][0]
-        cursor.execute("UPDATE matches SET team_score=?, opponent_score=? WHERE id=?",
-                       (team_score, opponent_score, match_id))
-        conn.commit()
+        match_id = int(selected[0])
+        if not matches.update_scores(match_id, team_score, opponent_score):
+            show_read_only(match_id)
+            return
         team_score_entry.delete(0, tk.END)
         opponent_score_entry.delete(0, tk.END)
-        load_matches()
         messagebox.showinfo("Success", "Scores Updated")
 
     def remove_match():
@@ -159,11 +246,50 @@ def open_match_management(root):
         if not selected:
             messagebox.showerror("Error", "Select a match to remove")
             return
-        match_id = match_table.item(selected[0])["values"][0]
+        match_id = int(selected[0])
         if messagebox.askyesno("Confirm", "Are you sure you want to remove this match?"):
-            cursor.execute("DELETE FROM matches WHERE id=?", (match_id,))
-            conn.commit()
-            load_matches()
+            if not matches.delete(match_id):
+                show_read_only(match_id)
+
+    def show_read_only(match_id):
+        season = matches.archived_season(match_id)
+        if season is not None:
+            messagebox.showerror("Archived", f"Match #{match_id} is in the archived {season} season, "
+                                             "which is read-only")
+        else:
+            messagebox.showerror("Error", f"Match #{match_id} no longer exists")
+
+    def open_player_stats():
+        selected = match_table.selection()
+        if not selected:
+            messagebox.showerror("Error", "Select a match to record player stats for")
+            return
+        from match_stats_page import open_match_stats
+        match = shown[int(selected[0])]
+        open_match_stats(match_window, match, read_only=matches.archived_season(match.id) is not None)
+
+    def open_fixtures():
+        from fixtures_page import open_fixture_scheduler
+        open_fixture_scheduler(match_window)
+
+    def open_standings():
+        from standings_page import open_league_table
+        open_league_table(match_window)
+
+    # Matches added, edited or removed by any window (see
+    # page_manager.ChangeFollower), or elsewhere while the page was hidden
+    def apply_changes(changes):
+        if changes is not None and not changes["matches"]:
+            return
+        refresh_seasons()
+        if (changes is None or len(changes["matches"]) > RELOAD_OVER
+                or not match_filters.view.is_default):
+            load_matches()  # an edit can move a row in the sort order or out of the filter
+            return
+        apply_match_changes({int(match_id) for match_id in changes["matches"]})
 
     # Initial load
-    load_matches()
\ No newline at end of file
+    refresh_seasons()
+    load_matches()
+    page = Page(match_window, apply_changes)
+    return page
\ No newline at end of file
@@ -0,0 +1,94 @@
+import sqlite3
+import tkinter as tk
+from tkinter import messagebox, ttk
+from repository import PlayerStat, player_match_stats, players
+from validation import STAT_COLUMNS, ValidationError, stat_row
+
+FIELDS = [("Jersey #", "jersey"), ("Minutes", "minutes"), ("Goals", "goals"),
+          ("Assists", "assists"), ("Yellow Cards", "yellow_cards"), ("Red Cards", "red_cards")]
+
+
+# Per-player lines for one match; the career / season totals shown on the
+# player page are updated by triggers as lines are saved or removed.
+# Matches in an archived season are shown read_only (see partitions).
+def open_match_stats(parent, match, read_only=False):
+    window = tk.Toplevel(parent)
+    window.title(f"Player Stats - {match.opponent} ({match.match_date})")
+    window.geometry("760x520")
+    window.transient(parent)
+
+    tk.Label(window, text=f"vs {match.opponent}   {match.match_date}   "
+                          f"{match.team_score} - {match.opponent_score}",
+             font=("Arial", 14, "bold")).pack(pady=10)
+
+    # ---------------- Entry Form ----------------
+    form = tk.Frame(window)
+    form.pack(fill="x", padx=15)
+    entries = {}
+    for i, (label, key) in enumerate(FIELDS):
+        tk.Label(form, text=label).grid(row=0, column=i, padx=4, sticky="w")
+        entry = tk.Entry(form, width=10)
+        entry.grid(row=1, column=i, padx=4, pady=(0, 8))
+        entries[key] = entry
+
+    # ---------------- Table ----------------
+    columns = ("Jersey", "Name", "Minutes", "Goals", "Assists", "Yellow", "Red")
+    table = ttk.Treeview(window, columns=columns, show="headings", height=12)
+    for col in columns:
+        table.heading(col, text=col)
+        table.column(col, width=150 if col == "Name" else 80, anchor="center")
+
+    def load_lines():
+        table.delete(*table.get_children())
+        for stat, name in player_match_stats.for_match(match.id):
+            table.insert("", tk.END, iid=str(stat.jersey),
+                         values=(stat.jersey, name) + stat.as_row()[2:])
+
+    def on_select(event):
+        selected = table.selection()
+        if not selected:
+            return
+        values = table.item(selected[0], "values")
+        for (_, key), value in zip(FIELDS, (values[0],) + tuple(values[2:])):
+            entries[key].delete(0, tk.END)
+            entries[key].insert(0, value)
+
+    def save_line():
+        data = {key: entry.get() for key, entry in entries.items()}
+        data["match_id"] = match.id
+        try:
+            row = stat_row(data)
+        except ValidationError as e:
+            messagebox.showwarning("Input Error", str(e), parent=window)
+            return
+        if players.get(row[STAT_COLUMNS.index("jersey")]) is None:
+            messagebox.showerror("Error", f"No player with Jersey #{data['jersey']}", parent=window)
+            return
+        try:
+            player_match_stats.record(PlayerStat(*row))
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not save: {e}", parent=window)
+            return
+        load_lines()
+
+    def remove_line():
+        selected = table.selection()
+        if not selected:
+            messagebox.showwarning("Selection", "Select a player line to remove", parent=window)
+            return
+        player_match_stats.delete(match.id, int(selected[0]))
+        load_lines()
+
+    buttons = tk.Frame(window)
+    buttons.pack(fill="x", padx=15)
+    state = "disabled" if read_only else "normal"
+    tk.Button(buttons, text="Save Line", bg="#27ae60", fg="white", command=save_line,
+              state=state).pack(side="left")
+    tk.Button(buttons, text="Remove Line", bg="#c0392b", fg="white",
+              command=remove_line, state=state).pack(side="left", padx=10)
+    if read_only:
+        tk.Label(buttons, text="Archived season - read-only", fg="#7f8c8d").pack(side="left")
+
+    table.pack(fill="both", expand=True, padx=15, pady=10)
+    table.bind("<<TreeviewSelect>>", on_select)
+    load_lines()
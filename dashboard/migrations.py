@@ -0,0 +1,147 @@
+import change_log
+import db
+import partitions
+import player_search
+import player_stats
+import season_stats
+import standings
+
+# Schema version is stored in the database header (PRAGMA user_version).
+# Each migration runs once, in its own transaction, in order. Add new ones
+# at the end of MIGRATIONS; never edit one that has already shipped.
+
+
+# ---------------- MIGRATIONS ----------------
+def base_tables(conn):
+    # The tables the pages used to create on open. Databases made by older
+    # versions already have them, so everything here must be idempotent.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS players (
+            jersey INTEGER PRIMARY KEY,
+            name TEXT,
+            age INTEGER,
+            position TEXT,
+            fitness TEXT,
+            goals INTEGER,
+            injury TEXT,
+            suspension TEXT
+        )
+    """)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(players)")]
+    if "team_assigned" not in columns:
+        conn.execute("ALTER TABLE players ADD COLUMN team_assigned TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS teams (
+            team_name TEXT PRIMARY KEY,
+            coach TEXT,
+            staff_info TEXT,
+            formation TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE,
+            password TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            opponent TEXT,
+            match_date TEXT,
+            venue TEXT,
+            team_score INTEGER DEFAULT 0,
+            opponent_score INTEGER DEFAULT 0
+        )
+    """)
+
+
+def lookup_indexes(conn):
+    # load_squad filters on team_assigned; match lists filter/sort by date and opponent
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_team ON players(team_assigned)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(match_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_opponent ON matches(opponent)")
+
+
+def sort_indexes(conn):
+    # On the same expressions listing.Column sorts and filters by, so sorting
+    # the player list by goals or age, or the matches by date, is an index walk
+    for name, table, expr in (
+        ("players_name", "players", "COALESCE(name, '') COLLATE NOCASE"),
+        ("players_age", "players", "COALESCE(age, 0)"),
+        ("players_position", "players", "COALESCE(position, '') COLLATE NOCASE"),
+        ("players_goals", "players", "COALESCE(goals, 0)"),
+        ("matches_opponent", "matches", "COALESCE(opponent, '') COLLATE NOCASE"),
+        ("matches_date", "matches", "COALESCE(match_date, '') COLLATE NOCASE"),
+        ("matches_venue", "matches", "COALESCE(venue, '') COLLATE NOCASE"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_sort_{name} ON {table}({expr})")
+
+
+def fixture_columns(conn):
+    # League fixtures between two of our teams (see fixtures): home_team plays
+    # away_team, opponent repeats away_team and the scores are home / away
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(matches)")]
+    for column in ("home_team", "away_team"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE matches ADD COLUMN {column} TEXT REFERENCES teams(team_name)")
+    # Clash checks look up (date, venue); the date prefix replaces idx_matches_date
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_matches_date_venue ON matches(match_date, venue)")
+    conn.execute("DROP INDEX IF EXISTS idx_matches_date")
+    season_stats.count_played_only(conn)
+
+
+MIGRATIONS = [
+    (1, "base tables", base_tables),
+    (2, "lookup indexes", lookup_indexes),
+    (3, "player full-text search", player_search.create_search_index),
+    (4, "match summary statistics", season_stats.create_stats_tables),
+    (5, "change log for cached pages", change_log.create_change_log),
+    (6, "per-match player statistics", player_stats.create_player_stats),
+    (7, "sort indexes for the list views", sort_indexes),
+    (8, "per-player cleanup in the stat line triggers", player_stats.recreate_line_triggers),
+    (9, "catalog of archived seasons", partitions.create_catalog),
+    (10, "league fixtures between our teams", fixture_columns),
+    (11, "cached league standings", standings.create_standings),
+    (12, "stat lines must name an existing match and player", player_stats.check_references),
+    (13, "league matches left out of the match summary", season_stats.leave_out_league_matches),
+    (14, "archived match ids cannot be inserted again", partitions.keep_archived_ids_out),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------------- RUNNER ----------------
+def schema_version(path=db.DB_NAME):
+    return db.query_one("PRAGMA user_version", path=path)[0]
+
+
+def migrate(path=db.DB_NAME, verbose=False):
+    """Bring the database at path up to LATEST_VERSION; returns the versions applied."""
+    applied = []
+    with db.connection(path) as conn:
+        for version, description, apply in MIGRATIONS:
+            # IMMEDIATE takes the write lock up front, so two copies of the
+            # app starting together cannot both run the same migration
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version <= current:
+                    conn.rollback()
+                    continue
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            applied.append(version)
+            if verbose:
+                print(f"Applied migration {version}: {description}")
+    return applied
+
+
+if __name__ == "__main__":
+    migrate(verbose=True)
+    print(f"Schema version {schema_version()}")
@@ -0,0 +1,128 @@
+import threading
+
+import change_bus
+import change_log
+
+POLL_MS = 200   # how soon a write made on a worker thread reaches the window
+
+
+# ---------------- LIVE CHANGES ----------------
+class ChangeFollower:
+    """Feeds change_bus notifications to apply_changes(changes) on the Tk thread.
+
+    changes has the shape change_log.changes_since gives (table -> set of
+    changed keys, plus "player_match_stats" -> (match_id, jersey) keys), so
+    pages use one handler for both. Everything published before Tk next
+    goes idle arrives as one call, so a batch write is one patch. Tk may
+    only be touched from its own thread, so writes on worker threads are
+    picked up by a poll every POLL_MS.
+    Unsubscribes itself when the window is destroyed.
+    """
+
+    def __init__(self, window, apply_changes, entities=None):
+        self.window = window
+        self.apply_changes = apply_changes
+        self.paused = False
+        self._pending = {}
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self._unsubscribe = change_bus.subscribe(self._published, entities)
+        self._poll_id = window.after(POLL_MS, self._poll)
+        window.bind("<Destroy>", self._destroyed, add="+")
+
+    def _published(self, changes):
+        if self.paused:
+            return
+        with self._lock:
+            for change in changes:
+                self._pending.setdefault(change.entity, set()).add(change.key)
+            if self._scheduled or threading.current_thread() is not threading.main_thread():
+                return  # a write on a worker thread waits for _poll
+            self._scheduled = True
+        self.window.after_idle(self.flush)
+
+    def _poll(self):
+        with self._lock:
+            waiting = bool(self._pending) and not self._scheduled
+        if waiting:
+            self.flush()
+        self._poll_id = self.window.after(POLL_MS, self._poll)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending, self._scheduled = self._pending, {}, False
+        if not pending or not self.window.winfo_exists():
+            return
+        changes = {table: set() for table in change_log.TRACKED}
+        changes.update(pending)
+        self.apply_changes(changes)
+
+    def discard(self):
+        with self._lock:
+            self._pending = {}
+
+    def _destroyed(self, event):
+        if event.widget is self.window:
+            self._unsubscribe()
+            self.window.after_cancel(self._poll_id)
+
+
+# ---------------- CACHED PAGES ----------------
+class Page:
+    """A page window that is hidden on Back and shown again on the next visit.
+
+    The page's Back button and close box should call hide() instead of
+    destroying the window.
+
+    apply_changes(changes) is called before the window reappears, with
+    changes from change_log.changes_since (table -> changed keys), or None
+    when the page should reload everything. While the page is showing it
+    is also called with every write made in this process (see
+    ChangeFollower), so it stays current without reloading.
+    """
+
+    def __init__(self, window, apply_changes=None):
+        self.window = window
+        self.apply_changes = apply_changes
+        self.seen = change_log.latest()
+        self.follower = ChangeFollower(window, apply_changes) if apply_changes else None
+
+    def alive(self):
+        return bool(self.window.winfo_exists())
+
+    def hide(self):
+        # Whatever the page did itself while open is already on screen
+        if self.follower:
+            self.follower.flush()
+            self.follower.paused = True   # show() catches up from change_log
+        self.seen = change_log.latest()
+        self.window.withdraw()
+
+    def show(self):
+        if self.follower:
+            self.follower.discard()
+            self.follower.paused = False
+        self.seen, changes = change_log.changes_since(self.seen)
+        if self.apply_changes and changes != {}:
+            self.apply_changes(changes)
+        self.window.deiconify()
+        self.window.state("zoomed")
+        self.window.lift()
+        self.window.focus_force()
+
+
+class PageManager:
+    """Builds each page once per dashboard and reuses it afterwards."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.pages = {}
+
+    def open(self, name, build):
+        # build(parent) creates the window and returns its Page
+        page = self.pages.get(name)
+        if page is not None and page.alive():
+            page.show()
+        else:
+            page = self.pages[name] = build(self.parent)
+        return page
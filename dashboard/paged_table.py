@@ -0,0 +1,121 @@
+import tkinter as tk
+from bisect import bisect_left
+from tkinter import messagebox
+from query_executor import run_in_background
+from profiler import ui_timed
+
+PAGE_SIZE = 200
+# Fetch the next page once the view is scrolled past this fraction
+LOAD_MORE_AT = 0.9
+
+
+# ---------------- PAGED TREEVIEW ----------------
+class PagedTreeview:
+    """Fills a Treeview one keyset page at a time as the user scrolls.
+
+    fetch_page(after_key, limit) must return rows ordered by the key column,
+    starting strictly after after_key (None means "from the beginning").
+    With by_offset=True after_key is instead the number of rows already shown,
+    for listings such as ranked search results that have no stable key.
+    Listings sorted by another column pass cursor_of(row), which gives the
+    after_key for the next page (e.g. (sort value, key), see listing).
+    It runs on a worker thread; rows are inserted back on the Tk main loop.
+    A failed fetch is shown to the user and retried on the next scroll.
+    Each row's item id is str(key).
+    """
+
+    def __init__(self, tree, scrollbar, fetch_page, key_index=0, page_size=PAGE_SIZE):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.key_index = key_index
+        self.page_size = page_size
+        self.last_key = None
+        self.exhausted = False
+        self.row_count = 0
+        self.by_offset = False
+        self.cursor_of = None
+        self.keys = []          # keys of the rendered rows, in display order
+        self._pending = False
+
+        tree.configure(yscrollcommand=self._on_yscroll)
+
+    def reset(self, fetch_page=None, by_offset=False, cursor_of=None):
+        """Drop every rendered row and load the first page again."""
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        self.by_offset = by_offset
+        self.cursor_of = cursor_of
+        self.tree.delete(*self.tree.get_children())
+        self.last_key = None
+        self.exhausted = False
+        self.row_count = 0
+        self.keys = []
+        self.load_more()
+
+    def load_more(self):
+        self._pending = True
+        after_key = self.row_count if self.by_offset else self.last_key
+        fetch_page, limit = self.fetch_page, self.page_size
+        # Keyed on the pager, so a reset (refresh / new search) drops any
+        # page still in flight for the previous listing.
+        run_in_background(self.tree, self, lambda: fetch_page(after_key, limit), self._show_page,
+                          self._page_failed)
+
+    def _page_failed(self, error):
+        self._pending = False
+        messagebox.showerror("Error", f"Could not load more rows: {error}",
+                             parent=self.tree.winfo_toplevel())
+
+    @ui_timed
+    def _show_page(self, rows):
+        self._pending = False
+        for row in rows:
+            key = row[self.key_index]
+            if self.tree.exists(str(key)):
+                continue  # shifted into this page by a concurrent insert
+            tag = "evenrow" if self.row_count % 2 == 0 else "oddrow"
+            self.tree.insert("", tk.END, iid=str(key), values=row, tags=(tag,))
+            self.keys.append(key)
+            self.row_count += 1
+        if rows:
+            last = rows[-1]
+            self.last_key = self.cursor_of(last) if self.cursor_of else last[self.key_index]
+        if len(rows) < self.page_size:
+            self.exhausted = True
+
+    @ui_timed
+    def apply_changes(self, keys, fetch_rows):
+        """Update, insert or remove just the rows for keys (key-ordered listings only).
+
+        fetch_rows(keys) returns the current rows for the keys that still
+        exist. New keys are only inserted inside the range already loaded;
+        later ones arrive with their page as usual.
+        """
+        current = {row[self.key_index]: row for row in fetch_rows(keys)}
+        shifted = len(self.keys)   # rows from here on moved, so their stripe changes
+        for key in sorted(keys):
+            iid, row = str(key), current.get(key)
+            if row is None:
+                if self.tree.exists(iid):
+                    index = bisect_left(self.keys, key)
+                    self.tree.delete(iid)
+                    del self.keys[index]
+                    shifted = min(shifted, index)
+            elif self.tree.exists(iid):
+                self.tree.item(iid, values=row)
+            elif self.exhausted or (self.last_key is not None and key < self.last_key):
+                index = bisect_left(self.keys, key)
+                self.tree.insert("", index, iid=iid, values=row)
+                self.keys.insert(index, key)
+                shifted = min(shifted, index)
+        self.row_count = len(self.keys)
+        if shifted < self.row_count:
+            children = self.tree.get_children()
+            for i in range(shifted, len(children)):
+                self.tree.item(children[i], tags=("evenrow" if i % 2 == 0 else "oddrow",))
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self.exhausted and not self._pending and float(last) >= LOAD_MORE_AT:
+            self.load_more()
@@ -0,0 +1,279 @@
+import argparse
+import os
+import re
+import sqlite3
+from datetime import date
+
+import change_bus
+import db
+import player_stats
+import season_stats
+
+# Matches from past seasons move out of the hot database into one file per
+# season under ARCHIVE_DIR, next to it. Archives are only ever opened
+# read-only, with the hot database ATTACHed (read-only) as "hot", so the
+# repository queries run against them unchanged: matches and
+# player_match_stats come from the archive, players from the hot file.
+# match_summary and player_season_totals keep counting archived matches, so
+# the win rate and career totals never need to open an archive at all.
+#
+# Archiving is only ever asked for, never automatic (run from the dashboard
+# folder, like the app):
+#     python partitions.py              archive all but the last HOT_SEASONS
+#     python partitions.py --season 2019
+#     python partitions.py --list
+
+ARCHIVE_DIR = os.environ.get("SOCCER_ARCHIVE_DIR", "seasons")
+HOT_SEASONS = 2    # this season and the one before stay in the hot database
+
+MATCH_FIELDS = "id, opponent, match_date, venue, team_score, opponent_score, home_team, away_team"
+STAT_FIELDS = ", ".join(("match_id", "jersey") + player_stats.STAT_FIELDS)
+
+CATALOG_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS season_archives (
+        season TEXT PRIMARY KEY,
+        file TEXT NOT NULL,
+        matches INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    # Which season an archived match id went to, so get(id) is one lookup
+    """
+    CREATE TABLE IF NOT EXISTS archived_matches (
+        id INTEGER PRIMARY KEY,
+        season TEXT NOT NULL
+    )
+    """,
+)
+
+ARCHIVE_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS matches (
+        id INTEGER PRIMARY KEY,
+        opponent TEXT,
+        match_date TEXT,
+        venue TEXT,
+        team_score INTEGER DEFAULT 0,
+        opponent_score INTEGER DEFAULT 0,
+        home_team TEXT,
+        away_team TEXT
+    )
+    """,
+    player_stats.STATS_SQL,
+) + player_stats.INDEXES_SQL
+
+# An archived match must not come back as a second, hot copy (e.g. from an
+# old export): the totals would count it twice. Ids are AUTOINCREMENT, so
+# only an insert that names its id can hit one.
+ARCHIVED_ERROR = "That match is in an archived season"
+ARCHIVED_ID_TRIGGER_SQL = f"""
+    CREATE TRIGGER IF NOT EXISTS archived_matches_bi BEFORE INSERT ON matches
+    WHEN new.id IS NOT NULL BEGIN
+        SELECT RAISE(ABORT, '{ARCHIVED_ERROR}')
+        WHERE EXISTS (SELECT 1 FROM archived_matches WHERE id = new.id);
+    END
+"""
+
+
+# ---------------- SETUP ----------------
+def create_catalog(conn):
+    # Run as a schema migration (see migrations.py)
+    for sql in CATALOG_SQL:
+        conn.execute(sql)
+
+
+def keep_archived_ids_out(conn):
+    # Run as a schema migration
+    conn.execute(ARCHIVED_ID_TRIGGER_SQL)
+
+
+def archive_file(season, path=db.DB_NAME):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), ARCHIVE_DIR, f"{stem}-{season}.db")
+
+
+def season_path(season, path=db.DB_NAME):
+    """Read-only path of an archived season, for db / the repositories."""
+    archive = db.read_only(archive_file(season, path))
+    hot = db.read_only(path)
+    db.on_open(archive, lambda conn: conn.execute("ATTACH DATABASE ? AS hot", (hot,)))
+    return archive
+
+
+# ---------------- CATALOG ----------------
+def archived_seasons(path=db.DB_NAME):
+    """[(season, match count)] of the archived seasons, oldest first."""
+    return db.query("SELECT season, matches FROM season_archives ORDER BY season", path=path)
+
+
+def archived_count(path=db.DB_NAME):
+    return db.query_one("SELECT COALESCE(SUM(matches), 0) FROM season_archives", path=path)[0]
+
+
+def season_of(match_id, path=db.DB_NAME):
+    """The archived season holding match_id, or None if it is not archived."""
+    row = db.query_one("SELECT season FROM archived_matches WHERE id = ?", (match_id,), path=path)
+    return row[0] if row else None
+
+
+def archived_on(conn):
+    """The archived seasons of the database conn is open on; none before the
+    catalog exists (migrations older than it)."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'season_archives'").fetchone():
+        return []
+    return [row[0] for row in conn.execute("SELECT season FROM season_archives ORDER BY season")]
+
+
+def load_archived(conn, season, table):
+    """Copy season's archived matches or player_match_stats rows into
+    temp.archived on conn (a hot connection) and return that table's name.
+
+    For counting archived seasons back into match_summary and
+    player_season_totals after they are rebuilt from the hot rows.
+    """
+    path = conn.execute("PRAGMA database_list").fetchone()[2]   # main comes first
+    fields = {"matches": MATCH_FIELDS, "player_match_stats": STAT_FIELDS}[table]
+    conn.execute("DROP TABLE IF EXISTS temp.archived")
+    conn.execute(f"CREATE TEMP TABLE archived AS SELECT {fields} FROM main.{table} WHERE false")
+    rows = db.query(f"SELECT {fields} FROM main.{table}", path=season_path(season, path))
+    conn.executemany(f"INSERT INTO temp.archived VALUES ({', '.join('?' * (fields.count(',') + 1))})",
+                     rows)
+    return "temp.archived"
+
+
+def past_seasons(keep=HOT_SEASONS, path=db.DB_NAME):
+    """Seasons still in the hot database that are older than the newest keep."""
+    first_hot = str(date.today().year - keep + 1)
+    rows = db.query("""
+        SELECT DISTINCT substr(match_date, 1, 4) AS season FROM matches
+        WHERE season GLOB '[0-9][0-9][0-9][0-9]' AND season < ? ORDER BY season
+    """, (first_hot,), path=path)
+    return [row[0] for row in rows]
+
+
+# ---------------- ROLL OVER ----------------
+def _create_archive(file):
+    os.makedirs(os.path.dirname(file) or ".", exist_ok=True)
+    conn = sqlite3.connect(file)
+    try:
+        for sql in ARCHIVE_SQL:
+            conn.execute(sql)
+        # Archives made before the fixture columns existed
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(matches)")]
+        for column in ("home_team", "away_team"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE matches ADD COLUMN {column} TEXT")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def roll_over(season, path=db.DB_NAME):
+    """Move every match of season (and its player stat lines) into the season's
+    archive file; returns how many matches moved.
+
+    SQLite cannot commit a WAL database and an attached file atomically, so
+    the move is two transactions: the rows are copied into the archive and
+    committed, checked there, and only then deleted from the hot database.
+    The hot write lock is held throughout, so nothing changes in between. A
+    move cut short just leaves copies in the archive; running it again skips
+    them and finishes, and also appends matches added to the season since.
+    """
+    season = str(season)
+    if not re.fullmatch(r"\d{4}", season):
+        raise ValueError(f"Not a season: {season!r}")
+    file = archive_file(season, path)
+    _create_archive(file)
+    with db.connection(path) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS moving (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.moving")
+            # GLOB on a prefix can use idx_matches_date_venue
+            conn.execute("INSERT INTO temp.moving SELECT id FROM main.matches WHERE match_date GLOB ?",
+                         (season + "*",))
+            moved = [row[0] for row in conn.execute("SELECT id FROM temp.moving")]
+            if moved:
+                archived = _copy(file, season, path)
+                _forget(conn, season, os.path.basename(file), archived)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    # Gone from the hot database; still found by id through the catalog
+    change_bus.publish("matches", change_bus.DELETE, moved, path)
+    return len(moved)
+
+
+def _copy(file, season, path):
+    # Step one, a transaction on the archive file only. Returns how many
+    # matches the archive now holds.
+    conn = sqlite3.connect(file, timeout=5)
+    try:
+        conn.execute("ATTACH DATABASE ? AS hot", (path,))
+        moving = "(SELECT id FROM hot.matches WHERE match_date GLOB :season)"
+        args = {"season": season + "*"}
+        conn.execute(f"""INSERT OR IGNORE INTO main.matches ({MATCH_FIELDS})
+                         SELECT {MATCH_FIELDS} FROM hot.matches WHERE id IN {moving}""", args)
+        conn.execute(f"""INSERT OR IGNORE INTO main.player_match_stats
+                         SELECT * FROM hot.player_match_stats WHERE match_id IN {moving}""", args)
+        conn.commit()
+        # Every hot row must be in the archive before the hot copy goes
+        hot, copied = conn.execute(f"""
+            SELECT (SELECT COUNT(*) FROM hot.matches WHERE id IN {moving}),
+                   (SELECT COUNT(*) FROM main.matches WHERE id IN {moving})
+        """, args).fetchone()
+        hot_lines, copied_lines = conn.execute(f"""
+            SELECT COUNT(*), COUNT(a.match_id) FROM hot.player_match_stats h
+            LEFT JOIN main.player_match_stats a USING (match_id, jersey)
+            WHERE h.match_id IN {moving}
+        """, args).fetchone()
+        if (hot, hot_lines) != (copied, copied_lines):
+            raise sqlite3.IntegrityError(
+                f"Archive of {season} is missing rows ({copied} of {hot} matches, "
+                f"{copied_lines} of {hot_lines} stat lines); nothing was removed")
+        return conn.execute("SELECT COUNT(*) FROM main.matches").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _forget(conn, season, file, archived):
+    # Step two, inside the hot write transaction: the matches in temp.moving
+    # leave the hot database but stay in match_summary / player_season_totals.
+    # The delete triggers take them (and their stat lines) out of the totals,
+    # so they are counted back in first, from the same rows.
+    conn.execute("INSERT OR REPLACE INTO main.archived_matches SELECT id, ? FROM temp.moving",
+                 (season,))
+    season_stats.add_matches(conn, "(SELECT * FROM main.matches WHERE id IN temp.moving)")
+    player_stats.add_lines(
+        conn, "(SELECT * FROM main.player_match_stats WHERE match_id IN temp.moving)", season)
+    conn.execute("DELETE FROM main.matches WHERE id IN temp.moving")
+    conn.execute("""
+        INSERT INTO main.season_archives (season, file, matches) VALUES (?, ?, ?)
+        ON CONFLICT (season) DO UPDATE SET matches = excluded.matches
+    """, (season, file, archived))
+    conn.execute("DELETE FROM temp.moving")
+
+
+def roll_over_past(keep=HOT_SEASONS, path=db.DB_NAME):
+    """Archive every season older than the newest keep; {season: matches moved}."""
+    return {season: roll_over(season, path) for season in past_seasons(keep, path)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move past seasons into their own database files")
+    parser.add_argument("--db", default=db.DB_NAME)
+    parser.add_argument("--season", help="archive just this season")
+    parser.add_argument("--keep", type=int, default=HOT_SEASONS,
+                        help="seasons to keep in the hot database (default %(default)s)")
+    parser.add_argument("--list", action="store_true", help="list the archived seasons")
+    args = parser.parse_args()
+    import migrations
+    migrations.migrate(args.db)
+    if not args.list:
+        moved = ({args.season: roll_over(args.season, args.db)} if args.season
+                 else roll_over_past(args.keep, args.db))
+        for season, count in moved.items():
+            print(f"Archived {count} matches from {season}")
+    for season, count in archived_seasons(args.db):
+        print(f"{season}: {count} matches in {archive_file(season, args.db)}")
@@ -1,33 +1,19 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 import sqlite3
+from page_manager import Page
+from paged_table import PagedTreeview
+from repository import PLAYER_LISTING, Player, player_match_stats, players
+from sort_filter import SortFilterBar
+from listing import View
+from validation import PLAYER_COLUMNS, ValidationError, player_row
+from profiler import ui_timed
 
-DB_NAME = "soccer.db"
-
-# ---------------- DATABASE SETUP ----------------
-def create_player_table():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    # Fixed: Primary Key should usually be a single unique value like Jersey
-    # unless you specifically want a composite key.
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS players (
-            jersey INTEGER PRIMARY KEY,
-            name TEXT,
-            age INTEGER,
-            position TEXT,
-            fitness TEXT,
-            goals INTEGER,
-            injury TEXT,
-            suspension TEXT
-        )
-    """)
-    conn.commit()
-    conn.close()
+# Search-as-you-type waits for a pause in typing this long before querying
+LIVE_SEARCH_DELAY_MS = 150
 
 #  PLAYER PAGE
 def open_player_page(root):
-    create_player_table()
 
     # if dashboard exist
     window = tk.Toplevel(root)
@@ -35,7 +21,7 @@ def open_player_page(root):
     window.state("zoomed")  # Fullscreen
     window.config(bg="#f0f4f7")
     def go_back():
-        window.destroy()
+        page.hide()  # kept for the next visit, see page_manager
 
     back_btn = tk.Button(window, text="⬅ Back", command=go_back, bg="#95a5a6")
     back_btn.pack(side="top", anchor="nw", padx=10, pady=5)
@@ -62,17 +48,33 @@ def open_player_page(root):
         entries[label] = ent
 
     # DATABASE FUNCTIONS
+    # Keyset pagination: each page starts after the last row shown (its jersey,
+    # or (sort value, jersey) when sorted by a heading), so page N costs the
+    # same as page 1 no matter how big the table gets. Sorting and the filter
+    # boxes go into the query's ORDER BY / WHERE (see listing).
+    def listing_page(view):
+        def fetch_players_page(after, limit):
+            return table_rows(players.listing(view, after, limit))
+        return fetch_players_page
+
+    def cursor_of(view):
+        sort_index = columns.index(view.sort) if view.sort else 0
+        return lambda row: PLAYER_LISTING.cursor(view, row[0], row[sort_index])
+
+    # Apps / match goals / assists come from the trigger-maintained career
+    # totals (see player_stats): one primary-key lookup per page of players
+    def table_rows(page):
+        totals = player_match_stats.totals(p.jersey for p in page)
+        rows = []
+        for p in page:
+            t = totals.get(p.jersey, {})
+            rows.append(p.as_row()[:8] + (t.get("appearances", 0), t.get("goals", 0), t.get("assists", 0)))
+        return rows
+
+    @ui_timed
     def refresh_table():
-        for row in player_table.get_children():
-            player_table.delete(row)
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM players")
-        rows = cursor.fetchall()
-        for idx, player in enumerate(rows):
-            tag = "evenrow" if idx % 2 == 0 else "oddrow"
-            player_table.insert("", tk.END, values=player, tags=(tag,))
-        conn.close()
+        view = filters.view
+        pager.reset(listing_page(view), cursor_of=cursor_of(view))
 
     def clear_entries():
         for entry in entries.values():
@@ -80,39 +82,21 @@ def open_player_page(root):
 
 
     def add_player():
-        data = {k: v.get().strip() for k, v in entries.items()}
-        
-        if not data["Jersey Number"] or not data["Name"]:
-            messagebox.showerror("Error", "Jersey and Name are required!", parent=window)
+        # Form labels are in the same order as the players columns
+        data = {col: entries[label].get() for label, col in zip(labels, PLAYER_COLUMNS)}
+
+        try:
+            row = player_row(data)
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e), parent=window)
             return
 
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO players 
-                (jersey, name, age, position, fitness, goals, injury, suspension)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                int(data["Jersey Number"]), 
-                data["Name"], 
-                int(data["Age"] or 0),
-                data["Position"], 
-                data["Fitness"], 
-                int(data["Goals"] or 0),
-                data["Injury"], 
-                data["Suspension"]
-            ))
-            conn.commit()
-            conn.close()
+            players.add(Player(*row))  # the new row arrives through apply_changes
             messagebox.showinfo("Success", "Player Added!", parent=window)
             clear_entries()
-            refresh_table()
         except sqlite3.IntegrityError:
             messagebox.showwarning("Duplicate", "Jersey number already exists!", parent=window)
-        except ValueError:
-            messagebox.showerror("Error", "Jersey, Age, and Goals must be numbers!", parent=window)
-        conn.close()
 
 
     def delete_player():
@@ -130,88 +114,68 @@ def open_player_page(root):
         
         if confirm:
             try:
-                conn = sqlite3.connect(DB_NAME)
-                cursor = conn.cursor()
-                
-                # Execute the delete
-                cursor.execute("DELETE FROM players WHERE jersey=?", (jersey_val,))
-
-                conn.commit() 
-                
-                # Check if any row was actually deleted in the file
-                if cursor.rowcount > 0:
-                    conn.close()
-                    player_table.delete(selected) # Remove from UI
+                # Check if any row was actually deleted in the file; the row
+                # leaves this table and any open squad view via change_bus
+                if players.delete(int(jersey_val)):
                     messagebox.showinfo("Success", "Player deleted forever!", parent=window)
                 else:
-                    conn.close()
                     messagebox.showwarning("Warning", "Player not found in database file.", parent=window)
                     
             except Exception as e:
                 messagebox.showerror("Error", f"Database error: {e}", parent=window)
-            conn.close()
     
     def update_player():
-        # Get the ID (Jersey Number) to know which player to update
-        jersey_val = entries["Jersey Number"].get().strip()
-        
-        if not jersey_val:
-            messagebox.showwarning("Warning", "Please enter a Jersey Number to update!", parent=window)
+        # Same rules and messages as add_player; the jersey picks the row
+        data = {col: entries[label].get() for label, col in zip(labels, PLAYER_COLUMNS)}
+
+        try:
+            row = player_row(data)
+        except ValidationError as e:
+            messagebox.showerror("Error", str(e), parent=window)
             return
 
         try:
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            
-            # SQL UPDATE command targeting the Jersey Number
-            cursor.execute("""
-                UPDATE players SET 
-                name=?, age=?, position=?, fitness=?, goals=?, injury=?, suspension=?
-                WHERE jersey=?
-            """, (
-                entries["Name"].get().strip(),
-                int(entries["Age"].get() or 0),
-                entries["Position"].get().strip(),
-                entries["Fitness"].get().strip(),
-                int(entries["Goals"].get() or 0),
-                entries["Injury"].get().strip(),
-                entries["Suspension"].get().strip(),
-                int(jersey_val)
-            ))
-            
-            conn.commit()
-            
             # Check if the jersey actually existed in the database
-            if cursor.rowcount > 0:
-                messagebox.showinfo("Success", f"Player #{jersey_val} updated successfully!", parent=window)
+            if players.update(Player(*row)):
+                messagebox.showinfo("Success", f"Player #{row[0]} updated successfully!", parent=window)
             else:
-                messagebox.showwarning("Not Found", f"No player found with Jersey #{jersey_val}", parent=window)
-                
-            conn.close()
-            refresh_table() # Reload the UI table
-            
-        except ValueError:
-            messagebox.showerror("Error", "Age and Goals must be numbers!", parent=window)
+                messagebox.showwarning("Not Found", f"No player found with Jersey #{row[0]}", parent=window)
         except Exception as e:
             messagebox.showerror("Error", f"Update failed: {e}", parent=window)
 
-    def search_player():
+    @ui_timed
+    def search_player(ranked=True):
         val = entries["Name"].get().strip()
         jersey_search = entries["Jersey Number"].get().strip()
-        
-        for row in player_table.get_children():
-            player_table.delete(row)
+        jersey = int(jersey_search) if jersey_search.isdigit() else None
+
+        if not val and jersey is None:
+            refresh_table()
+            return
+
+        # Full-text prefix search over name, position, injury and suspension,
+        # plus an exact jersey number hit at the top
+        def fetch_search_page(offset, limit):
+            return table_rows(players.search(val, jersey, limit, offset, ranked))
 
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        # Searches by name (partial match) or exact jersey number
-        cursor.execute("SELECT * FROM players WHERE name LIKE ? OR jersey = ?",(f'%{val}%', jersey_search))
-        rows = cursor.fetchall()
-        conn.close()
+        pager.reset(fetch_search_page, by_offset=True)
 
-        for idx, player in enumerate(rows):
-            tag = "evenrow" if idx % 2 == 0 else "oddrow"
-            player_table.insert("", tk.END, values=player, tags=(tag,))
+    # Search-as-you-type on the Name field (toggled by the checkbox below)
+    live_search = tk.BooleanVar(value=False)
+    live_search_job = [None]
+
+    def on_name_typed(event):
+        if not live_search.get():
+            return
+        if live_search_job[0] is not None:
+            window.after_cancel(live_search_job[0])
+        live_search_job[0] = window.after(LIVE_SEARCH_DELAY_MS, run_live_search)
+
+    def run_live_search():
+        live_search_job[0] = None
+        search_player(ranked=False)
+
+    entries["Name"].bind("<KeyRelease>", on_name_typed)
 
     #  BUTTONS
     button_frame = tk.Frame(window, bg="#f0f4f7")
@@ -229,11 +193,15 @@ def open_player_page(root):
     for i, (text, color, cmd) in enumerate(btns):
         tk.Button(button_frame, text=text, bg=color, fg="white", font=("Arial", 10, "bold"),width=12, command=cmd).grid(row=0, column=i, padx=5)
 
+    tk.Checkbutton(button_frame, text="Search as you type", variable=live_search,
+                   bg="#f0f4f7", font=("Arial", 10)).grid(row=0, column=len(btns), padx=5)
+
     # PLAYER TABLE
     table_frame = tk.Frame(window)
     table_frame.pack(pady=10, padx=15, fill="both", expand=True)
 
-    columns = ("Jersey", "Name", "Age", "Position", "Fitness", "Goals", "Injury", "Suspension")
+    columns = ("Jersey", "Name", "Age", "Position", "Fitness", "Goals", "Injury", "Suspension",
+               "Apps", "Match Goals", "Assists")
     player_table = ttk.Treeview(table_frame, columns=columns, show="headings", height=15)
 
     for col in columns:
@@ -243,9 +211,31 @@ def open_player_page(root):
     player_table.tag_configure('evenrow', background='#ecf0f1')
     player_table.tag_configure('oddrow', background='#ffffff')
 
+    filters = SortFilterBar(window, player_table, PLAYER_LISTING, lambda view: refresh_table(),
+                            bg="#f0f4f7")
+    filters.frame.pack(before=table_frame, padx=15, fill="x")
+
     scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=player_table.yview)
-    player_table.configure(yscroll=scrollbar.set)
+    pager = PagedTreeview(player_table, scrollbar, listing_page(View()))
     scrollbar.pack(side="right", fill="y")
     player_table.pack(side="left", fill="both", expand=True)
 
-    refresh_table()
\ No newline at end of file
+    # Writes from this or any other window (see page_manager.ChangeFollower),
+    # or made elsewhere while the page was hidden. A new stat line changes
+    # that player's Apps / Match Goals / Assists.
+    def apply_changes(changes):
+        if changes is not None:
+            jerseys = {int(k) for k in changes["players"]}
+            jerseys.update(jersey for _, jersey in changes.get("player_match_stats", ()))
+            if not jerseys:
+                return
+        if pager.by_offset:
+            search_player()  # ranked results may reorder: run the search again
+        elif changes is None or not filters.view.is_default:
+            refresh_table()  # an edit can move a row in the sort order or out of the filter
+        else:
+            pager.apply_changes(jerseys, lambda keys: table_rows(players.get_many(keys)))
+
+    refresh_table()
+    page = Page(window, apply_changes)
+    return page
\ No newline at end of file
@@ -0,0 +1,94 @@
+import re
+import db
+
+# Full-text index over the searchable player columns. It is an external
+# content table: the text lives only in players, the index is kept in sync
+# by the triggers below. Prefix indexes make "ro*" style lookups cheap.
+INDEX_SQL = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(
+        name, position, injury, suspension,
+        content='players', content_rowid='jersey',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+"""
+
+TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ai AFTER INSERT ON players BEGIN
+        INSERT INTO players_fts(rowid, name, position, injury, suspension)
+        VALUES (new.jersey, new.name, new.position, new.injury, new.suspension);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_ad AFTER DELETE ON players BEGIN
+        INSERT INTO players_fts(players_fts, rowid, name, position, injury, suspension)
+        VALUES ('delete', old.jersey, old.name, old.position, old.injury, old.suspension);
+    END
+    """,
+    # team_assigned / goals updates do not touch the index
+    """
+    CREATE TRIGGER IF NOT EXISTS players_fts_au
+    AFTER UPDATE OF jersey, name, position, injury, suspension ON players BEGIN
+        INSERT INTO players_fts(players_fts, rowid, name, position, injury, suspension)
+        VALUES ('delete', old.jersey, old.name, old.position, old.injury, old.suspension);
+        INSERT INTO players_fts(rowid, name, position, injury, suspension)
+        VALUES (new.jersey, new.name, new.position, new.injury, new.suspension);
+    END
+    """,
+)
+
+# Weights for bm25(): a hit in the name counts most, injury/suspension least
+RANK_WEIGHTS = (10.0, 3.0, 1.0, 1.0)
+
+
+# ---------------- INDEX SETUP ----------------
+def create_search_index(conn):
+    # Run as a schema migration (see migrations.py)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'players_fts'").fetchone()
+    conn.execute(INDEX_SQL)
+    for trigger in TRIGGERS_SQL:
+        conn.execute(trigger)
+    if not exists:
+        # First run on an existing database: index the rows already there
+        conn.execute("INSERT INTO players_fts(players_fts) VALUES ('rebuild')")
+
+
+# ---------------- QUERYING ----------------
+def build_match_query(text):
+    """Turn free text into an FTS5 query: every word must match as a prefix."""
+    words = re.findall(r"\w+", text, flags=re.UNICODE)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def search_players(text, jersey=None, limit=50, offset=0, ranked=True, path=db.DB_NAME):
+    """Player rows matching text, with an exact jersey hit first.
+
+    Pages by offset because bm25 ranking has no stable keyset to resume from.
+    Ranking has to score every match before the first row comes back, so
+    search-as-you-type passes ranked=False and gets rows in jersey order,
+    which stops as soon as the page is full.
+    """
+    rows = []
+    exact = None
+    if jersey is not None:
+        exact = db.query_one("SELECT * FROM players WHERE jersey = ?", (jersey,), path=path)
+    if exact is not None:
+        if offset == 0:
+            rows.append(exact)
+            limit -= 1
+        else:
+            offset -= 1
+
+    match = build_match_query(text)
+    if match and limit > 0:
+        order = f"bm25(players_fts, {', '.join(map(str, RANK_WEIGHTS))})" if ranked else "players_fts.rowid"
+        rows += db.query(f"""
+            SELECT p.* FROM players_fts
+            JOIN players p ON p.jersey = players_fts.rowid
+            WHERE players_fts MATCH ? AND p.jersey IS NOT ?
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        """, (match, jersey, limit, offset), path=path)
+    return rows
@@ -0,0 +1,231 @@
+import db
+
+# One row per player per match in player_match_stats; player_season_totals
+# holds the sums per (jersey, season), plus season "*" for the career, kept
+# up to date by triggers so the player list never sums the history.
+ALL = "*"
+
+STAT_FIELDS = ("appeared", "minutes", "goals", "assists", "yellow_cards", "red_cards")
+SEASON_OF_MATCH = ("(SELECT COALESCE(NULLIF(substr(match_date, 1, 4), ''), '?') "
+                   "FROM matches WHERE id = {row}.match_id)")
+
+STATS_SQL = """
+    CREATE TABLE IF NOT EXISTS player_match_stats (
+        match_id INTEGER NOT NULL REFERENCES matches(id),
+        jersey INTEGER NOT NULL REFERENCES players(jersey),
+        appeared INTEGER NOT NULL DEFAULT 1,
+        minutes INTEGER NOT NULL DEFAULT 0,
+        goals INTEGER NOT NULL DEFAULT 0,
+        assists INTEGER NOT NULL DEFAULT 0,
+        yellow_cards INTEGER NOT NULL DEFAULT 0,
+        red_cards INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (match_id, jersey)
+    )
+"""
+
+TOTALS_SQL = """
+    CREATE TABLE IF NOT EXISTS player_season_totals (
+        jersey INTEGER NOT NULL,
+        season TEXT NOT NULL,
+        entries INTEGER NOT NULL DEFAULT 0,
+        appearances INTEGER NOT NULL DEFAULT 0,
+        minutes INTEGER NOT NULL DEFAULT 0,
+        goals INTEGER NOT NULL DEFAULT 0,
+        assists INTEGER NOT NULL DEFAULT 0,
+        yellow_cards INTEGER NOT NULL DEFAULT 0,
+        red_cards INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (jersey, season)
+    )
+"""
+
+INDEXES_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_player_match_stats_jersey ON player_match_stats(jersey)",
+)
+
+
+# Upsert tail that adds the new row's figures to an existing totals row
+_ADD = "\n        ON CONFLICT (jersey, season) DO UPDATE SET\n            " + ",\n            ".join(
+    f"{t} = {t} + excluded.{t}" for t in ("entries", "appearances") + STAT_FIELDS[1:])
+
+
+def _apply(source, sign, jersey, season):
+    # Adds (sign=1) or removes (sign=-1) stat rows from source at the
+    # (jersey, season) and (jersey, *) grains
+    sums = ", ".join(f"{sign} * COALESCE({f}, 0)" for f in STAT_FIELDS)
+    return f"""
+        INSERT INTO player_season_totals
+            (jersey, season, entries, appearances, minutes, goals, assists, yellow_cards, red_cards)
+        SELECT {jersey}, s.season, {sign}, {sums}
+        FROM {source}, (SELECT {season} AS season UNION ALL SELECT '{ALL}') s
+        WHERE true{_ADD};
+    """
+
+
+def _one(row):
+    # A single trigger row as a one-row source for _apply
+    return f"(SELECT {', '.join(f'{row}.{f} AS {f}' for f in STAT_FIELDS)})"
+
+
+_CLEANUP = "DELETE FROM player_season_totals WHERE entries = 0;"
+
+
+def _cleanup(row):
+    # Only that player's rows, so it is a primary-key range rather than a full scan
+    return f"DELETE FROM player_season_totals WHERE jersey = {row}.jersey AND entries = 0;"
+
+TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS player_stats_ai AFTER INSERT ON player_match_stats BEGIN
+        {_apply(_one("new"), 1, "new.jersey", SEASON_OF_MATCH.format(row="new"))}
+        INSERT INTO change_log (table_name, row_key) VALUES ('players', new.jersey);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS player_stats_ad AFTER DELETE ON player_match_stats BEGIN
+        {_apply(_one("old"), -1, "old.jersey", SEASON_OF_MATCH.format(row="old"))}
+        {_cleanup("old")}
+        INSERT INTO change_log (table_name, row_key) VALUES ('players', old.jersey);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS player_stats_au AFTER UPDATE ON player_match_stats BEGIN
+        {_apply(_one("old"), -1, "old.jersey", SEASON_OF_MATCH.format(row="old"))}
+        {_apply(_one("new"), 1, "new.jersey", SEASON_OF_MATCH.format(row="new"))}
+        {_cleanup("old")}
+        INSERT INTO change_log (table_name, row_key) VALUES ('players', new.jersey);
+    END
+    """,
+    # BEFORE, so the stat rows can still look up the match's season
+    """
+    CREATE TRIGGER IF NOT EXISTS player_stats_match_bd BEFORE DELETE ON matches BEGIN
+        DELETE FROM player_match_stats WHERE match_id = old.id;
+    END
+    """,
+    # A match moved to another season takes its player stats with it
+    f"""
+    CREATE TRIGGER IF NOT EXISTS player_stats_match_au AFTER UPDATE OF match_date ON matches
+    WHEN substr(old.match_date, 1, 4) IS NOT substr(new.match_date, 1, 4) BEGIN
+        {_apply("(SELECT * FROM player_match_stats WHERE match_id = new.id) p", -1, "p.jersey",
+                "COALESCE(NULLIF(substr(old.match_date, 1, 4), ''), '?')")}
+        {_apply("(SELECT * FROM player_match_stats WHERE match_id = new.id) p", 1, "p.jersey",
+                "COALESCE(NULLIF(substr(new.match_date, 1, 4), ''), '?')")}
+        {_CLEANUP}
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS player_stats_player_ad AFTER DELETE ON players BEGIN
+        DELETE FROM player_match_stats WHERE jersey = old.jersey;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS player_stats_player_au AFTER UPDATE OF jersey ON players BEGIN
+        UPDATE player_match_stats SET jersey = new.jersey WHERE jersey = old.jersey;
+    END
+    """,
+)
+
+
+# Foreign keys are not enforced (PRAGMA foreign_keys is off), so these check
+# the REFERENCES above. BEFORE, so a bad line never reaches the totals.
+REFERENCE_TRIGGERS_SQL = tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS player_stats_refs_{name} {event} ON player_match_stats BEGIN
+        SELECT RAISE(ABORT, 'No match with that id')
+        WHERE NOT EXISTS (SELECT 1 FROM matches WHERE id = new.match_id);
+        SELECT RAISE(ABORT, 'No player with that jersey number')
+        WHERE NOT EXISTS (SELECT 1 FROM players WHERE jersey = new.jersey);
+    END
+    """ for name, event in (("bi", "BEFORE INSERT"), ("bu", "BEFORE UPDATE OF match_id, jersey")))
+# The messages above, for telling them apart from other constraint errors
+REFERENCE_ERRORS = ("No match with that id", "No player with that jersey number")
+
+
+# ---------------- SETUP ----------------
+def create_player_stats(conn):
+    # Run as a schema migration (see migrations.py)
+    conn.execute(STATS_SQL)
+    conn.execute(TOTALS_SQL)
+    for sql in INDEXES_SQL + TRIGGERS_SQL:
+        conn.execute(sql)
+    # Some old databases have an unused match_stats table keyed by player_id;
+    # its rows (jersey numbers) are carried over, fouls are not tracked
+    legacy = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'match_stats'").fetchone()
+    if legacy:
+        conn.execute("""
+            INSERT OR IGNORE INTO player_match_stats
+                (match_id, jersey, goals, assists, yellow_cards, red_cards)
+            SELECT match_id, player_id, COALESCE(goals, 0), COALESCE(assists, 0),
+                   COALESCE(yellow_cards, 0), COALESCE(red_cards, 0)
+            FROM match_stats WHERE match_id IS NOT NULL AND player_id IS NOT NULL
+        """)
+
+
+def recreate_line_triggers(conn):
+    # Run as a schema migration: databases from before _cleanup was scoped to
+    # one player have the full-scan version of the stat line triggers
+    for name in ("player_stats_ai", "player_stats_ad", "player_stats_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for sql in TRIGGERS_SQL[:3]:
+        conn.execute(sql)
+
+
+def check_references(conn):
+    # Run as a schema migration
+    for sql in REFERENCE_TRIGGERS_SQL:
+        conn.execute(sql)
+
+
+def rebuild_totals(path=db.DB_NAME):
+    """Recompute player_season_totals from player_match_stats, hot and archived
+    (see season_stats.rebuild_summary)."""
+    import partitions   # imports this module
+    with db.transaction(path) as conn:
+        conn.execute("DELETE FROM player_season_totals")
+        season = SEASON_OF_MATCH.format(row="p")
+        conn.execute(f"""
+            INSERT INTO player_season_totals
+            SELECT jersey, season, COUNT(*), {", ".join(f"SUM({f})" for f in STAT_FIELDS)}
+            FROM (SELECT p.*, {season} AS season FROM player_match_stats p
+                  UNION ALL SELECT p.*, '{ALL}' FROM player_match_stats p)
+            GROUP BY jersey, season
+        """)
+        for season in partitions.archived_on(conn):
+            add_lines(conn, partitions.load_archived(conn, season, "player_match_stats"), season)
+
+
+def add_lines(conn, source, season):
+    """Count the stat lines in source, all from matches of season, into
+    player_season_totals (for seasons moved into an archive, see partitions)."""
+    sums = ", ".join(f"SUM(COALESCE({f}, 0))" for f in STAT_FIELDS)
+    conn.execute(f"""
+        INSERT INTO player_season_totals
+        SELECT * FROM (
+            SELECT p.jersey, s.season, COUNT(*), {sums}
+            FROM {source} p, (SELECT ? AS season UNION ALL SELECT '{ALL}') s
+            GROUP BY p.jersey, s.season
+        ) WHERE true{_ADD}
+    """, (season,))
+
+
+# ---------------- READING ----------------
+TOTAL_FIELDS = ("appearances", "minutes", "goals", "assists", "yellow_cards", "red_cards")
+
+
+def totals_for(jerseys, season=ALL, path=db.DB_NAME):
+    """{jersey: {field: total}} for the given jerseys; players with no stats are left out."""
+    jerseys = list(jerseys)
+    if not jerseys:
+        return {}
+    rows = db.query(f"""
+        SELECT jersey, {", ".join(TOTAL_FIELDS)} FROM player_season_totals
+        WHERE season = ? AND jersey IN (SELECT value FROM json_each(?))
+    """, (season, "[" + ",".join(str(int(j)) for j in jerseys) + "]"), path=path)
+    return {row[0]: dict(zip(TOTAL_FIELDS, row[1:])) for row in rows}
+
+
+def by_season(jersey, path=db.DB_NAME):
+    rows = db.query(f"""
+        SELECT season, {", ".join(TOTAL_FIELDS)} FROM player_season_totals
+        WHERE jersey = ? AND season != ? ORDER BY season
+    """, (jersey, ALL), path=path)
+    return [dict(zip(("season",) + TOTAL_FIELDS, row)) for row in rows]
@@ -0,0 +1,180 @@
+"""Timing for SQL statements and UI refresh functions.
+
+Off by default. SOCCER_PROFILE=1 turns it on at launch; SOCCER_PROFILE=<file>
+also appends every event to that file as JSON Lines. It can be switched on
+and off at runtime from the debug panel (Ctrl+Shift+D on the dashboard).
+
+When it is off, db hands out plain connections and ui_timed functions cost
+one flag check, so there is nothing to pay for having it compiled in.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+RING_SIZE = 256          # samples kept per statement / function
+EVENTS_SIZE = 2000       # most recent events, for the dump
+PROFILE_ENV = "SOCCER_PROFILE"
+
+# Frames in these files are plumbing; the call site is the first frame outside them
+_PLUMBING = {"db.py", "profiler.py", "repository.py", "player_search.py", "season_stats.py",
+             "contextlib.py", "query_executor.py", "thread.py", "threading.py"}
+
+_setting = os.environ.get(PROFILE_ENV, "")
+enabled = bool(_setting)
+dump_path = _setting if _setting not in ("", "1") else None
+
+_stats = {}       # (kind, name) -> Stat
+_events = deque(maxlen=EVENTS_SIZE)
+_lock = threading.Lock()
+
+
+class Stat:
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=RING_SIZE)
+        self.last_site = ""
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "p50_ms": round(pick(0.5), 3),
+            "p95_ms": round(pick(0.95), 3),
+            "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+            "rows": self.rows,
+            "histogram": histogram(ordered),
+            "site": self.last_site,
+        }
+
+
+def histogram(samples):
+    # Power-of-two millisecond buckets: "<1", "<2", "<4", ... ">=1024"
+    buckets = {}
+    for ms in samples:
+        limit = 1
+        while ms >= limit and limit < 1024:
+            limit *= 2
+        label = f">={limit}" if ms >= limit else f"<{limit}"
+        buckets[label] = buckets.get(label, 0) + 1
+    return buckets
+
+
+# ---------------- RECORDING ----------------
+def call_site():
+    frame = sys._getframe(2)
+    while frame is not None:
+        file = os.path.basename(frame.f_code.co_filename)
+        if file not in _PLUMBING:
+            return f"{file}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return ""
+
+
+def record(kind, name, ms, rows=None, site=""):
+    event = {"t": round(time.time(), 3), "kind": kind, "name": name,
+             "ms": round(ms, 3), "rows": rows, "site": site}
+    with _lock:
+        stat = _stats.get((kind, name))
+        if stat is None:
+            stat = _stats[(kind, name)] = Stat(kind, name)
+        stat.calls += 1
+        stat.total_ms += ms
+        stat.rows += rows if rows and rows > 0 else 0
+        stat.samples.append(ms)
+        stat.last_site = site or stat.last_site
+        _events.append(event)
+        if dump_path:
+            try:
+                with open(dump_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(event) + "\n")
+            except OSError:
+                pass
+
+
+def statement_name(sql):
+    return " ".join(sql.split())
+
+
+def record_sql(sql, started, rows):
+    record("sql", statement_name(sql), (time.perf_counter() - started) * 1000, rows, call_site())
+
+
+class ProfiledConnection:
+    """Wraps a sqlite3 connection, timing execute / executemany."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        cursor = self._conn.execute(sql, params)
+        record_sql(sql, started, cursor.rowcount)
+        return cursor
+
+    def executemany(self, sql, seq_of_params):
+        started = time.perf_counter()
+        cursor = self._conn.executemany(sql, seq_of_params)
+        record_sql(sql, started, cursor.rowcount)
+        return cursor
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def ui_timed(fn):
+    """Decorator for UI refresh functions; records their wall time."""
+    name = fn.__qualname__.replace(".<locals>", "")
+
+    @wraps(fn)
+    def timed(*args, **kwargs):
+        if not enabled:
+            return fn(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            record("ui", name, (time.perf_counter() - started) * 1000, site=call_site())
+    return timed
+
+
+# ---------------- READING ----------------
+def set_enabled(on):
+    global enabled
+    enabled = bool(on)
+
+
+def summaries():
+    """One dict per statement / function, slowest total first."""
+    with _lock:
+        stats = [stat.summary() for stat in _stats.values()]
+    return sorted(stats, key=lambda s: s["total_ms"], reverse=True)
+
+
+def clear():
+    with _lock:
+        _stats.clear()
+        _events.clear()
+
+
+def dump(path):
+    """Write the recent events, then one summary line per statement, as JSON Lines."""
+    with _lock:
+        events = list(_events)
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+        for summary in summaries():
+            f.write(json.dumps(dict(summary, kind=f"{summary['kind']}_summary")) + "\n")
+    return len(events)
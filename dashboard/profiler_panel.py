@@ -0,0 +1,76 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+import profiler
+
+REFRESH_MS = 1000
+
+COLUMNS = ("Kind", "Statement / Function", "Calls", "p50 ms", "p95 ms", "Max ms",
+           "Total ms", "Rows", "Call site")
+
+
+# Hidden debug window, opened with Ctrl+Shift+D on the dashboard
+def open_profiler_panel(parent):
+    for child in parent.winfo_children():
+        if isinstance(child, tk.Toplevel) and child.title() == "Profiler":
+            child.lift()
+            return
+
+    panel = tk.Toplevel(parent)
+    panel.title("Profiler")
+    panel.geometry("1100x500")
+    panel.configure(bg="#2C3E50")
+
+    # ---------------- CONTROLS ----------------
+    controls = tk.Frame(panel, bg="#2C3E50")
+    controls.pack(fill="x", padx=10, pady=8)
+
+    recording = tk.BooleanVar(value=profiler.enabled)
+    tk.Checkbutton(controls, text="Recording", variable=recording, bg="#2C3E50", fg="white",
+                   selectcolor="#34495E", activebackground="#2C3E50",
+                   command=lambda: profiler.set_enabled(recording.get())).pack(side="left")
+
+    def clear():
+        profiler.clear()
+        refresh()
+
+    def dump():
+        path = filedialog.asksaveasfilename(parent=panel, defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl")])
+        if path:
+            count = profiler.dump(path)
+            messagebox.showinfo("Profiler", f"{count} events written to {path}", parent=panel)
+
+    tk.Button(controls, text="Clear", bg="#7F8C8D", fg="white", command=clear).pack(side="left", padx=10)
+    tk.Button(controls, text="Dump JSONL...", bg="#2980B9", fg="white", command=dump).pack(side="left")
+    status = tk.Label(controls, bg="#2C3E50", fg="#ECF0F1")
+    status.pack(side="right")
+
+    # ---------------- TABLE ----------------
+    frame = tk.Frame(panel)
+    frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+    table = ttk.Treeview(frame, columns=COLUMNS, show="headings")
+    widths = (50, 380, 60, 70, 70, 70, 80, 70, 220)
+    for col, width in zip(COLUMNS, widths):
+        table.heading(col, text=col)
+        table.column(col, width=width, anchor="w" if width > 100 else "center")
+    scrollbar = ttk.Scrollbar(frame, orient="vertical", command=table.yview)
+    table.configure(yscrollcommand=scrollbar.set)
+    table.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+
+    def refresh():
+        stats = profiler.summaries()
+        table.delete(*table.get_children())
+        for s in stats:
+            table.insert("", tk.END, values=(s["kind"], s["name"], s["calls"], s["p50_ms"],
+                                             s["p95_ms"], s["max_ms"], s["total_ms"],
+                                             s["rows"], s["site"]))
+        state = "recording" if profiler.enabled else "off"
+        status.config(text=f"{len(stats)} entries, {state}")
+
+    def tick():
+        if panel.winfo_exists():
+            refresh()
+            panel.after(REFRESH_MS, tick)
+
+    tick()
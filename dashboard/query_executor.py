@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+MAX_WORKERS = 2
+POLL_MS = 15
+
+
+# ---------------- BACKGROUND QUERY EXECUTOR ----------------
+class QueryExecutor:
+    """Runs database work on worker threads and hands results back to Tk.
+
+    Every request is filed under a key. Submitting again under the same key
+    supersedes the earlier request: if it has not started it is cancelled,
+    otherwise its result is silently dropped when it arrives.
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def submit(self, widget, key, work, on_result, on_error=None):
+        future = self._pool.submit(work)
+        with self._lock:
+            previous = self._latest.get(key)
+            self._latest[key] = future
+        if previous is not None:
+            previous.cancel()
+
+        # Poll from the Tk main loop so widgets are only ever touched on the
+        # main thread. The root window outlives the page that asked.
+        root = widget.nametowidget(".")
+
+        def check():
+            with self._lock:
+                if self._latest.get(key) is not future:
+                    return  # superseded by a newer request
+                if not future.done():
+                    root.after(POLL_MS, check)
+                    return
+                del self._latest[key]
+            if not widget.winfo_exists():
+                return  # page was closed while the query ran
+            error = future.exception()
+            if error is None:
+                on_result(future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                print(f"Background query failed: {error}")
+
+        root.after(POLL_MS, check)
+        return future
+
+    def cancel(self, key):
+        with self._lock:
+            future = self._latest.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+executor = QueryExecutor()
+
+
+def run_in_background(widget, key, work, on_result, on_error=None):
+    return executor.submit(widget, key, work, on_result, on_error)
+
+
+def cancel_background(key):
+    executor.cancel(key)
@@ -0,0 +1,584 @@
+"""Headless data access for players, teams, matches and users.
+
+No Tk imports: the pages call this, and so can scripts, benchmarks and the
+bulk tools. Every repository takes the database path, so it can be pointed
+at a scratch or synthetic database. Single-item operations each run in
+their own transaction; the *_many variants do the whole batch in one
+executemany transaction. Every write is published on change_bus once it
+has committed, so open windows can patch the rows it touched.
+"""
+import heapq
+import json
+from dataclasses import dataclass, fields
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Optional
+
+import change_bus
+import db
+import partitions
+import player_stats
+import season_stats
+import standings
+from change_bus import DELETE, INSERT, UPDATE
+from listing import Column, Listing, View
+from player_search import search_players
+
+PAGE_SIZE = 200
+
+
+# ---------------- RECORDS ----------------
+@dataclass
+class Player:
+    jersey: int
+    name: str
+    age: int = 0
+    position: str = ""
+    fitness: str = ""
+    goals: int = 0
+    injury: str = ""
+    suspension: str = ""
+    team_assigned: Optional[str] = None
+
+    def as_row(self) -> tuple:
+        return (self.jersey, self.name, self.age, self.position, self.fitness,
+                self.goals, self.injury, self.suspension, self.team_assigned)
+
+
+@dataclass
+class Team:
+    team_name: str
+    coach: str = ""
+    staff_info: str = ""
+    formation: str = ""
+
+    def as_row(self) -> tuple:
+        return (self.team_name, self.coach, self.staff_info, self.formation)
+
+
+@dataclass
+class Match:
+    id: Optional[int]
+    opponent: str
+    match_date: str
+    venue: str = ""
+    team_score: int = 0
+    opponent_score: int = 0
+    home_team: Optional[str] = None   # league matches between two of our teams (see fixtures)
+    away_team: Optional[str] = None
+
+    @property
+    def result(self) -> str:
+        if self.team_score is None or self.opponent_score is None:
+            return ""  # a fixture not played yet
+        ours, theirs = self.team_score, self.opponent_score
+        if ours > theirs:
+            return "WIN"
+        if ours < theirs:
+            return "LOSS"
+        return "DRAW"
+
+    def as_row(self) -> tuple:
+        return (self.id, self.opponent, self.match_date, self.venue,
+                self.team_score, self.opponent_score, self.home_team, self.away_team)
+
+
+@dataclass
+class PlayerStat:
+    match_id: int
+    jersey: int
+    minutes: int = 0
+    goals: int = 0
+    assists: int = 0
+    yellow_cards: int = 0
+    red_cards: int = 0
+
+    def as_row(self) -> tuple:
+        return (self.match_id, self.jersey, self.minutes, self.goals, self.assists,
+                self.yellow_cards, self.red_cards)
+
+
+@dataclass
+class User:
+    id: int
+    username: str
+
+
+def _columns(record_type):
+    return ", ".join(f.name for f in fields(record_type))
+
+
+def _placeholders(n):
+    return ", ".join("?" * n)
+
+
+def _json_list(values):
+    return "[" + ",".join(str(int(v)) for v in values) + "]"
+
+
+def _existing(conn, sql, keys):
+    # The keys (a JSON array) already in the table, for telling inserts from updates
+    return {tuple(row) if len(row) > 1 else row[0] for row in conn.execute(sql, (json.dumps(keys),))}
+
+
+PLAYER_SELECT = f"SELECT {_columns(Player)} FROM players"
+TEAM_SELECT = f"SELECT {_columns(Team)} FROM teams"
+MATCH_SELECT = f"SELECT {_columns(Match)} FROM matches"
+_MATCH_INSERT = (f"INSERT INTO matches ({', '.join(f.name for f in fields(Match)[1:])}) "
+                 f"VALUES ({_placeholders(len(fields(Match)) - 1)})")
+
+# Sortable / filterable columns of the list views, by heading text (see listing)
+PLAYER_SORT_COLUMNS = (
+    Column("Jersey", "jersey", numeric=True), Column("Name", "name"),
+    Column("Age", "age", numeric=True), Column("Position", "position"),
+    Column("Fitness", "fitness"), Column("Goals", "goals", numeric=True),
+    Column("Injury", "injury"), Column("Suspension", "suspension"),
+)
+MATCH_SORT_COLUMNS = (
+    Column("ID", "id", numeric=True), Column("Opponent", "opponent"),
+    Column("Date", "match_date"), Column("Venue", "venue"),
+    Column("Team Score", "team_score", numeric=True),
+    Column("Opponent Score", "opponent_score", numeric=True),
+    Column("Home", "home_team"), Column("Away", "away_team"),
+    Column("Result", "CASE WHEN team_score IS NULL OR opponent_score IS NULL THEN '' "
+                     "WHEN team_score > opponent_score THEN 'WIN' "
+                     "WHEN team_score < opponent_score THEN 'LOSS' ELSE 'DRAW' END"),
+)
+PLAYER_LISTING = Listing(PLAYER_SELECT, "jersey", PLAYER_SORT_COLUMNS)
+SQUAD_LISTING = Listing(PLAYER_SELECT, "jersey", PLAYER_SORT_COLUMNS, where="team_assigned = ?")
+MATCH_LISTING = Listing(MATCH_SELECT, "id", MATCH_SORT_COLUMNS)
+
+
+# ---------------- PLAYERS ----------------
+class PlayerRepository:
+    def __init__(self, path=db.DB_NAME):
+        self.path = path
+
+    def _players(self, sql, params=()) -> List[Player]:
+        return [Player(*row) for row in db.query(sql, params, path=self.path)]
+
+    def get(self, jersey: int) -> Optional[Player]:
+        row = db.query_one(f"{PLAYER_SELECT} WHERE jersey = ?", (jersey,), path=self.path)
+        return Player(*row) if row else None
+
+    def get_many(self, jerseys: Iterable[int]) -> List[Player]:
+        jerseys = list(jerseys)
+        if not jerseys:
+            return []
+        return self._players(
+            f"{PLAYER_SELECT} WHERE jersey IN (SELECT value FROM json_each(?)) ORDER BY jersey",
+            (_json_list(jerseys),))
+
+    def page(self, after_jersey: Optional[int] = None, limit: int = PAGE_SIZE) -> List[Player]:
+        """Keyset page in jersey order, starting after after_jersey."""
+        if after_jersey is None:
+            return self._players(f"{PLAYER_SELECT} ORDER BY jersey LIMIT ?", (limit,))
+        return self._players(f"{PLAYER_SELECT} WHERE jersey > ? ORDER BY jersey LIMIT ?",
+                             (after_jersey, limit))
+
+    def listing(self, view: View, after=None, limit: int = PAGE_SIZE) -> List[Player]:
+        """Keyset page sorted and filtered as in view; after is PLAYER_LISTING.cursor()."""
+        return self._players(*PLAYER_LISTING.query(view, after, limit))
+
+    def search(self, text: str, jersey: Optional[int] = None, limit: int = PAGE_SIZE,
+               offset: int = 0, ranked: bool = True) -> List[Player]:
+        """Full-text search, see player_search.search_players."""
+        return [Player(*row) for row in search_players(text, jersey, limit, offset, ranked, self.path)]
+
+    def squad(self, team_name: str, view: Optional[View] = None) -> List[Player]:
+        return self._players(*SQUAD_LISTING.query(view or View(), params=(team_name,)))
+
+    def squads(self, limit: Optional[int] = None) -> Optional[Dict[str, List[Player]]]:
+        """Every team's squad in one query; None if more than limit players are assigned."""
+        rows = self._players(
+            f"{PLAYER_SELECT} WHERE team_assigned IS NOT NULL ORDER BY team_assigned, jersey"
+            + (" LIMIT ?" if limit is not None else ""),
+            (limit + 1,) if limit is not None else ())
+        if limit is not None and len(rows) > limit:
+            return None
+        squads = {}
+        for player in rows:
+            squads.setdefault(player.team_assigned, []).append(player)
+        return squads
+
+    def add(self, player: Player) -> None:
+        self.add_many([player])
+
+    def add_many(self, players: Iterable[Player]) -> int:
+        """Insert all players or none; raises sqlite3.IntegrityError on a duplicate jersey."""
+        players = list(players)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany(
+                f"INSERT INTO players ({_columns(Player)}) VALUES ({_placeholders(9)})",
+                [p.as_row() for p in players])
+        change_bus.publish("players", INSERT, [p.jersey for p in players], self.path)
+        return cursor.rowcount
+
+    def update(self, player: Player) -> bool:
+        return self.update_many([player]) > 0
+
+    def update_many(self, players: Iterable[Player]) -> int:
+        # Updates the form fields; the team assignment is left alone
+        players = list(players)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany("""
+                UPDATE players SET
+                name=?, age=?, position=?, fitness=?, goals=?, injury=?, suspension=?
+                WHERE jersey=?
+            """, [p.as_row()[1:8] + (p.jersey,) for p in players])
+        if cursor.rowcount:
+            change_bus.publish("players", UPDATE, [p.jersey for p in players], self.path)
+        return cursor.rowcount
+
+    def delete(self, jersey: int) -> bool:
+        return self.delete_many([jersey]) > 0
+
+    def delete_many(self, jerseys: Iterable[int]) -> int:
+        jerseys = list(jerseys)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany("DELETE FROM players WHERE jersey = ?",
+                                      [(j,) for j in jerseys])
+        if cursor.rowcount:
+            change_bus.publish("players", DELETE, jerseys, self.path)
+        return cursor.rowcount
+
+    def assign(self, jersey: int, team_name: Optional[str]) -> bool:
+        return self.assign_many([jersey], team_name) > 0
+
+    def move_squad(self, from_team: str, to_team: Optional[str]) -> int:
+        """Move every player of from_team to to_team in one statement."""
+        with db.transaction(self.path) as conn:
+            moved = [row[0] for row in conn.execute(
+                "UPDATE players SET team_assigned = ? WHERE team_assigned = ? RETURNING jersey",
+                (to_team, from_team))]
+        change_bus.publish("players", UPDATE, moved, self.path)
+        return len(moved)
+
+    def assign_many(self, jerseys: Iterable[int], team_name: Optional[str]) -> int:
+        """Move players to team_name (None makes them free agents)."""
+        jerseys = list(jerseys)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany("UPDATE players SET team_assigned = ? WHERE jersey = ?",
+                                      [(team_name, j) for j in jerseys])
+        if cursor.rowcount:
+            change_bus.publish("players", UPDATE, jerseys, self.path)
+        return cursor.rowcount
+
+
+# ---------------- TEAMS ----------------
+class TeamRepository:
+    def __init__(self, path=db.DB_NAME):
+        self.path = path
+
+    def names(self) -> List[str]:
+        return [row[0] for row in db.query("SELECT team_name FROM teams", path=self.path)]
+
+    def get(self, team_name: str) -> Optional[Team]:
+        row = db.query_one(f"{TEAM_SELECT} WHERE team_name = ?", (team_name,), path=self.path)
+        return Team(*row) if row else None
+
+    def all(self) -> List[Team]:
+        return [Team(*row) for row in db.query(f"{TEAM_SELECT} ORDER BY team_name", path=self.path)]
+
+    def save(self, team: Team) -> None:
+        self.save_many([team])
+
+    def save_many(self, teams: Iterable[Team]) -> int:
+        """Insert or replace each team."""
+        teams = list(teams)
+        names = [t.team_name for t in teams]
+        with db.transaction(self.path) as conn:
+            existing = _existing(conn, "SELECT team_name FROM teams "
+                                       "WHERE team_name IN (SELECT value FROM json_each(?))", names)
+            cursor = conn.executemany(
+                f"INSERT OR REPLACE INTO teams ({_columns(Team)}) VALUES ({_placeholders(4)})",
+                [t.as_row() for t in teams])
+        change_bus.bus.publish([change_bus.Change("teams", name, UPDATE if name in existing else INSERT)
+                                for name in names], self.path)
+        return cursor.rowcount
+
+    def delete(self, team_name: str) -> bool:
+        return self.delete_many([team_name]) > 0
+
+    def delete_many(self, team_names: Iterable[str]) -> int:
+        """Delete teams; their players become free agents."""
+        team_names = list(team_names)
+        with db.transaction(self.path) as conn:
+            freed = [row[0] for row in conn.execute("""
+                UPDATE players SET team_assigned = NULL
+                WHERE team_assigned IN (SELECT value FROM json_each(?)) RETURNING jersey
+            """, (json.dumps(team_names),))]
+            cursor = conn.executemany("DELETE FROM teams WHERE team_name = ?",
+                                      [(name,) for name in team_names])
+        change_bus.publish("players", UPDATE, freed, self.path)
+        if cursor.rowcount:
+            change_bus.publish("teams", DELETE, team_names, self.path)
+        return cursor.rowcount
+
+
+# ---------------- MATCHES ----------------
+class MatchRepository:
+    """Matches in the hot database, or with season= in that archived season
+    (read-only, see partitions). Lookups by id find archived matches too."""
+
+    def __init__(self, path=db.DB_NAME, season=None):
+        self.hot_path = path
+        self.season = season
+        self.path = path if season is None else partitions.season_path(season, path)
+
+    def in_season(self, season) -> "MatchRepository":
+        return MatchRepository(self.hot_path, season)
+
+    def seasons(self) -> List[str]:
+        """The archived seasons, oldest first."""
+        return [season for season, _ in partitions.archived_seasons(self.hot_path)]
+
+    def archived_count(self) -> int:
+        return partitions.archived_count(self.hot_path)
+
+    def archived_season(self, match_id: int) -> Optional[str]:
+        """The archived (read-only) season match_id is in, or None."""
+        return partitions.season_of(match_id, self.hot_path)
+
+    def get(self, match_id: int, archived: bool = True) -> Optional[Match]:
+        """The match, looked up in the archives too unless archived=False."""
+        row = db.query_one(f"{MATCH_SELECT} WHERE id = ?", (match_id,), path=self.path)
+        if row is None and archived and self.season is None:
+            season = partitions.season_of(match_id, self.path)
+            if season is not None:
+                return self.in_season(season).get(match_id)
+        return Match(*row) if row else None
+
+    def get_many(self, match_ids: Iterable[int], archived: bool = True) -> List[Match]:
+        """The matches that exist, in id order; like get() for archived ones."""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return []
+        found = [Match(*row) for row in db.query(
+            f"{MATCH_SELECT} WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id",
+            (_json_list(match_ids),), path=self.path)]
+        if archived and self.season is None and len(found) < len(match_ids):
+            # One catalog lookup for all the missing ids, then one query per archive
+            missing = set(match_ids) - {m.id for m in found}
+            by_season = {}
+            for match_id, season in db.query(
+                    "SELECT id, season FROM archived_matches WHERE id IN (SELECT value FROM json_each(?))",
+                    (_json_list(sorted(missing)),), path=self.hot_path):
+                by_season.setdefault(season, []).append(match_id)
+            for season, ids in by_season.items():
+                found += self.in_season(season).get_many(ids)
+            found.sort(key=lambda m: m.id)
+        return found
+
+    def all(self) -> List[Match]:
+        return [Match(*row) for row in db.query(MATCH_SELECT, path=self.path)]
+
+    def count(self) -> int:
+        return db.query_one("SELECT COUNT(*) FROM matches", path=self.path)[0]
+
+    def clashes(self, match_date: str, venue: str) -> List[Match]:
+        """Matches already at venue on match_date (idx_matches_date_venue)."""
+        return [Match(*row) for row in db.query(f"{MATCH_SELECT} WHERE match_date = ? AND venue = ?",
+                                                (match_date, venue), path=self.path)]
+
+    def stream(self, first_chunk=None, chunk_size=500, view: Optional[View] = None):
+        """Every match (sorted / filtered as in view), as lists of Match read
+        fetchmany-style (see db.stream)."""
+        sql, params = MATCH_LISTING.query(view or View())
+        for rows in db.stream(sql, params, first_chunk, chunk_size, self.path):
+            yield [Match(*row) for row in rows]
+
+    def stream_all(self, first_chunk=None, chunk_size=500, view: Optional[View] = None):
+        """Like stream, over the hot database and every archived season,
+        merged into one listing in view order."""
+        view = view or View()
+        streams = [repo.stream(first_chunk, chunk_size, view)
+                   for repo in [self] + [self.in_season(s) for s in self.seasons()]]
+        merged = heapq.merge(*(chain.from_iterable(s) for s in streams),
+                             key=_match_sort_key(view), reverse=view.descending)
+        try:
+            size = first_chunk or chunk_size
+            while True:
+                chunk = list(islice(merged, size))
+                if not chunk:
+                    return
+                yield chunk
+                size = chunk_size
+        finally:
+            for s in streams:
+                s.close()   # hands each partition's connection back
+
+    def schedule(self, match: Match) -> int:
+        """Insert one match and return its new id."""
+        cursor = db.execute(_MATCH_INSERT, match.as_row()[1:], path=self.path)
+        change_bus.publish("matches", INSERT, [cursor.lastrowid], self.path)
+        return cursor.lastrowid
+
+    def schedule_many(self, matches: Iterable[Match]) -> int:
+        with db.transaction(self.path) as conn:
+            ids = [conn.execute(_MATCH_INSERT, m.as_row()[1:]).lastrowid for m in matches]
+        change_bus.publish("matches", INSERT, ids, self.path)
+        return len(ids)
+
+    def update_scores(self, match_id: int, team_score: int, opponent_score: int) -> bool:
+        # A changed score also drops its season's cached league table (see standings)
+        return self.update_scores_many([(match_id, team_score, opponent_score)]) > 0
+
+    def update_scores_many(self, scores) -> int:
+        """scores is an iterable of (match_id, team_score, opponent_score)."""
+        scores = list(scores)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany(
+                "UPDATE matches SET team_score = ?, opponent_score = ? WHERE id = ?",
+                [(ours, theirs, match_id) for match_id, ours, theirs in scores])
+        if cursor.rowcount:
+            change_bus.publish("matches", UPDATE, [match_id for match_id, _, _ in scores], self.path)
+        return cursor.rowcount
+
+    def delete(self, match_id: int) -> bool:
+        return self.delete_many([match_id]) > 0
+
+    def delete_many(self, match_ids: Iterable[int]) -> int:
+        match_ids = list(match_ids)
+        with db.transaction(self.path) as conn:
+            cursor = conn.executemany("DELETE FROM matches WHERE id = ?", [(m,) for m in match_ids])
+        if cursor.rowcount:
+            change_bus.publish("matches", DELETE, match_ids, self.path)
+        return cursor.rowcount
+
+    def totals(self, season=season_stats.ALL, venue=season_stats.ALL) -> dict:
+        """Trigger-maintained summary, see season_stats."""
+        return season_stats.totals(season, venue, self.path)
+
+    def standings(self, season) -> List[dict]:
+        """League table for season, cached until a result changes (see standings)."""
+        return standings.table(season, self.hot_path)
+
+    def league_seasons(self) -> List[str]:
+        """Seasons with league matches in the hot database, and the archived
+        seasons, newest first. League matches are not in the club summary
+        (see season_stats.COUNTED), so this reads the matches."""
+        rows = db.query(f"""
+            SELECT {season_stats.SEASON_OF.format(row="m")} FROM matches m
+            WHERE {standings.LEAGUE.format(row="m")}
+            UNION SELECT season FROM season_archives
+            ORDER BY 1 DESC
+        """, path=self.hot_path)
+        return [row[0] for row in rows]
+
+
+def _match_sort_key(view):
+    # Python twin of MATCH_LISTING's ORDER BY, for merging partitions
+    column = MATCH_LISTING.columns.get(view.sort)
+    if column is None or column.sql == "id":
+        return lambda m: m.id
+    attr = "result" if view.sort == "Result" else column.sql
+    return lambda m: (column.sort_key(getattr(m, attr)), m.id)
+
+
+# ---------------- PLAYER MATCH STATS ----------------
+class PlayerStatRepository:
+    """Stat lines in the hot database, or with season= in that archived
+    season (read-only, see partitions)."""
+
+    def __init__(self, path=db.DB_NAME, season=None):
+        self.hot_path = path
+        self.season = season
+        self.path = path if season is None else partitions.season_path(season, path)
+
+    def for_match(self, match_id: int) -> List[tuple]:
+        """(PlayerStat, player name) for every player recorded in the match."""
+        rows = db.query(f"""
+            SELECT {", ".join("s." + f.name for f in fields(PlayerStat))}, COALESCE(p.name, '?')
+            FROM player_match_stats s LEFT JOIN players p ON p.jersey = s.jersey
+            WHERE s.match_id = ? ORDER BY s.jersey
+        """, (match_id,), path=self.path)
+        if not rows and self.season is None:
+            season = partitions.season_of(match_id, self.path)
+            if season is not None:
+                return PlayerStatRepository(self.hot_path, season).for_match(match_id)
+        return [(PlayerStat(*row[:-1]), row[-1]) for row in rows]
+
+    def history(self, jersey: int) -> List[tuple]:
+        """(Match, PlayerStat) for every match the player has a line in, newest
+        first, from the hot database and then each archived season."""
+        seasons = [season for season, _ in partitions.archived_seasons(self.hot_path)]
+        sql = f"""
+            SELECT {", ".join("m." + f.name for f in fields(Match))},
+                   {", ".join("s." + f.name for f in fields(PlayerStat))}
+            FROM player_match_stats s JOIN matches m ON m.id = s.match_id
+            WHERE s.jersey = ? ORDER BY m.match_date DESC, m.id DESC
+        """
+        history, n = [], len(fields(Match))
+        for path in [self.hot_path] + [partitions.season_path(s, self.hot_path) for s in reversed(seasons)]:
+            for row in db.query(sql, (jersey,), path=path):
+                history.append((Match(*row[:n]), PlayerStat(*row[n:])))
+        return history
+
+    def record(self, stat: PlayerStat) -> None:
+        self.record_many([stat])
+
+    def record_many(self, stats: Iterable[PlayerStat]) -> int:
+        """Insert or overwrite each player's line for the match."""
+        stats = list(stats)
+        keys = [(s.match_id, s.jersey) for s in stats]
+        with db.transaction(self.path) as conn:
+            existing = _existing(conn, """
+                SELECT match_id, jersey FROM player_match_stats
+                WHERE (match_id, jersey) IN (SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]')
+                                             FROM json_each(?))
+            """, keys)
+            cursor = conn.executemany(f"""
+                INSERT INTO player_match_stats ({_columns(PlayerStat)}) VALUES ({_placeholders(7)})
+                ON CONFLICT (match_id, jersey) DO UPDATE SET
+                minutes=excluded.minutes, goals=excluded.goals, assists=excluded.assists,
+                yellow_cards=excluded.yellow_cards, red_cards=excluded.red_cards
+            """, [s.as_row() for s in stats])
+        change_bus.bus.publish([change_bus.Change("player_match_stats", key,
+                                                  UPDATE if key in existing else INSERT)
+                                for key in keys], self.path)
+        return cursor.rowcount
+
+    def delete(self, match_id: int, jersey: int) -> bool:
+        cursor = db.execute("DELETE FROM player_match_stats WHERE match_id = ? AND jersey = ?",
+                            (match_id, jersey), path=self.path)
+        if cursor.rowcount:
+            change_bus.publish("player_match_stats", DELETE, [(match_id, jersey)], self.path)
+        return cursor.rowcount > 0
+
+    def totals(self, jerseys: Iterable[int], season=player_stats.ALL) -> dict:
+        """Materialized totals, see player_stats.totals_for."""
+        return player_stats.totals_for(jerseys, season, self.path)
+
+    def by_season(self, jersey: int) -> List[dict]:
+        return player_stats.by_season(jersey, self.path)
+
+
+# ---------------- USERS ----------------
+class UserRepository:
+    def __init__(self, path=db.DB_NAME):
+        self.path = path
+
+    def authenticate(self, username: str, password: str) -> Optional[User]:
+        row = db.query_one("SELECT id, username FROM users WHERE username=? AND password=?",
+                           (username, password), path=self.path)
+        return User(*row) if row else None
+
+    def create(self, username: str, password: str) -> int:
+        """Raises sqlite3.IntegrityError if the username is taken."""
+        cursor = db.execute("INSERT INTO users (username, password) VALUES (?, ?)",
+                            (username, password), path=self.path)
+        return cursor.lastrowid
+
+    def create_many(self, credentials) -> int:
+        """credentials is an iterable of (username, password)."""
+        with db.transaction(self.path) as conn:
+            return conn.executemany("INSERT INTO users (username, password) VALUES (?, ?)",
+                                    list(credentials)).rowcount
+
+
+# Default instances on the app database
+players = PlayerRepository()
+teams = TeamRepository()
+matches = MatchRepository()
+player_match_stats = PlayerStatRepository()
+users = UserRepository()
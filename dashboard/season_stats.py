@@ -0,0 +1,191 @@
+import db
+
+# "*" in season or venue means "all of them", so the headline figures and
+# the per-season / per-venue breakdowns are each a single-row lookup.
+ALL = "*"
+
+SEASON_OF = "COALESCE(NULLIF(substr({row}.match_date, 1, 4), ''), '?')"
+VENUE_OF = "COALESCE({row}.venue, '')"
+# Fixtures not played yet have NULL scores and are left out of the summary
+PLAYED = "{row}.team_score IS NOT NULL AND {row}.opponent_score IS NOT NULL"
+# So are league matches between two of our teams (see fixtures): their
+# scores are home / away goals, not ours / theirs
+COUNTED = PLAYED + " AND {row}.home_team IS NULL"
+
+SUMMARY_SQL = """
+    CREATE TABLE IF NOT EXISTS match_summary (
+        season TEXT NOT NULL,
+        venue TEXT NOT NULL,
+        played INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        draws INTEGER NOT NULL DEFAULT 0,
+        losses INTEGER NOT NULL DEFAULT 0,
+        goals_for INTEGER NOT NULL DEFAULT 0,
+        goals_against INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (season, venue)
+    )
+"""
+
+
+# Upsert tail that adds the new row's figures to an existing summary row
+_ADD = """
+        ON CONFLICT (season, venue) DO UPDATE SET
+            played = played + excluded.played,
+            wins = wins + excluded.wins,
+            draws = draws + excluded.draws,
+            losses = losses + excluded.losses,
+            goals_for = goals_for + excluded.goals_for,
+            goals_against = goals_against + excluded.goals_against"""
+
+
+def _apply(row, sign, counted):
+    # Adds (sign=1) or removes (sign=-1) one match row at every grain:
+    # (season, venue), (season, *), (*, venue) and (*, *).
+    season, venue = SEASON_OF.format(row=row), VENUE_OF.format(row=row)
+    ours = f"COALESCE({row}.team_score, 0)"
+    theirs = f"COALESCE({row}.opponent_score, 0)"
+    return f"""
+        INSERT INTO match_summary
+            (season, venue, played, wins, draws, losses, goals_for, goals_against)
+        SELECT s, v, {sign}, {sign} * ({ours} > {theirs}), {sign} * ({ours} = {theirs}),
+               {sign} * ({ours} < {theirs}), {sign} * {ours}, {sign} * {theirs}
+        FROM (SELECT {season} AS s, {venue} AS v
+              UNION ALL SELECT {season}, '{ALL}'
+              UNION ALL SELECT '{ALL}', {venue}
+              UNION ALL SELECT '{ALL}', '{ALL}')
+        WHERE {counted.format(row=row)}{_ADD};
+    """
+
+
+def _triggers(counted):
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS match_summary_ai AFTER INSERT ON matches BEGIN
+            {_apply("new", 1, counted)}
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS match_summary_ad AFTER DELETE ON matches BEGIN
+            {_apply("old", -1, counted)}
+            DELETE FROM match_summary WHERE played = 0;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS match_summary_au
+        AFTER UPDATE OF match_date, venue, team_score, opponent_score, home_team ON matches BEGIN
+            {_apply("old", -1, counted)}
+            {_apply("new", 1, counted)}
+            DELETE FROM match_summary WHERE played = 0;
+        END
+        """,
+    )
+
+
+# ---------------- SETUP ----------------
+def create_stats_tables(conn):
+    # Run as a schema migration (see migrations.py). matches has no
+    # home_team yet at this point, so these count every played match;
+    # leave_out_league_matches replaces them later.
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'match_summary'").fetchone()
+    conn.execute(SUMMARY_SQL)
+    for trigger in _triggers(PLAYED):
+        conn.execute(trigger)
+    if not exists:
+        _rebuild(conn, PLAYED)
+
+
+def _recreate(conn, counted):
+    for name in ("match_summary_ai", "match_summary_ad", "match_summary_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    for trigger in _triggers(counted):
+        conn.execute(trigger)
+    _rebuild(conn, counted)
+
+
+def count_played_only(conn):
+    # Run as a schema migration: recreates the triggers from before PLAYED
+    # was checked and recounts
+    _recreate(conn, PLAYED)
+
+
+def leave_out_league_matches(conn):
+    # Run as a schema migration: league matches between our teams were
+    # counted as our results until COUNTED checked home_team
+    _recreate(conn, COUNTED)
+
+
+def rebuild_summary(path=db.DB_NAME):
+    """Recompute match_summary from scratch (e.g. after editing matches by hand).
+
+    The hot matches are regrouped and each archived season is read back from
+    its file, so seasons moved out by partitions.roll_over keep counting.
+    """
+    with db.transaction(path) as conn:
+        _rebuild(conn)
+
+
+def _grouped(source, counted=COUNTED):
+    # match_summary rows for every counted match in source, at every grain
+    source = f"(SELECT * FROM {source} p WHERE {counted.format(row='p')})"
+    season, venue = SEASON_OF.format(row="m"), VENUE_OF.format(row="m")
+    ours, theirs = "COALESCE(m.team_score, 0)", "COALESCE(m.opponent_score, 0)"
+    totals = f"""COUNT(*), SUM({ours} > {theirs}), SUM({ours} = {theirs}), SUM({ours} < {theirs}),
+                 SUM({ours}), SUM({theirs})"""
+    return f"""
+        SELECT {season}, {venue}, {totals} FROM {source} m GROUP BY 1, 2
+        UNION ALL SELECT {season}, '{ALL}', {totals} FROM {source} m GROUP BY 1
+        UNION ALL SELECT '{ALL}', {venue}, {totals} FROM {source} m GROUP BY 2
+        UNION ALL SELECT '{ALL}', '{ALL}', {totals} FROM {source} m HAVING COUNT(*) > 0
+    """
+
+
+def _rebuild(conn, counted=COUNTED):
+    import partitions   # imports this module
+    conn.execute("DELETE FROM match_summary")
+    conn.execute(f"INSERT INTO match_summary {_grouped('matches', counted)}")
+    for season in partitions.archived_on(conn):
+        add_matches(conn, partitions.load_archived(conn, season, "matches"), counted)
+
+
+def add_matches(conn, source, counted=COUNTED):
+    """Count the matches in source (a table or subquery) into match_summary.
+
+    For matches that leave the matches table but should still count, i.e.
+    seasons moved into an archive file (see partitions).
+    """
+    conn.execute(f"INSERT INTO match_summary SELECT * FROM ({_grouped(source, counted)}) "
+                 f"WHERE true{_ADD}")
+
+
+# ---------------- READING ----------------
+FIELDS = ("season", "venue", "played", "wins", "draws", "losses", "goals_for", "goals_against")
+
+
+def _as_dict(row):
+    stats = dict(zip(FIELDS, row))
+    stats["win_rate"] = stats["wins"] / stats["played"] * 100 if stats["played"] else 0.0
+    return stats
+
+
+def totals(season=ALL, venue=ALL, path=db.DB_NAME):
+    """Summary for one season/venue (ALL for either means every one)."""
+    row = db.query_one("SELECT * FROM match_summary WHERE season = ? AND venue = ?",
+                       (season, venue), path=path)
+    if row is None:
+        row = (season, venue, 0, 0, 0, 0, 0, 0)
+    return _as_dict(row)
+
+
+def by_season(venue=ALL, path=db.DB_NAME):
+    rows = db.query("""
+        SELECT * FROM match_summary WHERE venue = ? AND season != ? ORDER BY season
+    """, (venue, ALL), path=path)
+    return [_as_dict(r) for r in rows]
+
+
+def by_venue(season=ALL, path=db.DB_NAME):
+    rows = db.query("""
+        SELECT * FROM match_summary WHERE season = ? AND venue != ? ORDER BY venue
+    """, (season, ALL), path=path)
+    return [_as_dict(r) for r in rows]
@@ -1,9 +1,15 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-from player_page import open_player_page
-from team_page import team_management_page
-from match_page import open_match_management
+from bg_renderer import BackgroundRenderer
+from page_manager import PageManager
+from startup import lazy, prewarm
+
+# Page modules are imported on first use (or in the idle loop, see below)
+PAGE_MODULES = ["player_page", "team_page", "match_page"]
+open_player_page = lazy("player_page", "open_player_page")
+team_management_page = lazy("team_page", "team_management_page")
+open_match_management = lazy("match_page", "open_match_management")
+open_profiler_panel = lazy("profiler_panel", "open_profiler_panel")
 
 def open_dashboard(root):
     dashboard = tk.Toplevel(root)
@@ -11,22 +17,17 @@ def open_dashboard(root):
     dashboard.title("Soccer Management System")
     dashboard.configure(bg="#2C3E50")
 
-    bg_image_original = Image.open("football.png")
-
     bg_label = tk.Label(dashboard)
     bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-    # Global reference for background photo
-    dashboard.bg_photo = None
+    # Renderer keeps the reference to the current background photo
+    background = BackgroundRenderer(dashboard, "football.png",
+                                    lambda photo: bg_label.config(image=photo), min_size=2)
 
     def resize_background(event):
-        w, h = event.width, event.height
-        if w < 2 or h < 2:
-            return  # skip tiny initial size
-
-        resized = bg_image_original.resize((w, h))
-        dashboard.bg_photo = ImageTk.PhotoImage(resized)  # keep reference
-        bg_label.config(image=dashboard.bg_photo)
+        if event.widget is not dashboard:
+            return  # <Configure> on a Toplevel also fires for every child
+        background.request(event.width, event.height)
 
     dashboard.bind("<Configure>", resize_background)
 
@@ -39,8 +40,11 @@ def open_dashboard(root):
     title_label.pack(pady=40)
 
     # Navigation Functions
-    def navigate(func):
-        func(dashboard)  # Open sub-page without hiding dashboard
+    # Each page is built on its first visit, then hidden and re-shown
+    pages = PageManager(dashboard)
+
+    def navigate(name, func):
+        pages.open(name, func)  # Open sub-page without hiding dashboard
 
     def logout():
         if messagebox.askyesno("Logout", "Are you sure?"):
@@ -55,15 +59,21 @@ def open_dashboard(root):
 
     btn_player = tk.Button(dashboard, text="Player Management", width=25, height=2,
                            font=("Arial", 12), bg="#0B293D", fg="white",
-                           command=lambda: navigate(open_player_page))
+                           command=lambda: navigate("players", open_player_page))
     btn_player.pack(pady=20)
 
     btn_team = tk.Button(dashboard, text="Team Management", width=25, height=2,
                          font=("Arial", 12), bg="#0B293D", fg="white",
-                         command=lambda: navigate(lambda r: team_management_page(r)))
+                         command=lambda: navigate("teams", team_management_page))
     btn_team.pack(pady=20)
 
     btn_match = tk.Button(dashboard, text="Match Management", width=25, height=2,
                           font=("Arial", 12), bg="#0B293D", fg="white",
-                          command=lambda: navigate(open_match_management))
-    btn_match.pack(pady=20)
\ No newline at end of file
+                          command=lambda: navigate("matches", open_match_management))
+    btn_match.pack(pady=20)
+
+    # Hidden profiler panel (Ctrl+Shift+D), see profiler.py
+    dashboard.bind("<Control-D>", lambda e: open_profiler_panel(dashboard))
+
+    # Usually already done by first_page's prewarm; a no-op then
+    prewarm(dashboard, PAGE_MODULES)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import tkinter as tk
+
+from listing import View
+from validation import ValidationError
+
+# Filters apply after a pause in typing this long (or straight away on Enter)
+FILTER_DELAY_MS = 300
+ARROWS = {False: " ▲", True: " ▼"}
+
+
+# ---------------- SORT / FILTER BAR ----------------
+class SortFilterBar:
+    """Clickable headings plus a filter box per column, for a Treeview backed
+    by a listing.Listing.
+
+    Clicking a heading sorts by it ascending, then descending, then not at
+    all. on_change(view) is called with the new listing.View and the page
+    re-queries with it, so sorting and filtering happen in SQL rather than
+    by shuffling Treeview items. Pack bar.frame where the boxes should go.
+    """
+
+    def __init__(self, parent, tree, listing, on_change, bg="white"):
+        self.tree = tree
+        self.listing = listing
+        self.on_change = on_change
+        self.view = View()
+        self.entries = {}
+        self._job = None
+
+        self.frame = tk.Frame(parent, bg=bg)
+        tk.Label(self.frame, text="Filter:", bg=bg, font=("Arial", 9, "bold")).pack(side="left")
+        for col in tree["columns"]:
+            if not listing.sortable(col):
+                continue
+            tree.heading(col, command=lambda c=col: self.sort_by(c))
+            tk.Label(self.frame, text=col, bg=bg, font=("Arial", 9)).pack(side="left", padx=(8, 2))
+            entry = tk.Entry(self.frame, width=9, bd=1, relief="solid")
+            entry.pack(side="left")
+            entry.bind("<KeyRelease>", self._typed)
+            entry.bind("<Return>", lambda e: self.apply())
+            self.entries[col] = entry
+        tk.Button(self.frame, text="Clear", command=self.clear).pack(side="left", padx=8)
+        self.message = tk.Label(self.frame, text="", fg="#c0392b", bg=bg, font=("Arial", 9))
+        self.message.pack(side="left")
+
+    def sort_by(self, col):
+        if self.view.sort != col:
+            sort, descending = col, False
+        elif not self.view.descending:
+            sort, descending = col, True
+        else:
+            sort, descending = None, False
+        for name in self.entries:
+            arrow = ARROWS[descending] if name == sort else ""
+            self.tree.heading(name, text=name + arrow)
+        self.apply(sort, descending)
+
+    def apply(self, sort=None, descending=None):
+        if self._job is not None:
+            self.tree.after_cancel(self._job)
+            self._job = None
+        view = View(self.view.sort if descending is None else sort,
+                    self.view.descending if descending is None else descending,
+                    {col: entry.get() for col, entry in self.entries.items()})
+        try:
+            self.listing.query(view)  # reports bad filter text before anything is cleared
+        except ValidationError as e:
+            self.message.config(text=str(e))
+            return
+        self.message.config(text="")
+        self.view = view
+        self.on_change(view)
+
+    def clear(self):
+        for entry in self.entries.values():
+            entry.delete(0, tk.END)
+        self.apply()
+
+    def _typed(self, event):
+        if event.keysym == "Return":
+            return
+        if self._job is not None:
+            self.tree.after_cancel(self._job)
+        self._job = self.tree.after(FILTER_DELAY_MS, self.apply)
@@ -0,0 +1,79 @@
+import threading
+
+from repository import players as default_players
+
+# Below this many assigned players every squad is fetched up front in one query
+PREFETCH_LIMIT = 5000
+
+
+# ---------------- SQUAD CACHE ----------------
+class SquadCache:
+    """team name -> its players (jersey order), for the team page.
+
+    Squads are loaded lazily with load(), or all at once with prefetch().
+    Writers call invalidate() for the teams they touched, or
+    invalidate_players() when they only know which jerseys changed.
+    load and prefetch may run on a worker thread; a squad invalidated
+    while its query was running is not stored.
+    """
+
+    def __init__(self, players=default_players):
+        self.players = players
+        self._squads = {}
+        self._generation = {}    # team -> bumped on every invalidation
+        self._epoch = 0          # bumped by clear()
+        self._lock = threading.Lock()
+
+    def get(self, team):
+        """The cached squad, or None if it has to be loaded."""
+        with self._lock:
+            return self._squads.get(team)
+
+    def _token(self, team):
+        # Taken before a query; the result is only stored if it is still current
+        return self._epoch, self._generation.get(team, 0)
+
+    def _store(self, team, squad, token):
+        with self._lock:
+            if self._token(team) == token:
+                self._squads[team] = squad
+
+    def load(self, team):
+        with self._lock:
+            token = self._token(team)
+        squad = self.players.squad(team)
+        self._store(team, squad, token)
+        return squad
+
+    def prefetch(self, team_names):
+        """Fill every squad with one grouped query; False if there were too many players."""
+        with self._lock:
+            tokens = {team: self._token(team) for team in team_names}
+        squads = self.players.squads(limit=PREFETCH_LIMIT)
+        if squads is None:
+            return False
+        for team, token in tokens.items():
+            self._store(team, squads.get(team, []), token)
+        return True
+
+    def invalidate(self, *teams):
+        with self._lock:
+            for team in teams:
+                if team is None:
+                    continue
+                self._squads.pop(team, None)
+                self._generation[team] = self._generation.get(team, 0) + 1
+
+    def invalidate_players(self, jerseys):
+        """Drop the squads those jerseys were in and the ones they are in now."""
+        jerseys = set(jerseys)
+        with self._lock:
+            teams = {team for team, squad in self._squads.items()
+                     if any(p.jersey in jerseys for p in squad)}
+        teams.update(p.team_assigned for p in self.players.get_many(jerseys))
+        self.invalidate(*teams)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._squads.clear()
@@ -0,0 +1,209 @@
+import db
+import partitions
+from season_stats import SEASON_OF
+
+# League table per season, from the matches between two of our teams (see
+# fixtures: team_score is the home team's goals, opponent_score the away
+# team's). Three points for a win, one for a draw; level teams are split by
+# goal difference, then goals scored, then the same three over the matches
+# between just the teams still level (head-to-head), then share a position.
+#
+# Computing a table only reads the season's matches (a range on
+# idx_matches_date_venue) and the result is kept in the standings table,
+# so showing it again is a primary-key lookup. The triggers below throw a
+# season's rows away only when one of its league results changes: a score
+# updated, or a league match added or removed. An archived season's table
+# reads its archive file plus any matches added to the hot database for it
+# since; those invalidate it like any other.
+
+STANDINGS_SQL = """
+    CREATE TABLE IF NOT EXISTS standings (
+        season TEXT NOT NULL,
+        team TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        played INTEGER NOT NULL DEFAULT 0,
+        won INTEGER NOT NULL DEFAULT 0,
+        drawn INTEGER NOT NULL DEFAULT 0,
+        lost INTEGER NOT NULL DEFAULT 0,
+        goals_for INTEGER NOT NULL DEFAULT 0,
+        goals_against INTEGER NOT NULL DEFAULT 0,
+        goal_difference INTEGER NOT NULL DEFAULT 0,
+        points INTEGER NOT NULL DEFAULT 0,
+        form TEXT NOT NULL DEFAULT '',
+        PRIMARY KEY (season, team)
+    )
+"""
+
+LEAGUE = "{row}.home_team IS NOT NULL AND {row}.away_team IS NOT NULL"
+
+
+def _invalidate(row):
+    return f"DELETE FROM standings WHERE season = {SEASON_OF.format(row=row)};"
+
+
+TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS standings_au
+    AFTER UPDATE OF team_score, opponent_score ON matches
+    WHEN {LEAGUE.format(row="new")}
+         AND (old.team_score IS NOT new.team_score OR old.opponent_score IS NOT new.opponent_score)
+    BEGIN
+        {_invalidate("new")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS standings_ai AFTER INSERT ON matches
+    WHEN {LEAGUE.format(row="new")} BEGIN
+        {_invalidate("new")}
+    END
+    """,
+    # Matches moving into an archive (see partitions) are still in the table
+    f"""
+    CREATE TRIGGER IF NOT EXISTS standings_ad AFTER DELETE ON matches
+    WHEN {LEAGUE.format(row="old")}
+         AND NOT EXISTS (SELECT 1 FROM archived_matches WHERE id = old.id)
+    BEGIN
+        {_invalidate("old")}
+    END
+    """,
+)
+
+FORM_MATCHES = 5   # results shown in the form column, oldest first
+
+LEAGUE_FIELDS = "id, match_date, home_team, away_team, team_score, opponent_score"
+
+# :season and :prefix (season || '*') are bound; the table rows in order.
+# {source} is the matches to read.
+COMPUTE_TEMPLATE = f"""
+    WITH league AS (
+        SELECT {LEAGUE_FIELDS}
+        FROM {{source}} m WHERE m.match_date GLOB :prefix AND {LEAGUE.format(row="m")}
+    ),
+    members AS (
+        SELECT home_team AS team FROM league UNION SELECT away_team FROM league
+    ),
+    results AS (  -- each played match twice, once from either side
+        SELECT id, match_date, home_team AS team, away_team AS opponent,
+               team_score AS gf, opponent_score AS ga
+        FROM league WHERE team_score IS NOT NULL AND opponent_score IS NOT NULL
+        UNION ALL
+        SELECT id, match_date, away_team, home_team, opponent_score, team_score
+        FROM league WHERE team_score IS NOT NULL AND opponent_score IS NOT NULL
+    ),
+    scored AS (
+        SELECT *, CASE WHEN gf > ga THEN 3 WHEN gf = ga THEN 1 ELSE 0 END AS pts,
+               group_concat(CASE WHEN gf > ga THEN 'W' WHEN gf = ga THEN 'D' ELSE 'L' END, '')
+                   OVER (PARTITION BY team ORDER BY match_date, id
+                         ROWS {FORM_MATCHES - 1} PRECEDING) AS form,
+               row_number() OVER (PARTITION BY team ORDER BY match_date DESC, id DESC) AS latest
+        FROM results
+    ),
+    totals AS (
+        SELECT t.team, COUNT(s.id) AS played, COALESCE(SUM(s.pts = 3), 0) AS won,
+               COALESCE(SUM(s.pts = 1), 0) AS drawn, COALESCE(SUM(s.pts = 0), 0) AS lost,
+               COALESCE(SUM(s.gf), 0) AS gf, COALESCE(SUM(s.ga), 0) AS ga,
+               COALESCE(SUM(s.gf) - SUM(s.ga), 0) AS gd, COALESCE(SUM(s.pts), 0) AS points,
+               COALESCE(MAX(CASE WHEN s.latest = 1 THEN s.form END), '') AS form
+        FROM members t LEFT JOIN scored s ON s.team = t.team
+        GROUP BY t.team
+    ),
+    head_to_head AS (  -- only the matches between teams level on points, gd and gf
+        SELECT s.team, SUM(s.pts) AS points, SUM(s.gf - s.ga) AS gd, SUM(s.gf) AS gf
+        FROM scored s
+        JOIN totals a ON a.team = s.team
+        JOIN totals b ON b.team = s.opponent
+        WHERE a.points = b.points AND a.gd = b.gd AND a.gf = b.gf
+        GROUP BY s.team
+    )
+    SELECT :season, t.team,
+           rank() OVER (ORDER BY t.points DESC, t.gd DESC, t.gf DESC, COALESCE(h.points, 0) DESC,
+                        COALESCE(h.gd, 0) DESC, COALESCE(h.gf, 0) DESC) AS position,
+           t.played, t.won, t.drawn, t.lost, t.gf, t.ga, t.gd, t.points, t.form
+    FROM totals t LEFT JOIN head_to_head h ON h.team = t.team
+    ORDER BY position, t.team
+"""
+# Whether {source} has any league match in the season; if not, there is no
+# table and nothing to cache
+ANY_LEAGUE_TEMPLATE = f"""
+    SELECT EXISTS (SELECT 1 FROM {{source}} m
+                   WHERE m.match_date GLOB :prefix AND {LEAGUE.format(row="m")})
+"""
+HOT_SOURCE = "main.matches"
+# On the hot connection with the season's archive ATTACHed as "archive":
+# the archived matches, and the hot ones not (yet) in the archive
+ARCHIVED_SOURCE = f"""(
+        SELECT {LEAGUE_FIELDS} FROM archive.matches
+        UNION ALL
+        SELECT {LEAGUE_FIELDS} FROM main.matches WHERE id NOT IN (SELECT id FROM archive.matches))"""
+COMPUTE_SQL = COMPUTE_TEMPLATE.format(source=HOT_SOURCE)
+ARCHIVED_COMPUTE_SQL = COMPUTE_TEMPLATE.format(source=ARCHIVED_SOURCE)
+
+
+# ---------------- SETUP ----------------
+def create_standings(conn):
+    # Run as a schema migration (see migrations.py)
+    conn.execute(STANDINGS_SQL)
+    for trigger in TRIGGERS_SQL:
+        conn.execute(trigger)
+
+
+# ---------------- READING ----------------
+FIELDS = ("season", "team", "position", "played", "won", "drawn", "lost",
+          "goals_for", "goals_against", "goal_difference", "points", "form")
+
+
+def _cached(season, path):
+    return db.query(f"SELECT {', '.join(FIELDS)} FROM standings WHERE season = ? "
+                    "ORDER BY position, team", (season,), path=path)
+
+
+def table(season, path=db.DB_NAME):
+    """The league table for season (e.g. "2026"), top first, as dicts.
+
+    Read from the cache, or computed and cached if a result has changed
+    since it was last read. A season without league matches is empty, and
+    finding that out writes nothing.
+    Computing writes the cache, so path must be the writable hot database,
+    not a db.read_only one.
+    """
+    season = str(season)
+    rows = _cached(season, path) or _compute(season, path)
+    return [dict(zip(FIELDS, row)) for row in rows]
+
+
+def _compute(season, path):
+    params = {"season": season, "prefix": season + "*"}
+    archived = season in dict(partitions.archived_seasons(path))
+    source, compute = ((ARCHIVED_SOURCE, ARCHIVED_COMPUTE_SQL) if archived
+                       else (HOT_SOURCE, COMPUTE_SQL))
+    with db.connection(path) as conn:
+        if archived:
+            # Before the transaction: SQLite cannot ATTACH inside one
+            conn.execute("ATTACH DATABASE ? AS archive",
+                         (db.read_only(partitions.archive_file(season, path)),))
+        try:
+            if not conn.execute(ANY_LEAGUE_TEMPLATE.format(source=source), params).fetchone()[0]:
+                return []
+            # Computed inside the write transaction, so a score saved meanwhile
+            # either lands before it (and is counted) or invalidates it afterwards
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM standings WHERE season = ?", (season,))
+                conn.execute(f"INSERT INTO standings ({', '.join(FIELDS)}) {compute}", params)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            if archived:
+                conn.execute("DETACH DATABASE archive")
+    return _cached(season, path)
+
+
+def invalidate(season=None, path=db.DB_NAME):
+    """Drop the cached table for season, or every season (e.g. after editing
+    matches by hand)."""
+    if season is None:
+        db.execute("DELETE FROM standings", path=path)
+    else:
+        db.execute("DELETE FROM standings WHERE season = ?", (str(season),), path=path)
@@ -0,0 +1,55 @@
+import sqlite3
+import tkinter as tk
+from datetime import date
+from tkinter import messagebox, ttk
+from page_manager import ChangeFollower
+from repository import matches
+
+COLUMNS = (("Pos", "position", 50), ("Team", "team", 200), ("P", "played", 50), ("W", "won", 50),
+           ("D", "drawn", 50), ("L", "lost", 50), ("GF", "goals_for", 50), ("GA", "goals_against", 50),
+           ("GD", "goal_difference", 50), ("Pts", "points", 60), ("Form", "form", 90))
+
+
+# League table for one season (see standings). Reading it again is a cached
+# lookup until a league score changes, so it reloads on every match write.
+def open_league_table(parent):
+    window = tk.Toplevel(parent)
+    window.title("League Table")
+    window.geometry("820x560")
+    window.transient(parent)
+
+    top = tk.Frame(window)
+    top.pack(fill="x", padx=15, pady=10)
+    tk.Label(top, text="Season:").pack(side="left")
+    current = str(date.today().year)
+    seasons = matches.league_seasons()
+    season_box = ttk.Combobox(top, state="readonly", width=10,
+                              values=([current] if current not in seasons else []) + seasons)
+    season_box.set(current)
+    season_box.pack(side="left", padx=5)
+    season_box.bind("<<ComboboxSelected>>", lambda e: load_table())
+    tk.Button(top, text="Refresh", command=lambda: load_table()).pack(side="left", padx=10)
+
+    # ---------------- Table ----------------
+    table = ttk.Treeview(window, columns=[c[0] for c in COLUMNS], show="headings")
+    for heading, _, width in COLUMNS:
+        table.heading(heading, text=heading)
+        table.column(heading, width=width, anchor="w" if heading == "Team" else "center")
+    table.pack(fill="both", expand=True, padx=15, pady=(0, 10))
+    empty_label = tk.Label(window, text="", fg="#7f8c8d")
+    empty_label.pack(pady=(0, 10))
+
+    def load_table():
+        table.delete(*table.get_children())
+        try:
+            rows = matches.standings(season_box.get())
+        except sqlite3.Error as e:
+            messagebox.showerror("Error", f"Could not load the table: {e}", parent=window)
+            return
+        for row in rows:
+            table.insert("", tk.END, values=[row[key] for _, key, _ in COLUMNS])
+        empty_label.config(text="" if rows else "No league matches in this season - "
+                                                 "use Generate Fixtures to make some")
+
+    ChangeFollower(window, lambda changes: load_table(), entities={"matches"})
+    load_table()
@@ -0,0 +1,74 @@
+"""Startup timing and lazy page loading.
+
+first_page imports this before anything else, so STARTED is as close to
+process start as the app can get. Set SOCCER_STARTUP_REPORT=1 to print the
+timings once the first frame is up (and the idle prewarm has finished), or
+set it to a file name to append them there as one JSON line per launch.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+
+STARTED = time.perf_counter()
+REPORT_ENV = "SOCCER_STARTUP_REPORT"
+
+marks = []   # (label, ms since STARTED)
+
+
+def mark(label):
+    marks.append((label, round((time.perf_counter() - STARTED) * 1000, 1)))
+
+
+# ---------------- LAZY PAGES ----------------
+def lazy(module, function):
+    """A stand-in for module.function that imports module on first call."""
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module), function)(*args, **kwargs)
+    call.__name__ = function
+    return call
+
+
+def prewarm(widget, modules, done=None):
+    """Import modules one per idle slot, so the UI stays responsive meanwhile."""
+    pending = [m for m in modules if m not in sys.modules]
+
+    def step():
+        if not widget.winfo_exists():
+            return
+        if not pending:
+            if done:
+                done()
+            return
+        module = pending.pop(0)
+        try:
+            importlib.import_module(module)
+            mark(f"prewarmed {module}")
+        except ImportError as e:
+            mark(f"prewarm failed {module}: {e}")
+        widget.after_idle(lambda: widget.after(1, step))
+
+    widget.after_idle(step)
+
+
+# ---------------- FIRST FRAME ----------------
+def after_first_frame(root, callback):
+    # Tk draws from idle handlers queued when the window is mapped; an idle
+    # handler added by another idle handler runs only after that pass, i.e.
+    # once the first frame is on screen.
+    root.after_idle(lambda: root.after_idle(callback))
+
+
+def report():
+    target = os.environ.get(REPORT_ENV)
+    if not target:
+        return
+    if target == "1":
+        print("Startup timings (ms since launch):")
+        for label, ms in marks:
+            print(f"  {ms:>8.1f}  {label}")
+        return
+    with open(target, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"launched": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                            "marks": dict(marks)}) + "\n")
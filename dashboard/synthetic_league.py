@@ -0,0 +1,146 @@
+"""Deterministic synthetic league data for benchmarks and load tests.
+
+    python synthetic_league.py bench.db --teams 40 --players 100000 --matches 50000
+
+Writes a soccer.db-compatible file (same migrations as the app) filled with
+teams, players, matches, player stat lines and users. The same seed always produces the same
+database, so timings from different runs are comparable.
+"""
+import argparse
+import os
+import random
+import time
+from itertools import islice
+
+import db
+import migrations
+from validation import FORMATIONS
+
+CHUNK_SIZE = 10000
+LINES_PER_MATCH = 14   # starting eleven plus substitutes
+REGULARS = 500         # stat lines go to the first REGULARS jerseys only
+
+FIRST_NAMES = ["Marco", "Luis", "Leo", "Rob", "Kylian", "Mohamed", "Harry", "Kevin", "Erling",
+               "Son", "Pedro", "Bruno", "Virgil", "Jude", "Phil", "Ankit", "Pratik", "Insha",
+               "Ronish", "Sergio", "Andres", "Xavi", "Thiago", "Luka", "Toni", "Karim", "Sadio"]
+LAST_NAMES = ["Silva", "Rossi", "Muller", "Kane", "Salah", "Bruyne", "Haaland", "Fernandes",
+              "Dijk", "Bellingham", "Foden", "Garcia", "Lopez", "Martin", "Schmidt", "Novak",
+              "Thapa", "Shrestha", "Gurung", "Rai", "Modric", "Kroos", "Benzema", "Mane"]
+POSITIONS = ["Goalkeeper", "Defender", "Midfielder", "Winger", "Striker"]
+FITNESS = ["good", "average", "poor"]
+INJURIES = ["", "", "", "", "hamstring strain", "ankle sprain", "knee ligament", "concussion"]
+SUSPENSIONS = ["", "", "", "", "", "yellow card accumulation", "red card"]
+VENUES = ["Home", "Away", "Neutral"]
+CITIES = ["Kathmandu", "Pokhara", "Lalitpur", "Bhaktapur", "Biratnagar", "Dharan", "Butwal",
+          "Chitwan", "Hetauda", "Janakpur", "Birgunj", "Nepalgunj"]
+
+
+# ---------------- ROW GENERATORS ----------------
+def team_names(count):
+    return [f"{CITIES[i % len(CITIES)]} FC {i // len(CITIES) + 1}" for i in range(count)]
+
+
+def teams(rng, names):
+    for name in names:
+        yield (name, f"Coach {rng.choice(LAST_NAMES)}", f"{rng.randint(4, 20)} staff",
+               rng.choice(FORMATIONS))
+
+
+def players(rng, count, names):
+    for jersey in range(1, count + 1):
+        team = rng.choice(names) if names and rng.random() < 0.9 else None
+        yield (jersey, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               rng.randint(16, 38), rng.choice(POSITIONS), rng.choice(FITNESS),
+               rng.randint(0, 40), rng.choice(INJURIES), rng.choice(SUSPENSIONS), team)
+
+
+def matches(rng, count, names, first_season=2000, seasons=25):
+    opponents = names or ["Opponent"]
+    for _ in range(count):
+        season = first_season + rng.randrange(seasons)
+        yield (rng.choice(opponents),
+               f"{season}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+               rng.choice(VENUES), rng.randint(0, 5), rng.randint(0, 5))
+
+
+def stat_lines(rng, path, player_count):
+    # A generator, so the match ids are read once the matches are written.
+    # Lines go to the first REGULARS jerseys only, so each of those players
+    # has a long history (the player_history benchmark reads jersey 1's).
+    regulars = range(1, min(player_count, REGULARS) + 1)
+    lineup = min(LINES_PER_MATCH, len(regulars))
+    for (match_id,) in db.query("SELECT id FROM matches ORDER BY id", path=path):
+        for jersey in rng.sample(regulars, lineup):
+            yield (match_id, jersey, rng.choice((90, 90, 90, rng.randint(1, 89))),
+                   rng.choice((0, 0, 0, 0, 0, 1, 1, 2)), rng.choice((0, 0, 0, 0, 1, 1, 2)),
+                   rng.choice((0, 0, 0, 0, 0, 1, 1, 2)), int(rng.random() < 0.02))
+
+
+def users(count):
+    yield ("admin", "admin")
+    for i in range(1, count):
+        yield (f"user{i}", f"password{i}")
+
+
+# ---------------- WRITING ----------------
+def _insert(path, sql, rows):
+    rows = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return total
+        with db.transaction(path) as conn:
+            conn.executemany(sql, chunk)
+        total += len(chunk)
+
+
+def generate(path, team_count=40, player_count=50000, match_count=20000, user_count=50,
+             seed=1, overwrite=True, verbose=False):
+    """Create (or replace) a league database at path; returns row counts."""
+    if overwrite:
+        db.get_pool(path).close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    migrations.migrate(path)
+
+    rng = random.Random(seed)
+    names = team_names(team_count)
+    counts = {}
+    for label, sql, rows in (
+        ("teams", "INSERT INTO teams VALUES (?, ?, ?, ?)", teams(rng, names)),
+        ("players", """INSERT INTO players (jersey, name, age, position, fitness, goals,
+                       injury, suspension, team_assigned) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+         players(rng, player_count, names)),
+        ("matches", """INSERT INTO matches (opponent, match_date, venue, team_score,
+                       opponent_score) VALUES (?, ?, ?, ?, ?)""", matches(rng, match_count, names)),
+        ("player_stats", """INSERT INTO player_match_stats (match_id, jersey, minutes, goals, assists,
+                            yellow_cards, red_cards) VALUES (?, ?, ?, ?, ?, ?, ?)""",
+         stat_lines(rng, path, player_count)),
+        ("users", "INSERT INTO users (username, password) VALUES (?, ?)", users(user_count)),
+    ):
+        started = time.perf_counter()
+        counts[label] = _insert(path, sql, rows)
+        if verbose:
+            print(f"  {label}: {counts[label]} rows in {time.perf_counter() - started:.1f}s")
+    db.query_one("PRAGMA optimize", path=path)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic league database")
+    parser.add_argument("path")
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--players", type=int, default=50000)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"Generating {args.path} (seed {args.seed})")
+    generate(args.path, args.teams, args.players, args.matches, args.users, args.seed, verbose=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import queue
+import threading
+import time
+
+CHUNK_SIZE = 500        # rows per fetchmany after the first screenful
+FIRST_CHUNK = 60        # about one screenful, so it shows straight away
+QUEUE_CHUNKS = 8        # chunks buffered ahead of the UI before the reader waits
+FRAME_BUDGET_MS = 12    # insert for at most this long per main-loop turn
+
+_DONE = object()
+
+
+# ---------------- STREAMING TABLE LOADER ----------------
+class TableStream:
+    """Fills a Treeview from a chunked reader without blocking the main loop.
+
+    start(produce, add_row) runs produce(first_chunk, chunk_size) on a reader
+    thread; it must yield lists of rows (e.g. db.stream). Rows are handed to
+    add_row(row) on the main loop a few hundred at a time via after(), and
+    status(text) is told how far along it is. Starting again, cancel(), or
+    destroying the tree stops the previous load.
+    """
+
+    def __init__(self, tree, status=None):
+        self.tree = tree
+        self.status = status or (lambda text: None)
+        self.loaded = 0
+        self.total = None
+        self._stop = None
+        self._job = None
+        tree.bind("<Destroy>", lambda e: self.cancel(), add="+")
+
+    def start(self, produce, add_row, total=None, on_done=None):
+        self.cancel()
+        stop = self._stop = threading.Event()
+        chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self.loaded = 0
+        self.total = total
+
+        def offer(item):
+            # Waits while the UI is behind, but gives up once cancelled
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def read():
+            rows = produce(FIRST_CHUNK, CHUNK_SIZE)
+            try:
+                for chunk in rows:
+                    if not offer(chunk):
+                        return
+                offer(_DONE)
+            except Exception as e:
+                offer(e)
+            finally:
+                if hasattr(rows, "close"):
+                    rows.close()   # hands the pooled connection back
+
+        threading.Thread(target=read, daemon=True).start()
+        self._drain(stop, chunks, add_row, on_done)
+
+    def _drain(self, stop, chunks, add_row, on_done):
+        self._job = None
+        if stop.is_set():
+            return
+        deadline = _now_ms() + FRAME_BUDGET_MS
+        while _now_ms() < deadline:
+            try:
+                chunk = chunks.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is _DONE:
+                self._finish(stop)
+                if on_done:
+                    on_done()
+                return
+            if isinstance(chunk, Exception):
+                self._finish(stop)
+                self.status(f"Load failed: {chunk}")
+                return
+            for row in chunk:
+                add_row(row)
+            self.loaded += len(chunk)
+        self._show_progress()
+        self._job = self.tree.after(5, lambda: self._drain(stop, chunks, add_row, on_done))
+
+    def _show_progress(self):
+        if self.total:
+            self.status(f"Loading... {self.loaded:,} of {self.total:,}")
+        else:
+            self.status(f"Loading... {self.loaded:,}")
+
+    def _finish(self, stop):
+        stop.set()
+        self._stop = None
+        self.status("")
+
+    def cancel(self):
+        if self._stop is not None:
+            self._stop.set()   # the reader notices within 0.1 s and lets its connection go
+            self._stop = None
+        if self._job is not None:
+            try:
+                self.tree.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    @property
+    def running(self):
+        return self._stop is not None
+
+
+def _now_ms():
+    return time.perf_counter() * 1000
@@ -1,36 +1,18 @@
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import messagebox, ttk
-import sqlite3
-
-DB_NAME = "soccer.db"
-
-# DATABASE 
-def setup_team_db():
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS teams (
-                team_name TEXT PRIMARY KEY,
-                coach TEXT,
-                staff_info TEXT,
-                formation TEXT
-            )
-        """)
-        try:
-            cursor.execute("ALTER TABLE players ADD COLUMN team_assigned TEXT")
-        except sqlite3.OperationalError:
-            pass
-        conn.commit()
-    except Exception as e:
-        print(f"Database Setup Error: {e}")
-    finally:
-        conn.close()
+from repository import SQUAD_LISTING, Team, players, teams
+from page_manager import Page
+from query_executor import cancel_background, run_in_background
+from squad_cache import SquadCache
+from sort_filter import SortFilterBar
+from validation import FORMATIONS, ValidationError, jersey_list, team_row
+from profiler import ui_timed
+
+FREE_AGENTS = "(Free agents)"
 
 # UI
 def team_management_page(dashboard_root=None):
-    setup_team_db()
-    
     # if dashboard exists
     root = tk.Toplevel(dashboard_root)
     root.title("Soccer Pro - Team Management")
@@ -38,7 +20,7 @@ def team_management_page(dashboard_root=None):
     root.configure(bg="#f4f7f6")
     
     def go_back():
-        root.destroy()
+        page.hide()
 
     root.protocol("WM_DELETE_WINDOW", go_back)
 
@@ -57,90 +39,156 @@ def team_management_page(dashboard_root=None):
     main_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
     # DATABASE LOGIC FUNCTIONS
-    
+
+    # Squads are cached per team, so flicking through the list is a dict
+    # lookup; every write below invalidates exactly the squads it touched.
+    squads = SquadCache(players)
+
+    @ui_timed
     def refresh_teams_list():
         team_listbox.delete(0, tk.END)
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT team_name FROM teams")
-        for row in cursor.fetchall():
-            team_listbox.insert(tk.END, row[0])
-        conn.close()
+        names = teams.names()
+        for name in names:
+            team_listbox.insert(tk.END, name)
+        move_combo["values"] = [FREE_AGENTS] + names
 
+    @ui_timed
     def load_squad(selected_team):
         for row in squad_table.get_children():
             squad_table.delete(row)
             
         if not selected_team:
+            cancel_background(squad_table)
             return
 
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("SELECT jersey, name, position FROM players WHERE team_assigned = ?", (selected_team,))
-        for p in cursor.fetchall():
-            squad_table.insert("", tk.END, values=p)
-        conn.close()
+        @ui_timed
+        def show_squad(rows):
+            squad_table.delete(*squad_table.get_children())  # rows patched in while loading
+            for p in rows:
+                squad_table.insert("", tk.END, iid=str(p.jersey), values=(p.jersey, p.name, p.position))
+
+        view = squad_filters.view
+        if not view.is_default:
+            # Sorted / filtered in SQL; the cache only holds plain jersey order
+            run_in_background(squad_table, squad_table,
+                              lambda: players.squad(selected_team, view), show_squad)
+            return
+
+        cached = squads.get(selected_team)
+        if cached is not None:
+            cancel_background(squad_table)
+            show_squad(cached)
+            return
+
+        # Clicking through teams quickly supersedes the previous team's query
+        run_in_background(squad_table, squad_table, lambda: squads.load(selected_team), show_squad)
 
     def save_team():
-        name = team_entries["Team Name"].get().strip()
-        if not name:
-            messagebox.showwarning("Input Error", "Team Name is required!")
+        try:
+            row = team_row({"team_name": team_entries["Team Name"].get(),
+                            "coach": team_entries["Head Coach"].get(),
+                            "staff_info": team_entries["Staff Details"].get(),
+                            "formation": formation_combo.get()})
+        except ValidationError as e:
+            messagebox.showwarning("Input Error", str(e))
             return
-        
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("INSERT OR REPLACE INTO teams VALUES (?, ?, ?, ?)",
-                       (name, team_entries["Head Coach"].get(),
-                        team_entries["Staff Details"].get(), formation_combo.get()))
-        conn.commit()
-        conn.close()
+        name = row[0]
+
+        teams.save(Team(*row))  # the list refreshes through apply_changes
         messagebox.showinfo("Success", f"Team '{name}' configured successfully.")
-        refresh_teams_list()
 
-    def assign_to_team():
+    def selected_team_name():
         selection = team_listbox.curselection()
-        if not selection:
+        return team_listbox.get(selection[0]) if selection else None
+
+    # ---------------- BATCH MOVES ----------------
+    # Every move below is one executemany transaction and one summary
+    # message; the squad view is patched by apply_changes.
+    def move_players(jerseys, target):
+        found = players.get_many(jerseys)
+        moving = [p for p in found if p.team_assigned != target]
+        if moving:
+            players.assign_many([p.jersey for p in moving], target)
+        missing = sorted(set(jerseys) - {p.jersey for p in found})
+        return len(moving), len(found) - len(moving), missing
+
+    def move_summary(moved, unchanged, missing, target):
+        destination = target or "free agency"
+        lines = [f"{moved} player(s) moved to {destination}."]
+        if unchanged:
+            lines.append(f"{unchanged} already there.")
+        if missing:
+            shown = ", ".join(str(j) for j in missing[:20])
+            more = f" and {len(missing) - 20} more" if len(missing) > 20 else ""
+            lines.append(f"Not found: {shown}{more}")
+        return "\n".join(lines)
+
+    def selected_jerseys():
+        return [int(squad_table.item(item, 'values')[0]) for item in squad_table.selection()]
+
+    def assign_to_team():
+        selected_team = selected_team_name()
+        if not selected_team:
             messagebox.showwarning("Selection Error", "Please select a team from the list first!")
             return
-            
-        selected_team = team_listbox.get(selection[0])
-        jersey = assign_entry.get().strip()
-        
-        if not jersey:
-            messagebox.showwarning("Input Error", "Enter a Player Jersey #")
+
+        try:
+            jerseys = jersey_list(assign_entry.get())
+        except ValidationError as e:
+            messagebox.showwarning("Input Error", str(e))
             return
 
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE players SET team_assigned = ? WHERE jersey = ?", (selected_team, jersey))
-        
-        if cursor.rowcount == 0:
-            messagebox.showerror("Error", f"Player #{jersey} not found in database.")
-        else:
-            conn.commit()
-            messagebox.showinfo("Success", f"Player #{jersey} joined {selected_team}")
-            load_squad(selected_team)
+        moved, unchanged, missing = move_players(jerseys, selected_team)
+        summary = move_summary(moved, unchanged, missing, selected_team)
+        if moved:
             assign_entry.delete(0, tk.END)
-        conn.close()
+        if missing and not moved:
+            messagebox.showerror("Error", summary)
+        else:
+            messagebox.showinfo("Success", summary)
 
     def remove_player_from_team():
-        selected_item = squad_table.focus()
-        if not selected_item:
-            messagebox.showwarning("Selection", "Click on a player in the squad list to remove them.")
+        jerseys = selected_jerseys()
+        if not jerseys:
+            messagebox.showwarning("Selection", "Click on players in the squad list to remove them.")
             return
 
-        values = squad_table.item(selected_item, 'values')
-        jersey_val, name_val = values[0], values[1]
+        who = squad_table.item(squad_table.selection()[0], 'values')[1] if len(jerseys) == 1 \
+            else f"{len(jerseys)} players"
+        if messagebox.askyesno("Confirm", f"Remove {who} from the team?"):
+            players.assign_many(jerseys, None)
+            messagebox.showinfo("Success", f"{who} removed from squad.")
 
-        if messagebox.askyesno("Confirm", f"Remove {name_val} from the team?"):
-            conn = sqlite3.connect(DB_NAME)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE players SET team_assigned = NULL WHERE jersey = ?", (jersey_val,))
-            conn.commit()
-            conn.close()
-            
-            squad_table.delete(selected_item)
-            messagebox.showinfo("Success", f"{name_val} removed from squad.")
+    def move_target():
+        target = move_combo.get()
+        if not target:
+            messagebox.showwarning("Selection Error", "Choose a team to move the players to.")
+            return False
+        return None if target == FREE_AGENTS else target
+
+    def move_selected_players():
+        jerseys = selected_jerseys()
+        if not jerseys:
+            messagebox.showwarning("Selection", "Select players in the squad list first (Ctrl/Shift-click for several).")
+            return
+        target = move_target()
+        if target is False:
+            return
+        moved, unchanged, missing = move_players(jerseys, target)
+        messagebox.showinfo("Success", move_summary(moved, unchanged, missing, target))
+
+    def move_entire_squad():
+        source = selected_team_name()
+        if not source:
+            messagebox.showwarning("Selection Error", "Please select a team from the list first!")
+            return
+        target = move_target()
+        if target is False or target == source:
+            return
+        if not messagebox.askyesno("Confirm", f"Move the whole {source} squad to {target or 'free agency'}?"):
+            return
+        moved = players.move_squad(source, target)
+        messagebox.showinfo("Success", f"{moved} player(s) moved from {source} to {target or 'free agency'}.")
 
     def on_team_select(event):
         selection = team_listbox.curselection()
@@ -158,16 +206,8 @@ def team_management_page(dashboard_root=None):
         
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{team_name}'?\n\nPlayers will become Free Agents."):
             try:
-                conn = sqlite3.connect(DB_NAME)
-                cursor = conn.cursor()
-                cursor.execute("UPDATE players SET team_assigned = NULL WHERE team_assigned = ?", (team_name,))
-                cursor.execute("DELETE FROM teams WHERE team_name = ?", (team_name,))
-                conn.commit()
-                conn.close()
+                teams.delete(team_name)
                 messagebox.showinfo("Deleted", f"Team '{team_name}' has been removed.")
-                refresh_teams_list() 
-                for row in squad_table.get_children():
-                    squad_table.delete(row)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete team: {e}")
 
@@ -184,7 +224,7 @@ def team_management_page(dashboard_root=None):
         team_entries[label] = ent
 
     tk.Label(left_frame, text="Tactical Formation", bg="white").pack(anchor="w", pady=(5, 0))
-    formation_combo = ttk.Combobox(left_frame, values=["4-4-2", "4-3-3", "3-5-2", "4-2-3-1", "5-4-1"], state="readonly")
+    formation_combo = ttk.Combobox(left_frame, values=FORMATIONS, state="readonly")
     formation_combo.pack(fill="x", pady=5)
     formation_combo.set("4-4-2")
 
@@ -195,11 +235,12 @@ def team_management_page(dashboard_root=None):
     right_frame.grid(row=0, column=1, sticky="nsew", padx=10)
 
     tk.Label(right_frame, text="Select a Team:", bg="white", font=("Arial", 9, "bold")).pack(anchor="w")
-    team_listbox = tk.Listbox(right_frame, height=6, font=("Arial", 10), bd=1, relief="solid")
+    team_listbox = tk.Listbox(right_frame, height=6, font=("Arial", 10), bd=1, relief="solid",
+                          exportselection=False)  # keeps the team selected while typing in the boxes
     team_listbox.pack(fill="x", pady=5)
     team_listbox.bind("<<ListboxSelect>>", on_team_select)
 
-    tk.Label(right_frame, text="Assign Jersey # to Team:", bg="white", font=("Arial", 9, "bold")).pack(anchor="w", pady=(10, 0))
+    tk.Label(right_frame, text="Assign Jersey #s to Team (e.g. 4, 7, 10-23):", bg="white", font=("Arial", 9, "bold")).pack(anchor="w", pady=(10, 0))
     assign_entry = tk.Entry(right_frame, font=("Arial", 11), bd=1, relief="solid")
     assign_entry.pack(fill="x", pady=5)
 
@@ -214,22 +255,81 @@ def team_management_page(dashboard_root=None):
     squad_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", pady=15)
 
     cols = ("Jersey", "Name", "Position")
-    squad_table = ttk.Treeview(squad_frame, columns=cols, show="headings", height=8)
+    squad_table = ttk.Treeview(squad_frame, columns=cols, show="headings", height=8, selectmode="extended")
     for col in cols:
         squad_table.heading(col, text=col)
         squad_table.column(col, width=150, anchor="center")
 
+    squad_filters = SortFilterBar(squad_frame, squad_table, SQUAD_LISTING,
+                                  lambda view: load_squad(selected_team_name()))
+    squad_filters.frame.pack(side="top", fill="x", pady=(0, 8))
+
     scrolly = ttk.Scrollbar(squad_frame, orient="vertical", command=squad_table.yview)
     squad_table.configure(yscroll=scrolly.set)
     squad_table.pack(side="left", fill="both", expand=True)
     scrolly.pack(side="right", fill="y")
 
-    remove_btn = tk.Button(squad_frame, text="Remove Selected Player from Team", bg="#c0392b", fg="white",
+    remove_btn = tk.Button(squad_frame, text="Remove Selected Players from Team", bg="#c0392b", fg="white",
                            font=("Arial", 10, "bold"), command=remove_player_from_team)
     remove_btn.pack(side="bottom", fill="x", pady=(10, 0))
 
+    move_frame = tk.Frame(squad_frame, bg="white")
+    move_frame.pack(side="bottom", fill="x", pady=(10, 0))
+    tk.Label(move_frame, text="Move to:", bg="white", font=("Arial", 9, "bold")).pack(side="left")
+    move_combo = ttk.Combobox(move_frame, state="readonly", width=25)
+    move_combo.pack(side="left", padx=5)
+    tk.Button(move_frame, text="Move Selected Players", bg="#2980B9", fg="white",
+              font=("Arial", 10, "bold"), command=move_selected_players).pack(side="left", padx=5)
+    tk.Button(move_frame, text="Move Entire Squad", bg="#8E44AD", fg="white",
+              font=("Arial", 10, "bold"), command=move_entire_squad).pack(side="left", padx=5)
+
     main_frame.columnconfigure(0, weight=1)
     main_frame.columnconfigure(1, weight=1)
     main_frame.rowconfigure(1, weight=1)
 
+    def patch_squad(team, jerseys):
+        # Just the rows for jerseys: deleted, left the team, joined it or edited
+        current = {p.jersey: p for p in players.get_many(jerseys)}
+        for jersey in sorted(jerseys):
+            iid, p = str(jersey), current.get(jersey)
+            if p is None or p.team_assigned != team:
+                if squad_table.exists(iid):
+                    squad_table.delete(iid)
+            elif squad_table.exists(iid):
+                squad_table.item(iid, values=(p.jersey, p.name, p.position))
+            else:
+                shown = [int(i) for i in squad_table.get_children()]
+                squad_table.insert("", bisect_left(shown, jersey), iid=iid,
+                                   values=(p.jersey, p.name, p.position))
+
+    # Teams or squads changed by any window (see page_manager.ChangeFollower),
+    # or elsewhere while the page was hidden
+    def apply_changes(changes):
+        selection = team_listbox.curselection()
+        selected_team = team_listbox.get(selection[0]) if selection else None
+        if changes is None:
+            squads.clear()
+        else:
+            squads.invalidate(*changes["teams"])
+            if changes["players"]:
+                squads.invalidate_players(int(j) for j in changes["players"])
+        if changes is None or changes["teams"]:
+            refresh_teams_list()
+            names = team_listbox.get(0, tk.END)
+            if selected_team in names:
+                team_listbox.selection_set(names.index(selected_team))
+            else:
+                selected_team = None
+                load_squad(None)
+        if not selected_team:
+            return
+        if changes is None or not squad_filters.view.is_default:
+            load_squad(selected_team)  # sorted / filtered views can reorder
+        elif changes["players"]:
+            patch_squad(selected_team, {int(j) for j in changes["players"]})
+
     refresh_teams_list()
+    # All squads in one grouped query, unless the league is too big for that
+    run_in_background(team_listbox, squads, lambda: squads.prefetch(teams.names()), lambda ok: None)
+    page = Page(root, apply_changes)
+    return page
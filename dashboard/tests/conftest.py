@@ -0,0 +1,35 @@
+# The dashboard modules import each other as top-level modules (the app is
+# run from the dashboard folder), so the tests put that folder on sys.path.
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A migrated, empty database file of its own; archives go next to it."""
+    path = str(tmp_path / "soccer.db")
+    migrations.migrate(path)
+    yield path
+    db.close_all()
+
+
+def add_teams(path, *names):
+    db.executemany("INSERT INTO teams (team_name) VALUES (?)", [(n,) for n in names], path=path)
+
+
+def add_match(path, match_date, team_score=None, opponent_score=None, home=None, away=None,
+              opponent="Rivals", venue="Home"):
+    """Insert one match and return its id; home / away make it a league match."""
+    cursor = db.execute("""
+        INSERT INTO matches (opponent, match_date, venue, team_score, opponent_score,
+                             home_team, away_team)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (away or opponent, match_date, venue, team_score, opponent_score, home, away), path=path)
+    return cursor.lastrowid
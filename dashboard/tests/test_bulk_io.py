@@ -0,0 +1,22 @@
+import bulk_io
+import db
+import partitions
+import season_stats
+from conftest import add_match
+
+
+def test_importing_an_archived_match_again_is_rejected(db_path, tmp_path):
+    old = add_match(db_path, "2015-05-01", 2, 0)
+    add_match(db_path, "2026-05-01", 1, 1)
+    file = str(tmp_path / "matches.csv")
+    bulk_io.export_file("matches", file, db_path=db_path)
+    partitions.roll_over("2015", db_path)
+    before = season_stats.totals(path=db_path)
+
+    report = bulk_io.import_file("matches", file, db_path=db_path)
+
+    assert report.imported == 1
+    assert [(reason, record["id"]) for _, reason, record in report.rejected] == [
+        (partitions.ARCHIVED_ERROR, str(old))]
+    assert db.query_one("SELECT COUNT(*) FROM matches WHERE id = ?", (old,), path=db_path)[0] == 0
+    assert season_stats.totals(path=db_path) == before
@@ -0,0 +1,139 @@
+from collections import Counter
+from datetime import date
+from itertools import combinations
+
+import pytest
+
+import bulk_io
+import db
+import fixtures
+import migrations
+import standings
+from conftest import add_match, add_teams
+from validation import ValidationError
+
+TEAMS = ["A", "B", "C", "D", "E", "F"]
+
+
+def pairings(rounds):
+    return Counter(frozenset(pair) for pairs in rounds for pair in pairs)
+
+
+# ---------------- ROUND ROBIN ----------------
+@pytest.mark.parametrize("count", [2, 3, 4, 5, 6, 9, 20])
+def test_everyone_meets_once_and_plays_once_per_round(count):
+    teams = [f"T{i}" for i in range(count)]
+    rounds = fixtures.round_robin(teams)
+
+    assert len(rounds) == count - 1 if count % 2 == 0 else count
+    assert pairings(rounds) == Counter(frozenset(p) for p in combinations(teams, 2))
+    for pairs in rounds:
+        playing = [team for pair in pairs for team in pair]
+        assert len(playing) == len(set(playing))
+        assert len(pairs) == count // 2   # one team has a bye when count is odd
+
+
+def test_double_round_robin_swaps_home_and_away():
+    rounds = fixtures.round_robin(TEAMS, double=True)
+    first, second = rounds[:len(rounds) // 2], rounds[len(rounds) // 2:]
+
+    assert [[(away, home) for home, away in pairs] for pairs in first] == second
+    games = Counter(pair for pairs in rounds for pair in pairs)
+    assert set(games.values()) == {1}
+    assert len(games) == len(TEAMS) * (len(TEAMS) - 1)
+
+
+def test_home_and_away_are_balanced():
+    home = Counter(home for pairs in fixtures.round_robin(TEAMS) for home, _ in pairs)
+    # Each team plays 5 matches; nobody is at home for fewer than 2 or more than 3
+    assert all(2 <= home[team] <= 3 for team in TEAMS)
+
+
+def test_a_league_needs_two_teams():
+    with pytest.raises(ValidationError):
+        fixtures.round_robin(["A"])
+
+
+# ---------------- PLACEMENT ----------------
+def test_place_avoids_busy_teams_and_venues():
+    rounds = [[("A", "B")]]
+    days = [date(2026, 8, 1), date(2026, 8, 2), date(2026, 8, 3)]
+    placed = fixtures.place(rounds, days, ["Stadium"],
+                            busy_slots={("2026-08-01", "Stadium")},
+                            busy_teams={("2026-08-02", "B")})
+
+    assert [(f.match_date, f.venue) for f in placed] == [("2026-08-03", "Stadium")]
+
+
+def test_place_shares_a_day_between_venues():
+    rounds = [[("A", "B"), ("C", "D")]]
+    placed = fixtures.place(rounds, [date(2026, 8, 1)], ["North", "South"])
+
+    assert sorted(f.venue for f in placed) == ["North", "South"]
+    assert {f.match_date for f in placed} == {"2026-08-01"}
+
+
+def test_place_uses_the_home_ground_without_venues():
+    placed = fixtures.place([[("A", "B")]], [date(2026, 8, 1)], [])
+    assert placed[0].venue == fixtures.home_ground("A")
+
+
+def test_place_rejects_too_few_days():
+    with pytest.raises(ValidationError, match="match days"):
+        fixtures.place(fixtures.round_robin(TEAMS), [date(2026, 8, 1)] * 3, ["V"])
+
+
+def test_place_rejects_fixtures_that_cannot_fit():
+    # One venue, one day, two fixtures in the round
+    with pytest.raises(ValidationError, match="clash"):
+        fixtures.place([[("A", "B"), ("C", "D")]], [date(2026, 8, 1)], ["Only"])
+
+
+# ---------------- SCHEDULING ----------------
+def test_schedule_inserts_a_clash_free_calendar(db_path):
+    add_teams(db_path, *TEAMS)
+    start, end = date(2026, 8, 1), date(2026, 12, 31)
+    placed = fixtures.schedule(TEAMS, start, end, weekdays=[5, 6], double=True, path=db_path)
+
+    rows = db.query("SELECT match_date, venue, home_team, away_team FROM matches", path=db_path)
+    assert len(rows) == len(placed) == len(TEAMS) * (len(TEAMS) - 1)
+    assert len({(d, v) for d, v, _, _ in rows}) == len(rows)
+    team_days = [(d, team) for d, _, home, away in rows for team in (home, away)]
+    assert len(set(team_days)) == len(team_days)
+    assert all(date.fromisoformat(d).weekday() in (5, 6) for d, _, _, _ in rows)
+
+
+def test_schedule_works_around_existing_matches(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2026-08-01", venue=fixtures.home_ground("A"))
+    add_match(db_path, "2026-08-02", home="B", away="A", venue="Elsewhere")
+
+    placed = fixtures.schedule(["A", "B"], date(2026, 8, 1), date(2026, 8, 3), path=db_path)
+
+    assert [(f.home, f.away, f.match_date) for f in placed] == [("A", "B", "2026-08-03")]
+
+
+def test_schedule_writes_nothing_when_it_cannot_place_everything(db_path):
+    add_teams(db_path, *TEAMS)
+    with pytest.raises(ValidationError):
+        fixtures.schedule(TEAMS, date(2026, 8, 1), date(2026, 8, 2), path=db_path)
+    assert db.query_one("SELECT COUNT(*) FROM matches", path=db_path)[0] == 0
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_unplayed_fixtures_survive_an_export_and_import(db_path, tmp_path, suffix):
+    add_teams(db_path, "A", "B", "C")
+    fixtures.schedule(["A", "B", "C"], date(2026, 8, 1), date(2026, 8, 31), path=db_path)
+    add_match(db_path, "2026-09-01", 2, 1)
+    before = db.query("SELECT * FROM matches ORDER BY id", path=db_path)
+    file = str(tmp_path / ("matches" + suffix))
+    bulk_io.export_file("matches", file, db_path=db_path)
+
+    copy = str(tmp_path / "copy.db")
+    migrations.migrate(copy)
+    report = bulk_io.import_file("matches", file, db_path=copy)
+
+    assert (report.imported, report.rejected) == (len(before), [])
+    assert db.query("SELECT * FROM matches ORDER BY id", path=copy) == before
+    assert [(r["team"], r["played"], r["points"]) for r in standings.table("2026", copy)] == [
+        ("A", 0, 0), ("B", 0, 0), ("C", 0, 0)]
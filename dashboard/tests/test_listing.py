@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+import db
+from listing import View
+from repository import PLAYER_LISTING, Player
+from validation import ValidationError
+
+NAMES = ["ana", "Ben", "carl", "Dora", "", None, "eve", "Ana"]
+
+
+@pytest.fixture
+def players(db_path):
+    rng = random.Random(3)
+    rows = [(jersey, rng.choice(NAMES), rng.choice([None, 18, 21, 25, 30]), rng.randint(0, 4))
+            for jersey in range(1, 301)]
+    db.executemany("INSERT INTO players (jersey, name, age, goals) VALUES (?, ?, ?, ?)", rows,
+                   path=db_path)
+    return db_path
+
+
+def walk(path, view, limit=17):
+    """Every row of the listing, fetched one keyset page at a time."""
+    seen, after = [], None
+    while True:
+        sql, args = PLAYER_LISTING.query(view, after, limit)
+        page = [Player(*row) for row in db.query(sql, args, path=path)]
+        seen += page
+        if len(page) < limit:
+            return seen
+        last = page[-1]
+        column = PLAYER_LISTING.columns.get(view.sort)
+        after = PLAYER_LISTING.cursor(view, last.jersey, getattr(last, column.sql) if column else None)
+
+
+def everything(path, view):
+    sql, args = PLAYER_LISTING.query(view)
+    return [Player(*row) for row in db.query(sql, args, path=path)]
+
+
+@pytest.mark.parametrize("sort", [None, "Jersey", "Name", "Age", "Goals"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_pages_add_up_to_the_whole_listing(players, sort, descending):
+    view = View(sort, descending)
+    rows = walk(players, view)
+
+    assert [p.jersey for p in rows] == [p.jersey for p in everything(players, view)]
+    assert len(rows) == 300
+
+
+def test_sorting_folds_nulls_and_case(players):
+    rows = everything(players, View("Name"))
+    keys = [PLAYER_LISTING.columns["Name"].sort_key(p.name) for p in rows]
+    assert keys == sorted(keys)
+    assert rows[0].name in ("", None)
+
+
+@pytest.mark.parametrize("text, check", [
+    ("21", lambda age: age == 21),
+    (">21", lambda age: (age or 0) > 21),
+    ("18-25", lambda age: 18 <= (age or 0) <= 25),
+    ("!=0", lambda age: age),
+])
+def test_numeric_filters(players, text, check):
+    rows = walk(players, View("Name", filters={"Age": text}))
+    assert rows and all(check(p.age) for p in rows)
+    assert len(rows) == sum(1 for p in everything(players, View()) if check(p.age))
+
+
+def test_text_filters_match_a_prefix_ignoring_case(players):
+    rows = everything(players, View(filters={"Name": "an"}))
+    assert rows and {p.name for p in rows} == {"ana", "Ana"}
+
+
+@pytest.mark.parametrize("text", ["abc", "99999999999999999999", ">"])
+def test_bad_numeric_filters_are_validation_errors(text):
+    with pytest.raises(ValidationError):
+        PLAYER_LISTING.query(View(filters={"Age": text}))
+
+
+@pytest.mark.parametrize("sort, after, ok", [
+    (None, 5, True),
+    (None, [5], False),
+    (None, True, False),
+    ("Name", ["ana", 5], True),
+    ("Name", [5, 5], False),
+    ("Name", 5, False),
+    ("Age", [21, 5], True),
+    ("Age", ["21", 5], False),
+    ("Age", [21, 2 ** 63], False),
+    ("Age", {"a": 1}, False),
+])
+def test_is_cursor_checks_the_shape_for_the_view(sort, after, ok):
+    assert PLAYER_LISTING.is_cursor(View(sort), after) is ok
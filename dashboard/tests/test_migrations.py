@@ -0,0 +1,91 @@
+import sqlite3
+
+import pytest
+
+import db
+import migrations
+import season_stats
+from conftest import add_match, add_teams
+
+
+def objects(path, kind):
+    return {row[0] for row in db.query("SELECT name FROM sqlite_master WHERE type = ?", (kind,),
+                                       path=path)}
+
+
+def migrate_to(path, version, monkeypatch):
+    # Only the migrations up to version, as an older copy of the app would
+    with monkeypatch.context() as patch:
+        patch.setattr(migrations, "MIGRATIONS", [m for m in migrations.MIGRATIONS if m[0] <= version])
+        return migrations.migrate(path)
+
+
+def test_versions_are_in_order_without_gaps():
+    assert [m[0] for m in migrations.MIGRATIONS] == list(range(1, migrations.LATEST_VERSION + 1))
+
+
+def test_a_new_database_gets_every_migration(tmp_path):
+    path = str(tmp_path / "new.db")
+    assert migrations.migrate(path) == list(range(1, migrations.LATEST_VERSION + 1))
+    assert migrations.schema_version(path) == migrations.LATEST_VERSION
+    assert {"players", "teams", "users", "matches", "match_summary", "change_log",
+            "player_match_stats", "player_season_totals", "season_archives",
+            "archived_matches", "standings"} <= objects(path, "table")
+    db.close_all()
+
+
+def test_migrating_again_applies_nothing(db_path):
+    assert migrations.migrate(db_path) == []
+
+
+def test_a_pre_migration_database_keeps_its_rows(tmp_path):
+    # The tables as the pages used to create them, before migrations existed
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE players (jersey INTEGER PRIMARY KEY, name TEXT, age INTEGER, position TEXT,
+                              fitness TEXT, goals INTEGER, injury TEXT, suspension TEXT);
+        CREATE TABLE matches (id INTEGER PRIMARY KEY AUTOINCREMENT, opponent TEXT, match_date TEXT,
+                              venue TEXT, team_score INTEGER DEFAULT 0, opponent_score INTEGER DEFAULT 0);
+        INSERT INTO players (jersey, name) VALUES (10, 'Old Timer');
+        INSERT INTO matches (opponent, match_date, venue, team_score, opponent_score)
+        VALUES ('Rivals', '2024-05-01', 'Home', 2, 1), ('Rivals', '2024-05-08', 'Away', 0, 0);
+    """)
+    conn.close()
+
+    migrations.migrate(path)
+
+    assert db.query("SELECT jersey, name, team_assigned FROM players", path=path) == [
+        (10, "Old Timer", None)]
+    totals = season_stats.totals(path=path)
+    assert (totals["played"], totals["wins"], totals["draws"]) == (2, 1, 1)
+    db.close_all()
+
+
+def test_migration_13_takes_league_matches_out_of_the_summary(tmp_path, monkeypatch):
+    path = str(tmp_path / "v12.db")
+    migrate_to(path, 12, monkeypatch)
+    add_teams(path, "A", "B")
+    add_match(path, "2026-08-01", 2, 0)
+    add_match(path, "2026-08-02", 0, 3, home="A", away="B")
+    assert season_stats.totals(path=path)["played"] == 2
+
+    assert migrations.migrate(path) == list(range(13, migrations.LATEST_VERSION + 1))
+
+    totals = season_stats.totals(path=path)
+    assert (totals["played"], totals["wins"], totals["losses"]) == (1, 1, 0)
+    db.close_all()
+
+
+def test_a_failed_migration_leaves_the_version_alone(db_path, monkeypatch):
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (x)")
+        raise RuntimeError("boom")
+
+    version = migrations.LATEST_VERSION + 1
+    monkeypatch.setattr(migrations, "MIGRATIONS", migrations.MIGRATIONS + [(version, "broken", broken)])
+    with pytest.raises(RuntimeError):
+        migrations.migrate(db_path)
+
+    assert migrations.schema_version(db_path) == migrations.LATEST_VERSION
+    assert "half_done" not in objects(db_path, "table")
@@ -0,0 +1,103 @@
+import sqlite3
+
+import pytest
+
+import db
+import partitions
+import player_stats
+import season_stats
+from conftest import add_match
+from repository import MatchRepository, PlayerStat, PlayerStatRepository
+
+
+@pytest.fixture
+def season_2015(db_path):
+    db.execute("INSERT INTO players (jersey, name) VALUES (7, 'Seven')", path=db_path)
+    ids = [add_match(db_path, f"2015-0{month}-01", month % 3, 1) for month in range(1, 6)]
+    add_match(db_path, "2026-01-01", 2, 1)
+    PlayerStatRepository(db_path).record_many(PlayerStat(i, 7, 90, 1) for i in ids[:3])
+    return ids
+
+
+def snapshot(path):
+    return (season_stats.totals(path=path), season_stats.by_season(path=path),
+            player_stats.by_season(7, path))
+
+
+def hot_count(path, season):
+    return db.query_one("SELECT COUNT(*) FROM matches WHERE match_date GLOB ?", (season + "*",),
+                        path=path)[0]
+
+
+def test_roll_over_moves_the_season_and_keeps_the_totals(db_path, season_2015):
+    before = snapshot(db_path)
+
+    assert partitions.roll_over("2015", db_path) == 5
+
+    assert hot_count(db_path, "2015") == 0
+    assert snapshot(db_path) == before
+    assert partitions.archived_seasons(db_path) == [("2015", 5)]
+    matches = MatchRepository(db_path)
+    assert [m.id for m in matches.get_many(season_2015 + [999])] == season_2015
+    assert matches.get(season_2015[0]).match_date == "2015-01-01"
+    assert len(PlayerStatRepository(db_path).history(7)) == 3
+
+
+def test_a_roll_over_cut_short_can_run_again(db_path, season_2015):
+    before = snapshot(db_path)
+    file = partitions.archive_file("2015", db_path)
+    # The archive copy committed, then the process died before the hot delete
+    partitions._create_archive(file)
+    partitions._copy(file, "2015", db_path)
+    assert hot_count(db_path, "2015") == 5
+
+    assert partitions.roll_over("2015", db_path) == 5
+
+    assert hot_count(db_path, "2015") == 0
+    assert snapshot(db_path) == before
+    archive = sqlite3.connect(file)
+    assert archive.execute("SELECT COUNT(*) FROM matches").fetchone()[0] == 5
+    assert archive.execute("SELECT COUNT(*) FROM player_match_stats").fetchone()[0] == 3
+    archive.close()
+
+
+def test_a_later_roll_over_appends_to_the_archive(db_path, season_2015):
+    partitions.roll_over("2015", db_path)
+    add_match(db_path, "2015-12-01", 4, 0)
+
+    assert partitions.roll_over("2015", db_path) == 1
+    assert partitions.archived_seasons(db_path) == [("2015", 6)]
+    assert season_stats.totals("2015", path=db_path)["played"] == 6
+
+
+def test_nothing_is_removed_if_the_archive_is_missing_rows(db_path, season_2015):
+    file = partitions.archive_file("2015", db_path)
+    partitions._create_archive(file)
+    archive = sqlite3.connect(file)
+    # Silently drops one of the copies, as a full disk or a bad file might
+    archive.execute("""CREATE TRIGGER lose_one BEFORE INSERT ON matches WHEN new.id = 3
+                       BEGIN SELECT RAISE(IGNORE); END""")
+    archive.commit()
+    archive.close()
+
+    with pytest.raises(sqlite3.IntegrityError, match="missing rows"):
+        partitions.roll_over("2015", db_path)
+    assert hot_count(db_path, "2015") == 5
+    assert partitions.archived_seasons(db_path) == []
+
+
+def test_rebuilding_the_totals_keeps_the_archived_seasons(db_path, season_2015):
+    before = snapshot(db_path)
+    partitions.roll_over("2015", db_path)
+
+    season_stats.rebuild_summary(db_path)
+    player_stats.rebuild_totals(db_path)
+
+    assert snapshot(db_path) == before
+    assert season_stats.totals(path=db_path)["played"] == 6
+    assert player_stats.totals_for([7], path=db_path)[7]["appearances"] == 3
+
+
+def test_only_four_digit_seasons(db_path):
+    with pytest.raises(ValueError):
+        partitions.roll_over("15", db_path)
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+import bulk_io
+import db
+import player_stats
+from conftest import add_match
+from repository import PlayerStat, PlayerStatRepository
+
+
+@pytest.fixture
+def stats(db_path):
+    db.executemany("INSERT INTO players (jersey, name) VALUES (?, ?)", [(7, "Seven"), (9, "Nine")],
+                   path=db_path)
+    return PlayerStatRepository(db_path)
+
+
+def totals(path, jersey, season=player_stats.ALL):
+    return player_stats.totals_for([jersey], season, path).get(jersey)
+
+
+def test_lines_add_up_per_season_and_career(db_path, stats):
+    first = add_match(db_path, "2025-05-01", 1, 0)
+    second = add_match(db_path, "2026-05-01", 2, 2)
+    stats.record_many([PlayerStat(first, 7, 90, 1, 0), PlayerStat(second, 7, 45, 2, 1, 1)])
+
+    assert totals(db_path, 7, "2025")["goals"] == 1
+    assert totals(db_path, 7) == {"appearances": 2, "minutes": 135, "goals": 3, "assists": 1,
+                                  "yellow_cards": 1, "red_cards": 0}
+
+
+def test_overwriting_and_removing_a_line_keeps_totals_right(db_path, stats):
+    match_id = add_match(db_path, "2026-05-01", 1, 0)
+    stats.record(PlayerStat(match_id, 7, 90, 1))
+    stats.record(PlayerStat(match_id, 7, 90, 3))
+    assert totals(db_path, 7)["goals"] == 3
+
+    stats.delete(match_id, 7)
+    assert totals(db_path, 7) is None
+
+
+def test_moving_a_match_to_another_season_moves_its_lines(db_path, stats):
+    match_id = add_match(db_path, "2025-05-01", 1, 0)
+    stats.record(PlayerStat(match_id, 9, 90, 2))
+
+    db.execute("UPDATE matches SET match_date = '2026-05-01' WHERE id = ?", (match_id,), path=db_path)
+
+    assert totals(db_path, 9, "2025") is None
+    assert totals(db_path, 9, "2026")["goals"] == 2
+
+
+def test_deleting_a_match_or_player_removes_their_lines(db_path, stats):
+    match_id = add_match(db_path, "2026-05-01", 1, 0)
+    stats.record_many([PlayerStat(match_id, 7, 90, 1), PlayerStat(match_id, 9, 90, 1)])
+
+    db.execute("DELETE FROM players WHERE jersey = 9", path=db_path)
+    assert totals(db_path, 9) is None
+    db.execute("DELETE FROM matches WHERE id = ?", (match_id,), path=db_path)
+    assert totals(db_path, 7) is None
+    assert db.query_one("SELECT COUNT(*) FROM player_match_stats", path=db_path)[0] == 0
+
+
+def test_rebuild_matches_the_triggers(db_path, stats):
+    for day in range(1, 6):
+        match_id = add_match(db_path, f"202{day % 2 + 5}-05-0{day}", 1, 0)
+        stats.record_many([PlayerStat(match_id, 7, 90, day), PlayerStat(match_id, 9, 30, 0, day)])
+    before = db.query("SELECT * FROM player_season_totals ORDER BY 1, 2", path=db_path)
+
+    player_stats.rebuild_totals(db_path)
+
+    assert db.query("SELECT * FROM player_season_totals ORDER BY 1, 2", path=db_path) == before
+
+
+@pytest.mark.parametrize("match_id, jersey, message", [
+    (999, 7, "No match with that id"),
+    (None, 77, "No player with that jersey number"),
+])
+def test_lines_must_name_an_existing_match_and_player(db_path, stats, match_id, jersey, message):
+    match_id = match_id or add_match(db_path, "2026-05-01", 1, 0)
+    with pytest.raises(sqlite3.IntegrityError, match=message):
+        stats.record(PlayerStat(match_id, jersey, 90, 1))
+    assert db.query_one("SELECT COUNT(*) FROM player_season_totals", path=db_path)[0] == 0
+
+
+def test_bulk_import_reports_the_real_reason(db_path, stats):
+    match_id = add_match(db_path, "2026-05-01", 1, 0)
+    records = [{"match_id": match_id, "jersey": 7, "goals": 1},
+               {"match_id": 999, "jersey": 7},
+               {"match_id": match_id, "jersey": 77},
+               {"match_id": match_id, "jersey": 7, "goals": 2}]
+
+    report = bulk_io.import_records("player_stats", [(i, r, None) for i, r in enumerate(records, 1)],
+                                    path=db_path)
+
+    assert report.imported == 1
+    assert [(line, reason) for line, reason, _ in report.rejected] == [
+        (2, "No match with that id"),
+        (3, "No player with that jersey number"),
+        (4, "Stats for this player and match already exist"),
+    ]
@@ -0,0 +1,126 @@
+import db
+import partitions
+import season_stats
+import standings
+from conftest import add_match, add_teams
+from repository import MatchRepository
+
+
+def positions(path, season="2026"):
+    return [(row["team"], row["position"], row["points"]) for row in standings.table(season, path)]
+
+
+def cached(path, season="2026"):
+    return db.query_one("SELECT COUNT(*) FROM standings WHERE season = ?", (season,), path=path)[0]
+
+
+def test_points_goal_difference_and_goals_order_the_table(db_path):
+    add_teams(db_path, "A", "B", "C")
+    add_match(db_path, "2026-08-01", 3, 0, home="A", away="B")
+    add_match(db_path, "2026-08-08", 1, 1, home="B", away="C")
+    add_match(db_path, "2026-08-15", 0, 2, home="C", away="A")
+
+    table = standings.table("2026", db_path)
+
+    assert [(r["team"], r["played"], r["won"], r["drawn"], r["lost"], r["goal_difference"],
+             r["points"]) for r in table] == [
+        ("A", 2, 2, 0, 0, 5, 6),
+        ("C", 2, 0, 1, 1, -2, 1),
+        ("B", 2, 0, 1, 1, -3, 1),
+    ]
+    assert [r["form"] for r in table] == ["WW", "DL", "LD"]
+
+
+def test_head_to_head_splits_teams_level_on_everything_else(db_path):
+    add_teams(db_path, "A", "B", "C")
+    add_match(db_path, "2026-08-01", 1, 0, home="A", away="B")
+    add_match(db_path, "2026-08-08", 2, 1, home="C", away="A")
+    add_match(db_path, "2026-08-15", 2, 1, home="B", away="C")
+
+    # C is ahead on goals scored; A and B are level on points, gd and goals,
+    # and A won the match between them
+    assert positions(db_path) == [("C", 1, 3), ("A", 2, 3), ("B", 3, 3)]
+
+
+def test_teams_still_level_share_a_position(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2026-08-01", 1, 1, home="A", away="B")
+
+    assert positions(db_path) == [("A", 1, 1), ("B", 1, 1)]
+
+
+def test_unplayed_fixtures_list_the_team_with_no_points(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2026-08-01", home="A", away="B")
+
+    assert [(r["team"], r["played"]) for r in standings.table("2026", db_path)] == [("A", 0), ("B", 0)]
+
+
+def test_form_shows_the_last_five_results_oldest_first(db_path):
+    add_teams(db_path, "A", "B")
+    for day, (home, away) in enumerate([(1, 0), (0, 0), (0, 1), (2, 0), (3, 0), (0, 0)], 1):
+        add_match(db_path, f"2026-08-{day:02d}", home, away, home="A", away="B")
+
+    form = {r["team"]: r["form"] for r in standings.table("2026", db_path)}
+    assert form == {"A": "DLWWD", "B": "DWLLD"}
+
+
+def test_a_score_change_invalidates_only_its_season(db_path):
+    add_teams(db_path, "A", "B")
+    match_id = add_match(db_path, "2026-08-01", 1, 0, home="A", away="B")
+    add_match(db_path, "2025-08-01", 1, 0, home="A", away="B")
+    standings.table("2026", db_path)
+    standings.table("2025", db_path)
+
+    MatchRepository(db_path).update_scores(match_id, 0, 2)
+
+    assert cached(db_path, "2026") == 0
+    assert cached(db_path, "2025") == 2
+    assert positions(db_path) == [("B", 1, 3), ("A", 2, 0)]
+
+
+def test_club_matches_do_not_touch_the_cache(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2026-08-01", 1, 0, home="A", away="B")
+    standings.table("2026", db_path)
+
+    add_match(db_path, "2026-08-02", 5, 0)
+
+    assert cached(db_path) == 2
+
+
+def test_league_matches_stay_out_of_the_club_summary(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2026-08-01", 2, 0)
+    league = add_match(db_path, "2026-08-02", 0, 3, home="A", away="B")
+    MatchRepository(db_path).update_scores(league, 4, 0)
+
+    totals = season_stats.totals(path=db_path)
+    assert (totals["played"], totals["wins"], totals["goals_for"]) == (1, 1, 2)
+    assert MatchRepository(db_path).league_seasons() == ["2026"]
+
+
+def test_archived_season_counts_matches_added_to_the_hot_database(db_path):
+    add_teams(db_path, "A", "B")
+    add_match(db_path, "2015-08-01", 2, 0, home="A", away="B")
+    add_match(db_path, "2015-08-08", 1, 1, home="B", away="A")
+    before = standings.table("2015", db_path)
+
+    partitions.roll_over("2015", db_path)
+    standings.invalidate("2015", db_path)
+    assert standings.table("2015", db_path) == before
+
+    add_match(db_path, "2015-08-15", 0, 3, home="A", away="B")
+    assert positions(db_path, "2015") == [("B", 1, 4), ("A", 2, 4)]
+
+
+def test_a_season_without_league_matches_writes_nothing(db_path):
+    add_match(db_path, "2026-08-01", 2, 0)
+    add_match(db_path, "2015-08-01", 1, 0)
+    partitions.roll_over("2015", db_path)
+
+    # Read-only, so any write to the cache would fail
+    for season in ("2026", "1999"):
+        assert standings.table(season, db.read_only(db_path)) == []
+    assert standings.table("2015", db_path) == []
+    assert cached(db_path, "2015") == 0
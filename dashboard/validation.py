@@ -0,0 +1,142 @@
+# Validation rules shared by the entry forms and bulk import.
+# Each function takes a dict keyed by database column name and returns the
+# tuple of values to store, or raises ValidationError with the message the
+# form shows to the user.
+from datetime import date
+
+PLAYER_COLUMNS = ("jersey", "name", "age", "position", "fitness", "goals", "injury", "suspension")
+TEAM_COLUMNS = ("team_name", "coach", "staff_info", "formation")
+MATCH_COLUMNS = ("opponent", "match_date", "venue", "team_score", "opponent_score",
+                 "home_team", "away_team")
+STAT_COLUMNS = ("match_id", "jersey", "minutes", "goals", "assists", "yellow_cards", "red_cards")
+
+FORMATIONS = ["4-4-2", "4-3-3", "3-5-2", "4-2-3-1", "5-4-1"]
+
+MAX_JERSEY_LIST = 10000   # most jerseys one list/range entry may name
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class ValidationError(ValueError):
+    pass
+
+
+def _text(data, key):
+    value = data.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def _int(data, key):
+    # Blank means 0, as in the forms
+    value = _text(data, key)
+    return int(value or 0)
+
+
+def player_row(data):
+    if not _text(data, "jersey") or not _text(data, "name"):
+        raise ValidationError("Jersey and Name are required!")
+    try:
+        jersey, age, goals = int(_text(data, "jersey")), _int(data, "age"), _int(data, "goals")
+    except ValueError:
+        raise ValidationError("Jersey, Age, and Goals must be numbers!")
+    return (jersey, _text(data, "name"), age, _text(data, "position"), _text(data, "fitness"),
+            goals, _text(data, "injury"), _text(data, "suspension"))
+
+
+def team_row(data):
+    name = _text(data, "team_name")
+    if not name:
+        raise ValidationError("Team Name is required!")
+    formation = _text(data, "formation") or FORMATIONS[0]
+    if formation not in FORMATIONS:
+        raise ValidationError(f"Formation must be one of {', '.join(FORMATIONS)}")
+    return (name, _text(data, "coach"), _text(data, "staff_info"), formation)
+
+
+def jersey_list(text):
+    """Parse "4, 7, 10-23" into sorted, distinct jersey numbers."""
+    jerseys = set()
+    for part in str(text or "").replace(";", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        try:
+            first = int(first)
+            last = int(last) if dash else first
+        except ValueError:
+            raise ValidationError(f"'{part}' is not a jersey number or range (e.g. 4, 7, 10-23)")
+        if first > last:
+            raise ValidationError(f"Range '{part}' runs backwards")
+        if last - first >= MAX_JERSEY_LIST:
+            raise ValidationError(f"Range '{part}' is too long")
+        jerseys.update(range(first, last + 1))
+        if len(jerseys) > MAX_JERSEY_LIST:
+            raise ValidationError(f"At most {MAX_JERSEY_LIST} jerseys at once")
+    if not jerseys:
+        raise ValidationError("Enter a Player Jersey #")
+    return sorted(jerseys)
+
+
+def match_row(data, blank_score=0):
+    """blank_score is what blank scores become: 0 as in the schedule form, or
+    None (NULL, not played yet) for bulk import. League fixtures always keep
+    blank scores NULL, or the table would count them as 0-0 draws."""
+    opponent, date = _text(data, "opponent"), _text(data, "match_date")
+    if not opponent or not date:
+        raise ValidationError("Opponent and Date required")
+    # League matches name both of our teams; the scores are then home / away
+    home, away = _text(data, "home_team") or None, _text(data, "away_team") or None
+    if (home is None) != (away is None):
+        raise ValidationError("A league match needs both a home and an away team")
+    if home is not None and home == away:
+        raise ValidationError("A team cannot play itself")
+    if home is not None:
+        blank_score = None
+    scores = [_text(data, "team_score"), _text(data, "opponent_score")]
+    if blank_score is None and any(scores) and not all(scores):
+        raise ValidationError("Enter both scores, or leave both blank for a match not played yet")
+    try:
+        team_score, opponent_score = (int(score) if score else blank_score for score in scores)
+    except ValueError:
+        raise ValidationError("Scores must be integers")
+    return (opponent, date, _text(data, "venue"), team_score, opponent_score, home, away)
+
+
+def stat_row(data):
+    if not _text(data, "match_id") or not _text(data, "jersey"):
+        raise ValidationError("Match and Jersey are required!")
+    try:
+        values = [int(_text(data, "match_id")), int(_text(data, "jersey"))]
+        values += [_int(data, key) for key in STAT_COLUMNS[2:]]
+    except ValueError:
+        raise ValidationError("Minutes, goals, assists and cards must be numbers!")
+    minutes, goals, assists, yellow, red = values[2:]
+    if min(values[2:]) < 0:
+        raise ValidationError("Stats cannot be negative")
+    if minutes > 150:
+        raise ValidationError("Minutes must be between 0 and 150")
+    if yellow > 2 or red > 1:
+        raise ValidationError("A player gets at most 2 yellow cards and 1 red card per match")
+    return tuple(values)
+
+
+def fixture_window(data):
+    """(start, end, weekdays, venues) for the fixture scheduler.
+
+    start / end are YYYY-MM-DD, weekdays are indexes into WEEKDAYS (all
+    days if none are given) and venues a comma-separated list, which may be
+    blank for every team playing at its own ground.
+    """
+    dates = []
+    for key, label in (("start", "Start date"), ("end", "End date")):
+        try:
+            dates.append(date.fromisoformat(_text(data, key)))
+        except ValueError:
+            raise ValidationError(f"{label} must be a date like 2026-08-15")
+    start, end = dates
+    if end < start:
+        raise ValidationError("End date is before the start date")
+    weekdays = sorted(set(data.get("weekdays") or range(7)))
+    venues = list(dict.fromkeys(v.strip() for v in _text(data, "venues").split(",") if v.strip()))
+    return start, end, weekdays, venues